@@ -0,0 +1,169 @@
+"""
+Synthetic Tasks
+
+Seeded generator of task lists shaped like Morgen's /tasks/list payload,
+used by the benchmarks and the local API stand-in (tests/stub_server.py).
+
+The mix aims at a real account rather than uniform noise:
+    titles        verb + object, sometimes "for"/"with" a context, a few non-ASCII
+    descriptions  ~30%, from one sentence to a pasted note with a link
+    due dates     ~40% none; the rest overdue, today, this week or later,
+                  about a third at a specific time
+    containers    ~70% taskListId (a few big lists, a long tail; some with
+                  taskListName), embedded project / space objects,
+                  integrationId only, or nothing
+    priority      half unset (0), the rest 1-9
+    progress      ~10% completed
+
+The same (n, seed, now) always yields the same tasks.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timezone
+
+DEFAULT_NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+_VERBS = (
+    "Review", "Draft", "Send", "Call", "Plan", "Fix", "Update", "Write", "Prepare", "Book",
+    "Check", "Order", "Clean", "Pay", "Submit", "Renew", "Organise", "Email", "Schedule",
+    "Research", "Cancel", "Follow up on", "Sign", "Print", "Backup", "Refactor", "Test",
+)
+_OBJECTS = (
+    "Q3 budget", "invoice #4411", "team offsite", "dentist appointment", "car insurance",
+    "release notes", "roadmap", "quarterly report", "slides for Monday", "groceries",
+    "tax return", "passport", "gym membership", "flight to Berlin", "birthday gift",
+    "onboarding doc", "server certificates", "pull request 812", "lease agreement",
+    "conference talk", "newsletter", "garden hose", "photo backup", "expense report",
+    "Zahnarzt Termin", "café reservation", "naïve Bayes notebook", "kitchen tap",
+)
+_CONTEXTS = (
+    "for Anna", "with Jonas", "for the client", "with accounting", "for mum",
+    "before Friday", "for Acme Corp", "with the design team", "for next sprint",
+)
+_SENTENCES = (
+    "Need the numbers from last quarter first.",
+    "Ask about the discount they mentioned.",
+    "Keep it under two pages.",
+    "Blocked until the contract is signed.",
+    "Remember to attach the receipts.",
+    "Check the shared drive for the old version.",
+    "Low priority unless the deadline moves.",
+    "Coordinate with whoever is on call that week.",
+)
+_LIST_NAMES = (
+    "Inbox", "Work", "Personal", "Errands", "Home", "Side project", "Reading",
+    "Finances", "Health", "Travel", "Someday", "Team",
+)
+
+
+def format_timestamp(ts: float) -> str:
+    """Morgen-style UTC timestamp: 2026-01-31T09:00:00.000Z (sorts as a string)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(ts))
+
+
+def list_ids(lists: int = 8) -> list[str]:
+    return [f"list-{i}" for i in range(max(1, lists))]
+
+
+def container_name_maps(lists: int = 8) -> dict[str, dict[str, str]]:
+    """{"list": {...}, "project": {...}, "space": {...}} names for the generated container ids."""
+    names = {
+        list_id: _LIST_NAMES[i % len(_LIST_NAMES)] + (f" {i // len(_LIST_NAMES) + 1}" if i >= len(_LIST_NAMES) else "")
+        for i, list_id in enumerate(list_ids(lists))
+    }
+    return {
+        "list": names,
+        "project": {f"project-{i}": f"Project {i}" for i in range(4)},
+        "space": {f"space-{i}": f"Space {i}" for i in range(2)},
+    }
+
+
+def _title(rng: random.Random) -> str:
+    title = f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)}"
+    if rng.random() < 0.35:
+        title += f" {rng.choice(_CONTEXTS)}"
+    return title
+
+
+def _description(rng: random.Random) -> str | None:
+    roll = rng.random()
+    if roll >= 0.3:
+        return None
+    if roll < 0.2:
+        return rng.choice(_SENTENCES)
+    text = " ".join(rng.choices(_SENTENCES, k=rng.randint(3, 8)))
+    return f"{text}\nhttps://example.com/notes/{rng.randrange(10**6)}"
+
+
+def _due(rng: random.Random, now_ts: int) -> str | None:
+    roll = rng.random()
+    if roll < 0.4:
+        return None
+    if roll < 0.49:
+        days = -rng.randint(1, 30)      # overdue
+    elif roll < 0.58:
+        days = 0                        # today
+    elif roll < 0.76:
+        days = rng.randint(1, 7)        # this week
+    else:
+        days = rng.randint(8, 120)      # later
+    due = now_ts + days * 86400
+    if rng.random() < 0.35:
+        fmt = f"%Y-%m-%dT{rng.randint(7, 20):02d}:{rng.choice((0, 15, 30, 45)):02d}:00"
+    else:
+        fmt = "%Y-%m-%dT09:00:00"
+    return time.strftime(fmt, time.gmtime(due))
+
+
+def _container(rng: random.Random, task: dict, ids: list[str], weights: list[float], names: dict):
+    roll = rng.random()
+    if roll < 0.7:
+        list_id = rng.choices(ids, weights)[0]
+        task["taskListId"] = list_id
+        if rng.random() < 0.2:
+            task["taskListName"] = names["list"][list_id]
+    elif roll < 0.8:
+        project_id = rng.choice(list(names["project"]))
+        task["project"] = {"id": project_id, "name": names["project"][project_id]}
+    elif roll < 0.85:
+        space_id = rng.choice(list(names["space"]))
+        task["space"] = {"id": space_id}
+    elif roll < 0.9:
+        task["integrationId"] = rng.choice(("google-tasks", "todoist", "notion"))
+
+
+def make_tasks(n: int, seed: int = 0, now: datetime | None = None, lists: int = 8) -> list[dict]:
+    """`n` synthetic tasks; ids are "task-000000" onwards."""
+    rng = random.Random(seed)
+    now_ts = int((now or DEFAULT_NOW).timestamp())
+    ids = list_ids(lists)
+    weights = [1.0 / (i + 1) for i in range(len(ids))]  # a few big lists, a long tail
+    names = container_name_maps(lists)
+    tasks = []
+    for i in range(n):
+        updated = now_ts - rng.randrange(90 * 86400)
+        task = {
+            "id": f"task-{i:06d}",
+            "title": _title(rng),
+            "priority": 0 if rng.random() < 0.5 else rng.randint(1, 9),
+            "progress": "completed" if rng.random() < 0.1 else "needs-action",
+            "created": format_timestamp(updated - rng.randrange(30 * 86400)),
+            "updated": format_timestamp(updated),
+        }
+        description = _description(rng)
+        if description:
+            task["description"] = description
+        due = _due(rng, now_ts)
+        if due:
+            task["due"] = due
+        _container(rng, task, ids, weights, names)
+        tasks.append(task)
+    return tasks
+
+
+def make_response(n: int, seed: int = 0, now: datetime | None = None, lists: int = 8) -> dict:
+    """make_tasks wrapped like a /tasks/list response."""
+    return {"data": {"tasks": make_tasks(n, seed=seed, now=now, lists=lists), "labelDefs": [], "spaces": []}}
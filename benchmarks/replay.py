@@ -0,0 +1,311 @@
+"""
+Keystroke Replay
+
+Measures what the user feels: the full KeywordQueryEventListener.on_event
+path, from the raw query to the RenderResultListAction, for every keystroke
+of recorded typing sessions.
+
+The real listener runs against a stand-in extension (real cache pool, sync
+worker, outbox and metadata cache in a temporary directory, preferences as a
+dict), a cache seeded from benchmarks/dataset.py and an in-process API
+client stub, so nothing touches the network or ~/.cache. Ulauncher's own
+Python package must be importable (main.py builds its result items); run it
+with the interpreter Ulauncher uses.
+
+    python -m benchmarks.replay                          # benchmarks/keystrokes.txt, 1k tasks
+    python -m benchmarks.replay --tasks 10000 --rounds 5
+    python -m benchmarks.replay --cold --api-latency 0.2 # every session starts on an expired cache
+
+Sessions file: one typed text per line (what the Ulauncher input shows after
+each keystroke), sessions separated by blank lines, "#" comments. A line
+"> mg d report" types that text one character at a time, starting from
+what it shares with the previous line (the rest counts as deleted). Only
+text starting with a keyword and a space reaches the extension (Ulauncher
+handles "m" and "mg" itself); those keystrokes are counted but not timed.
+
+Reported per keystroke: p50 / p95 / p99 latency, and, from a separate pass
+under tracemalloc (which slows execution down), p50 / p95 / p99 of peak
+traced memory and of memory still allocated afterwards (KiB above the level
+before the keystroke).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.dataset import container_name_maps, make_response  # noqa: E402
+from benchmarks.run import percentile  # noqa: E402
+
+DEFAULT_SESSIONS = Path(__file__).resolve().parent / "keystrokes.txt"
+DEFAULT_KEYWORDS = {"mg_keyword": "mg", "mg_new_keyword": "mgn"}
+_API_KEY = "replay-api-key"
+
+
+# --- Sessions ---
+
+def parse_sessions(text: str) -> list[list[str]]:
+    """Blank-line separated sessions of typed texts ("> text" is typed out from the previous text)."""
+    sessions, current = [], []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            continue
+        if not stripped:
+            if current:
+                sessions.append(current)
+                current = []
+            continue
+        if line.startswith("> "):
+            typed = line[2:].rstrip("\n")
+            previous = current[-1] if current else ""
+            kept = len(os.path.commonprefix([previous, typed]))
+            current.extend(typed[:i] for i in range(kept + 1, len(typed) + 1))
+        else:
+            current.append(line.rstrip("\n"))
+    if current:
+        sessions.append(current)
+    return sessions
+
+
+class ReplayQueryEvent:
+    """The parts of Ulauncher's KeywordQueryEvent the listener uses."""
+
+    def __init__(self, keyword: str, argument: str | None):
+        self.keyword = keyword
+        self.argument = argument
+
+    def get_keyword(self):
+        return self.keyword
+
+    def get_argument(self):
+        return self.argument
+
+    def get_query(self):
+        return f"{self.keyword} {self.argument or ''}"
+
+
+def route(typed: str, keywords) -> ReplayQueryEvent | None:
+    """The event Ulauncher would send the extension for this input, or None."""
+    for keyword in keywords:
+        if keyword and typed.startswith(keyword + " "):
+            argument = typed[len(keyword) + 1:]
+            return ReplayQueryEvent(keyword, argument or None)
+    return None
+
+
+# --- Stand-ins ---
+
+class ReplayAPIClient:
+    """In-process MorgenAPIClient stand-in serving a fixed task list."""
+
+    def __init__(self, api_key: str, response: dict, latency: float = 0.0):
+        self.api_key = api_key
+        self.response = response
+        self.latency = latency
+        self.calls = 0
+
+    def list_tasks(self, limit=100, updated_after=None, priority=None, validators=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return json.loads(json.dumps(self.response))  # a fresh copy, like a parsed response
+
+    def list_containers(self, kind, priority=None):
+        return [{"id": i, "name": n} for i, n in container_name_maps()[kind].items()]
+
+    def get_stats(self):
+        return {"list_calls": self.calls, "list_coalesced": 0}
+
+
+class _NoConnections:
+    connections_opened = reused = 0
+
+    def prewarm_async(self):
+        pass
+
+    def idle_count(self):
+        return 0
+
+
+class ReplayExtension:
+    """Attributes of MorgenTasksExtension the listeners use, backed by a temporary directory."""
+
+    def __init__(self, main, workdir: str, client: ReplayAPIClient, preferences: dict):
+        self.preferences = preferences
+        self.cache = None
+        self.cache_pool = main.CachePool(base_dir=os.path.join(workdir, "cache"))
+        self.api_client = client
+        self.async_client = None  # Complete all only; tests that use it set their own
+        self.event_loop = main.EventLoopThread()
+        self.circuit = main.CircuitBreaker()
+        self.connections = _NoConnections()
+        self.outboxes = {}
+        self.outbox = None
+        self.metadata_caches = {}
+        self.metadata = None
+        self.metadata_fetches = {}
+        self.last_manual_refresh_at = 0.0
+        self.sync = main.SyncWorker()
+        self.sync.start()
+        # Not started: scheduled refreshes would add noise; activity is still recorded.
+        self.prefetcher = main.PrefetchScheduler(get_cache=lambda: self.cache, refresh=lambda cache: None)
+        # No push channel: deferred renders run inline, so their cost is measured.
+        self.background = main.BackgroundRenderer(None)
+
+    def close(self):
+        for outbox in self.outboxes.values():
+            outbox.stop()
+        self.sync.stop()
+        self.event_loop.stop()
+
+
+def load_main():
+    """main.py, which needs Ulauncher's Python API."""
+    try:
+        import main
+    except ImportError as e:
+        raise SystemExit(f"Cannot import main.py ({e}). Run with the Python that has Ulauncher installed.")
+    return main
+
+
+# --- Replay ---
+
+def _seed(main, extension, response):
+    main._select_account(extension, _API_KEY)
+    extension.cache.set_tasks(json.loads(json.dumps(response)))
+    for kind, names in container_name_maps().items():
+        extension.metadata.set_containers(kind, [{"id": i, "name": n} for i, n in names.items()])
+
+
+def replay(sessions, *, tasks: int = 1000, seed: int = 0, rounds: int = 3, cold: bool = False,
+           api_latency: float = 0.0, cache_backend: str = "json", allocations: bool = True) -> dict:
+    """
+    Replay `sessions` `rounds` times (after one warm-up round) and return
+    {"keystrokes", "skipped", "api_calls", "latency_ms", "peak_kib", "retained_kib", "slowest"}.
+    """
+    main = load_main()
+    listener = main.KeywordQueryEventListener()
+    response = make_response(tasks, seed=seed)
+    preferences = dict(DEFAULT_KEYWORDS, api_key=_API_KEY, cache_ttl="600", cache_backend=cache_backend)
+    keywords = [preferences["mg_keyword"], preferences["mg_new_keyword"]]
+    workdir = tempfile.mkdtemp(prefix="morgen-replay-")
+    extension = ReplayExtension(main, workdir, ReplayAPIClient(_API_KEY, response, api_latency), preferences)
+
+    latencies, peaks, retained, slowest = [], [], [], []
+    skipped = 0
+
+    def run_round(measure_time: bool, measure_memory: bool):
+        nonlocal skipped
+        for session in sessions:
+            if cold and extension.cache is not None:
+                extension.cache.invalidate()
+            for typed in session:
+                event = route(typed, keywords)
+                if event is None:
+                    if measure_time:
+                        skipped += 1
+                    continue
+                if measure_memory:
+                    tracemalloc.reset_peak()
+                    before, _ = tracemalloc.get_traced_memory()
+                    listener.on_event(event, extension)
+                    current, peak = tracemalloc.get_traced_memory()
+                    peaks.append((peak - before) / 1024)
+                    retained.append((current - before) / 1024)
+                else:
+                    start = time.perf_counter()
+                    listener.on_event(event, extension)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if measure_time:
+                        latencies.append(elapsed)
+                        slowest.append((elapsed, typed))
+
+    try:
+        _seed(main, extension, response)
+        run_round(measure_time=False, measure_memory=False)  # warm-up: imports, caches, partitions
+        gc.collect()
+        for _ in range(max(1, rounds)):
+            run_round(measure_time=True, measure_memory=False)
+        if allocations:
+            tracemalloc.start()
+            try:
+                run_round(measure_time=False, measure_memory=True)
+            finally:
+                tracemalloc.stop()
+    finally:
+        extension.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    slowest.sort(reverse=True)
+    return {
+        "keystrokes": len(latencies),
+        "skipped": skipped,
+        "api_calls": extension.api_client.calls,
+        "latency_ms": _percentiles(latencies),
+        "peak_kib": _percentiles(peaks),
+        "retained_kib": _percentiles(retained),
+        "slowest": [{"ms": round(ms, 3), "typed": typed} for ms, typed in slowest[:5]],
+    }
+
+
+def _percentiles(values) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {f"p{q}": round(percentile(ordered, q), 3) for q in (50, 95, 99)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded keystrokes through the query listener.")
+    parser.add_argument("sessions", nargs="?", default=str(DEFAULT_SESSIONS), help="sessions file")
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks in the seeded cache")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3, help="timed replays of every session")
+    parser.add_argument("--cold", action="store_true", help="expire the cache before each session")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="seconds per stubbed list_tasks call")
+    parser.add_argument("--cache-backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    sessions = parse_sessions(Path(args.sessions).read_text(encoding="utf-8"))
+    report = replay(
+        sessions,
+        tasks=args.tasks,
+        seed=args.seed,
+        rounds=args.rounds,
+        cold=args.cold,
+        api_latency=args.api_latency,
+        cache_backend=args.cache_backend,
+        allocations=not args.no_allocations,
+    )
+
+    print(f"{report['keystrokes']} keystrokes timed ({report['skipped']} not routed to the extension), "
+          f"{report['api_calls']} API calls")
+    for label, key, unit in (("latency", "latency_ms", "ms"), ("peak memory", "peak_kib", "KiB"),
+                             ("retained memory", "retained_kib", "KiB")):
+        values = report[key]
+        if values:
+            print(f"{label:<16} " + "   ".join(f"{p} {v:>9.3f} {unit}".rstrip() for p, v in values.items()))
+    for entry in report["slowest"]:
+        print(f"  slow: {entry['ms']:>9.3f} ms  {entry['typed']!r}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+Benchmark Suite
+
+Times the hot paths of a keystroke (search, formatting, grouping) and of a
+refresh (index build, cache save/load) on seeded synthetic task lists, and
+compares the medians against a checked-in baseline.
+
+    python -m benchmarks.run                      # all sizes, compare to baseline.json
+    python -m benchmarks.run --sizes 100 1000     # quick run
+    python -m benchmarks.run --update-baseline    # after an intended change
+
+Each case is sampled in `--repeats` rounds (each at least `--min-runs`
+samples, more while within its share of `--budget` seconds) and reports the
+lowest round median plus p95 over all samples. Before every round a fixed
+pure-Python loop is timed; `relative` is the lowest round median divided by
+that calibration time, so a machine that is running slower as a whole
+(frequency scaling, a busy neighbour on a shared host) moves both and the
+comparison is not fooled.
+
+A case regresses when its `relative` is more than `--tolerance` above the
+baseline's and its median is at least 0.05 ms slower. Cases whose baseline
+median is under 1 ms must be 50% slower: at that scale timer resolution
+and cache state still move the relative timing by up to 40% between runs
+of unchanged code. The exit status is 1 if any case regressed. Baselines are
+machine-specific: regenerate one from a quiet run on the machine that
+compares against it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.dataset import DEFAULT_NOW, container_name_maps, make_tasks  # noqa: E402
+from cache import TaskCache  # noqa: E402
+from date_parser import DateParser  # noqa: E402
+from formatter import TaskFormatter  # noqa: E402
+from search import build_search_index, filter_tasks  # noqa: E402
+from task_lists import group_tasks_by_list  # noqa: E402
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SEED = 1234
+_MIN_REGRESSION_MS = 0.05
+_SUB_MS = 1.0               # baseline medians below this (ms) ...
+_SUB_MS_TOLERANCE = 0.5     # ... must slow down by at least 50% to count
+_DEFAULT_REPEATS = 3
+
+# Typed one keystroke at a time, plus a multi-word and a no-match query.
+_QUERIES = ("r", "re", "rev", "revi", "review", "budget anna", "zzz")
+_DATE_INPUTS = (
+    "today", "tomorrow", "next-week", "next-mon", "next-friday", "2026-02-10",
+    "2026-02-10T15:30", "15:30", "3pm", "3:15pm", "noon", "midnight",
+)
+
+
+# --- Cases ---
+# Each case takes (tasks, workdir) and returns a zero-argument sample
+# function; only the time spent inside the sample function is measured.
+
+def _search_build_index(tasks, workdir):
+    return lambda: build_search_index(tasks)
+
+
+def _search_filter(tasks, workdir):
+    index = build_search_index(tasks)
+
+    def sample():
+        for query in _QUERIES:
+            filter_tasks(tasks, query, search_index=index)
+    return sample
+
+
+def _group_by_list(tasks, workdir):
+    name_maps = container_name_maps()
+    return lambda: group_tasks_by_list(tasks, name_maps=name_maps)
+
+
+def _format(tasks, workdir):
+    formatter = TaskFormatter()
+
+    def sample():
+        for task in tasks:
+            formatter.format_for_display(task)
+            formatter.format_subtitle(task)
+    return sample
+
+
+def _date_parse(tasks, workdir):
+    parser = DateParser()
+    now = DEFAULT_NOW.replace(tzinfo=None)
+
+    def sample():
+        for text in _DATE_INPUTS:
+            parser.parse(text, now=now)
+    return sample
+
+
+def _cache_paths(workdir, name):
+    path = os.path.join(workdir, name)
+    return path, [path, path + ".journal", path + ".lock"]
+
+
+def _cache_save(tasks, workdir):
+    response = {"data": {"tasks": tasks}}
+    path, files = _cache_paths(workdir, "save.json")
+
+    def sample():
+        for f in files:
+            if os.path.exists(f):
+                os.remove(f)
+        cache = TaskCache(ttl=600, cache_path=path)
+        start = time.perf_counter()
+        cache.set_tasks(response)  # full snapshot: nothing to diff against
+        return time.perf_counter() - start
+    return sample
+
+
+def _cache_load(tasks, workdir):
+    path, _ = _cache_paths(workdir, "load.json")
+    TaskCache(ttl=600, cache_path=path).set_tasks({"data": {"tasks": tasks}})
+    return lambda: TaskCache(ttl=600, cache_path=path)
+
+
+# name -> (setup, depends on the task count)
+CASES = {
+    "search.build_index": (_search_build_index, True),
+    "search.filter": (_search_filter, True),
+    "task_lists.group": (_group_by_list, True),
+    "formatter.format": (_format, True),
+    "date_parser.parse": (_date_parse, False),
+    "cache.save": (_cache_save, True),
+    "cache.load": (_cache_load, True),
+}
+
+
+# --- Measuring ---
+
+def _time_sample(sample) -> float:
+    """Seconds for one sample (a sample may time itself by returning a float)."""
+    start = time.perf_counter()
+    result = sample()
+    elapsed = time.perf_counter() - start
+    return result if isinstance(result, float) else elapsed
+
+
+def percentile(ordered, q: float) -> float:
+    """Nearest-rank percentile (0 < q <= 100) of an already sorted, non-empty sequence."""
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _median(ordered):
+    n = len(ordered)
+    mid = n // 2
+    return ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _calibration_loop():
+    total = 0
+    for i in range(100_000):
+        total += i * i % 7
+    return total
+
+
+def calibrate(runs: int = 5) -> float:
+    """Median seconds of a fixed pure-Python loop: the machine's current speed."""
+    return _median(sorted(_time_sample(_calibration_loop) for _ in range(runs)))
+
+
+def summarize(samples_s, rounds=None, calibrations=None) -> dict:
+    """
+    {"median_ms", "p95_ms", "runs"} of sample durations in seconds. With
+    `rounds` (lists of samples), the median is the lowest round median; with
+    one calibration time per round, "relative" is the lowest round median
+    over its round's calibration.
+    """
+    ordered = sorted(samples_s)
+    if rounds:
+        medians = [_median(sorted(r)) for r in rounds]
+        median = min(medians)
+    else:
+        median = _median(ordered)
+    summary = {
+        "median_ms": round(median * 1000, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 4),
+        "runs": len(ordered),
+    }
+    if rounds and calibrations:
+        summary["relative"] = round(min(m / c for m, c in zip(medians, calibrations)), 6)
+    return summary
+
+
+def measure(sample, min_runs: int = 5, max_runs: int = 50, budget: float = 2.0,
+            repeats: int = _DEFAULT_REPEATS) -> dict:
+    _time_sample(sample)  # warm-up
+    rounds, calibrations = [], []
+    for _ in range(max(1, repeats)):
+        calibrations.append(calibrate())
+        samples = []
+        deadline = time.perf_counter() + budget / max(1, repeats)
+        while len(samples) < min_runs or (len(samples) < max_runs and time.perf_counter() < deadline):
+            samples.append(_time_sample(sample))
+        rounds.append(samples)
+    return summarize([s for r in rounds for s in r], rounds, calibrations)
+
+
+def run_suite(sizes=DEFAULT_SIZES, cases=None, seed: int = DEFAULT_SEED, min_runs: int = 5,
+              max_runs: int = 50, budget: float = 2.0, repeats: int = _DEFAULT_REPEATS, log=print) -> dict:
+    """{"case[size]" (or "case" for size-independent ones): summary}."""
+    selected = {name: CASES[name] for name in (cases or CASES)}
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="morgen-bench-")
+    try:
+        for name, (setup, sized) in selected.items():
+            if not sized:
+                results[name] = measure(setup([], workdir), min_runs, max_runs, budget, repeats)
+                log(_format_row(name, results[name]))
+        for size in sizes:
+            tasks = make_tasks(size, seed=seed)
+            for name, (setup, sized) in selected.items():
+                if sized:
+                    key = f"{name}[{size}]"
+                    results[key] = measure(setup(tasks, workdir), min_runs, max_runs, budget, repeats)
+                    log(_format_row(key, results[key]))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def _format_row(key, summary, note=""):
+    return f"{key:<30} median {summary['median_ms']:>10.3f} ms   p95 {summary['p95_ms']:>10.3f} ms   ({summary['runs']} runs){note}"
+
+
+# --- Baseline ---
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.3) -> list[str]:
+    """
+    Keys that regressed beyond `tolerance` (a fraction) against the baseline:
+    by "relative" when both sides have it, otherwise by median.
+    """
+    regressions = []
+    for key, summary in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        allowed = max(tolerance, _SUB_MS_TOLERANCE) if reference["median_ms"] < _SUB_MS else tolerance
+        field = "relative" if summary.get("relative") and reference.get("relative") else "median_ms"
+        slower = summary[field] > reference[field] * (1 + allowed)
+        if slower and summary["median_ms"] - reference["median_ms"] >= _MIN_REGRESSION_MS:
+            regressions.append(key)
+    return regressions
+
+
+def load_baseline(path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("results", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results: dict, seed: int):
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "created": datetime.now().strftime("%Y-%m-%d"),
+        },
+        "results": dict(sorted(results.items())),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Morgen Tasks benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds of sampling per case")
+    parser.add_argument("--repeats", type=int, default=_DEFAULT_REPEATS, help="sampling rounds per case")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed median slowdown (0.3 = 30%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.cases, args.seed, args.min_runs, args.max_runs, args.budget, args.repeats)
+
+    if args.json:
+        save_baseline(args.json, results, args.seed)
+    if args.update_baseline:
+        save_baseline(args.baseline, results, args.seed)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for key in regressions:
+        print(_format_row(key, results[key], f"   REGRESSED (baseline median {baseline[key]['median_ms']:.3f} ms)"))
+    print(f"{len(regressions)} regression(s) against {args.baseline}" if regressions else "No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
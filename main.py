@@ -6,7 +6,8 @@ Manage Morgen tasks from Ulauncher - list, search, and create tasks
 import logging
 import os
 import time
-from contextlib import contextmanager
+import uuid
+from contextlib import nullcontext
 from logging.handlers import RotatingFileHandler
 from ulauncher.api.client.Extension import Extension
 from ulauncher.api.client.EventListener import EventListener
@@ -27,6 +28,11 @@ try:
 except Exception:  # pragma: no cover - optional Ulauncher action
     OpenAction = None
 
+try:
+    from ulauncher.api.shared.Response import Response
+except Exception:  # pragma: no cover - older/newer Ulauncher without async push
+    Response = None
+
 from src.morgen_api import (
     MorgenAPIClient,
     MorgenAPIError,
@@ -34,9 +40,22 @@ from src.morgen_api import (
     MorgenRateLimitError,
     MorgenNetworkError,
 )
-from src.cache import TaskCache
+from src.morgen_async import AsyncMorgenAPIClient, EventLoopThread
+from src.cache import parse_ttl_preference
+from src.cache_pool import CachePool
+from src.rate_budget import BACKGROUND, INTERACTIVE, RateBudget
+from src.circuit_breaker import OPEN, CircuitBreaker
+from src.connection import ConnectionPool
+from src.outbox import LOCAL_ID_PREFIX, Outbox
+from src.bulk import BulkRunner
+from src.sync_worker import BACKGROUND_SYNC, HOUSEKEEPING, INTERACTIVE_FETCH, SyncWorker
+from src.metadata_cache import ContainerMetadataCache, merge_name_maps
+from src.background import BackgroundRenderer
 from src.formatter import TaskFormatter
+from src.search import filter_tasks
+from src.scheduler import PrefetchScheduler
 from src.date_parser import DateParser, DateParseError
+from src.tracing import annotate, format_trace, span, tracer
 from src.task_lists import group_tasks_by_list, get_task_list_ref, matches_list_name, matches_container_id
 
 logger = logging.getLogger(__name__)
@@ -44,18 +63,154 @@ logger = logging.getLogger(__name__)
 _LOG_FILE_NAME = "runtime.log"
 _MAX_NORMAL = 5       # Max results in normal (detailed) display mode
 _MAX_CONDENSED = 15   # Max results in condensed (compact) display mode
+_RUNTIME_LOG_HINT = "logs/runtime.log"
+_PREWARM_MARGIN = 30  # seconds left on the cache below which a fetch is likely
+
+
+def _format_wait(seconds: float) -> str:
+    seconds = max(1, int(round(seconds)))
+    return f"{seconds}s" if seconds < 60 else f"{(seconds + 59) // 60}m"
+
+
+def _count(n: int, noun: str, plural: str | None = None) -> str:
+    """Count with its noun, e.g. "1 task", "3 tasks"."""
+    return f"{n} {noun if n == 1 else plural or noun + 's'}"
+
+
+def _new_api_client(extension, api_key: str):
+    """API client whose rate-limit point ledger is persisted in the account's cache partition."""
+    budget_path = os.path.join(extension.cache_pool.partition_dir(api_key), "rate_budget.json")
+    return MorgenAPIClient(
+        api_key,
+        rate_budget=RateBudget(state_path=budget_path),
+        circuit=extension.circuit,
+        connections=extension.connections,
+    )
+
+
+def _new_async_client(extension, api_client):
+    """asyncio client for fan-out work, counting against the blocking client's budget and breaker."""
+    return AsyncMorgenAPIClient(
+        api_client.api_key,
+        rate_budget=api_client.rate_budget,
+        circuit=extension.circuit,
+        base_url=api_client.BASE_URL,
+    )
+
+
+def _maybe_prewarm(extension):
+    """Warm a connection in the background when this query will probably hit the API."""
+    if extension.circuit.state == OPEN:
+        return  # known offline; don't spend a connect timeout per keystroke
+    cache = extension.cache
+    if cache is None or not cache.has_data() or cache.ttl - cache.get_age() < _PREWARM_MARGIN:
+        extension.connections.prewarm_async()
+
+
+def _select_account(extension, api_key: str):
+    """Point extension.api_client / cache / outbox at this account (lazily created)."""
+    if extension.api_client is None or extension.api_client.api_key != api_key:
+        extension.api_client = _new_api_client(extension, api_key)
+        if extension.async_client is not None:
+            extension.event_loop.submit(extension.async_client.aclose())
+        extension.async_client = _new_async_client(extension, extension.api_client)
+        logger.info("API client initialized")
+    extension.cache = _get_account_cache(extension, api_key)
+
+    partition = extension.cache_pool.partition_dir(api_key)
+    outbox = extension.outboxes.get(partition)
+    if outbox is None:
+        outbox = Outbox(
+            os.path.join(partition, "outbox.jsonl"),
+            client=extension.api_client,
+            cache=extension.cache,
+            # Replays are background work; they must not hold up queries.
+            execute=lambda fn: extension.sync.call(BACKGROUND_SYNC, fn),
+        )
+        extension.outboxes[partition] = outbox
+        outbox.start()
+    outbox.client = extension.api_client
+    outbox.cache = extension.cache
+    extension.outbox = outbox
 
+    metadata = extension.metadata_caches.get(partition)
+    if metadata is None:
+        metadata = ContainerMetadataCache(os.path.join(partition, "containers.json"))
+        extension.metadata_caches[partition] = metadata
+    extension.metadata = metadata
 
-@contextmanager
-def _timed(label: str):
-    """Context manager for timing code blocks. Logs at DEBUG level."""
-    start = time.perf_counter()
-    try:
-        yield
-    finally:
-        elapsed_ms = (time.perf_counter() - start) * 1000
-        logger.debug("PERF %s: %.2fms", label, elapsed_ms)
-_RUNTIME_LOG_HINT = "logs/runtime.log"
+
+def _refresh_container_metadata(extension):
+    """
+    Fetch stale list/project/space names on the sync worker, next to the task
+    fetch. Nobody waits for it; views pick the names up once they are cached.
+    """
+    metadata, client = extension.metadata, extension.api_client
+    if metadata is None or client is None:
+        return
+    # Nothing cached yet: a container view may be waiting on these names.
+    lane, priority = (HOUSEKEEPING, BACKGROUND) if metadata.has_data() else (INTERACTIVE_FETCH, INTERACTIVE)
+    for kind in metadata.stale_kinds():
+        key = (id(metadata), kind)
+        running = extension.metadata_fetches.get(key)
+        if running is not None and not running.done():
+            continue
+
+        def fetch(kind=kind):
+            metadata.set_containers(kind, client.list_containers(kind, priority=priority))
+
+        future = extension.sync.submit(lane, fetch)
+        future.add_done_callback(_log_metadata_failure)
+        extension.metadata_fetches[key] = future
+
+
+def _log_metadata_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.info("Container metadata fetch failed: %s", future.exception())
+
+
+def _container_name_maps(extension):
+    """Container names: embedded in the task response, overridden by the metadata endpoints."""
+    embedded = extension.cache.get_container_name_maps() if extension.cache else {}
+    fetched = extension.metadata.get_name_maps() if extension.metadata else {}
+    return merge_name_maps(embedded, fetched)
+
+
+def _after_refresh(extension, cache):
+    """A full refresh replaced the cached tasks: re-apply unsynced local changes."""
+    outbox = extension.outbox
+    if outbox is not None and outbox.cache is cache:
+        outbox.apply_to_cache()
+        if outbox.pending_count():
+            outbox.kick()  # the API just answered, so try syncing now
+
+
+def _store_task_list(extension, cache, response):
+    """
+    Store a list_tasks() response in `cache` and return its tasks. A not-modified
+    response only bumps the cache timestamp (no rewrite, no re-indexing).
+    Returns None if it was not modified but there is no cached copy left to keep.
+    """
+    if getattr(response, "not_modified", False):
+        if not cache.touch(response.validators):
+            return None
+        outbox = extension.outbox
+        if outbox is not None and outbox.cache is cache and outbox.pending_count():
+            outbox.kick()  # the API just answered, so try syncing now
+        return ((cache.get_full_response() or {}).get("data") or {}).get("tasks") or []
+    cache.set_tasks(response, validators=getattr(response, "validators", None))
+    _after_refresh(extension, cache)
+    return response.get("data", {}).get("tasks", [])
+
+
+def _get_account_cache(extension, api_key: str):
+    """
+    This account's cache partition, for the configured backend (preference:
+    cache_backend) and TTL policy (preference: cache_ttl, seconds or "auto").
+    """
+    backend = (extension.preferences.get("cache_backend") or "json").strip().lower()
+    cache_ttl, ttl_bounds = parse_ttl_preference(extension.preferences.get("cache_ttl", "600"))
+    return extension.cache_pool.get(api_key, ttl=cache_ttl, ttl_bounds=ttl_bounds, backend=backend)
 
 
 def _setup_file_logging():
@@ -104,10 +259,61 @@ class MorgenTasksExtension(Extension):
         self.subscribe(KeywordQueryEvent, KeywordQueryEventListener())
         self.subscribe(ItemEnterEvent, ItemEnterEventListener())
         self.cache = None
+        self.cache_pool = CachePool()
         self.api_client = None
+        # Bulk actions fan out on this loop instead of a thread per request.
+        self.async_client = None
+        self.event_loop = EventLoopThread()
+        # Network reachability outlives API-key changes, so clients share one breaker.
+        self.circuit = CircuitBreaker()
+        # Keep-alive connections shared by every client; warmed now so the first
+        # query skips the DNS/TCP/TLS setup.
+        self.connections = ConnectionPool(MorgenAPIClient.BASE_URL)
+        self.connections.prewarm_async()
+        # Per-account queues of unsynced creates/closes (keyed by partition dir).
+        self.outboxes = {}
+        self.outbox = None
+        # Per-account list/project/space names (long TTL), and their running fetches.
+        self.metadata_caches = {}
+        self.metadata = None
+        self.metadata_fetches = {}
         self.last_manual_refresh_at = 0.0
+        # Every API call runs here, so user actions are never queued behind a prefetch.
+        self.sync = SyncWorker()
+        self.sync.start()
+        self.prefetcher = PrefetchScheduler(get_cache=lambda: self.cache, refresh=self.prefetch_tasks)
+        self.prefetcher.start()
+        # Without a pushable Response type, renders run inline (the old blocking behaviour).
+        self.background = BackgroundRenderer(self.push_result if Response is not None else None)
         logger.info("Morgen Tasks Extension initialized")
 
+    def push_result(self, event, items):
+        """Send a late result list for `event` (rendered on a worker thread) to Ulauncher."""
+        self._client.send(Response(event, RenderResultListAction(items)))
+
+    def prefetch_tasks(self, cache):
+        """Scheduled refresh, run on the prefetch thread before the cache expires."""
+        client = self.api_client
+        if client is None or cache is not self.cache:
+            return
+        with span("prefetch") as s, cache.refresh_lock():
+            # Another process may have refreshed while we waited for the lock.
+            cache.reload_if_changed()
+            if cache.is_fresh() and cache.ttl - cache.get_age() > self.prefetcher.lead_time + self.prefetcher.jitter:
+                s.set(skipped=True)
+                return
+            validators = cache.get_validators()
+            _refresh_container_metadata(self)
+            with span("api_call"):
+                response = self.sync.call(
+                    BACKGROUND_SYNC,
+                    lambda: client.list_tasks(limit=100, priority=BACKGROUND, validators=validators),
+                    key="prefetch",
+                )
+            if _store_task_list(self, cache, response) is None:
+                return  # cache was cleared meanwhile; the next query fetches in full
+        logger.info("Prefetched tasks before cache expiry")
+
 
 class KeywordQueryEventListener(EventListener):
     """Handles keyword query events"""
@@ -115,27 +321,26 @@ class KeywordQueryEventListener(EventListener):
     def on_event(self, event, extension):
         """Handle keyword query event"""
         raw_query = (event.get_argument() or "").strip()
-        logger.info("Keyword triggered with query: '%s'", raw_query)
-
         triggered_keyword = self._get_triggered_keyword(event)
+        with span("on_event", keyword=triggered_keyword, query_len=len(raw_query)):
+            return self._handle_query(event, extension, raw_query, triggered_keyword)
+
+    def _handle_query(self, event, extension, raw_query: str, triggered_keyword: str):
+        logger.info("Keyword triggered with query: '%s'", raw_query)
+        extension.prefetcher.notify_activity()
+        extension.background.mark_current(event)
 
         # Get preferences
         api_key = extension.preferences.get("api_key", "").strip()
-        cache_ttl_str = extension.preferences.get("cache_ttl", "600")
         new_task_keyword = (extension.preferences.get("mg_new_keyword") or "").strip()
 
-        try:
-            cache_ttl = int(cache_ttl_str)
-        except ValueError:
-            cache_ttl = 600
-
         # Help and debug commands work without API key
         help_items = self._maybe_build_help_flow(raw_query, extension)
         if help_items is not None:
             logger.info("Showing help view")
             return RenderResultListAction(help_items)
 
-        debug_items = self._maybe_build_debug_flow(raw_query)
+        debug_items = self._maybe_build_debug_flow(raw_query, extension)
         if debug_items is not None:
             logger.info("Showing debug view")
             return RenderResultListAction(debug_items)
@@ -152,11 +357,10 @@ class KeywordQueryEventListener(EventListener):
                 ),
             ])
 
-        # Lazy-init client and cache; re-create if API key changed
-        if extension.api_client is None or extension.api_client.api_key != api_key:
-            extension.api_client = MorgenAPIClient(api_key)
-            extension.cache = TaskCache(ttl=cache_ttl)
-            logger.info("API client initialized (cache TTL: %ds)", cache_ttl)
+        # Lazy-init client; re-create if API key changed. Caches are partitioned
+        # per account, so switching keys reuses that account's warm cache.
+        _select_account(extension, api_key)
+        _maybe_prewarm(extension)
 
         # Optional "new task" shortcut keyword (preference: mg_new_keyword)
         if triggered_keyword and new_task_keyword and triggered_keyword == new_task_keyword:
@@ -167,17 +371,16 @@ class KeywordQueryEventListener(EventListener):
             )
             return RenderResultListAction(create_items)
 
-        items = []
-        formatter = TaskFormatter()
-
         clear_items = self._maybe_clear_cache_flow(raw_query, extension)
         if clear_items is not None:
             logger.info("Cache clear requested")
             return RenderResultListAction(clear_items)
 
-        container_items = self._maybe_build_container_view(raw_query, extension)
-        if container_items is not None:
+        if self._is_container_view_query(raw_query):
             logger.info("Showing container view")
+            container_items = self._render_or_defer(
+                event, extension, lambda: self._maybe_build_container_view(raw_query, extension)
+            )
             return RenderResultListAction(container_items)
 
         # Phase 4: create task flow (mg new ...)
@@ -194,23 +397,58 @@ class KeywordQueryEventListener(EventListener):
 
         container_kind, list_filter, query = self._parse_container_filter_command(query)
 
+        def build_items():
+            return self._build_task_list_items(
+                extension,
+                query=query,
+                force_refresh=force_refresh,
+                refresh_prefix_used=refresh_prefix_used,
+                done_mode=done_mode,
+                container_kind=container_kind,
+                list_filter=list_filter,
+            )
+
+        items = self._render_or_defer(event, extension, build_items, force_refresh=force_refresh, query=query)
+        return RenderResultListAction(items)
+
+    def _build_task_list_items(
+        self,
+        extension,
+        *,
+        query: str,
+        force_refresh: bool,
+        refresh_prefix_used: bool,
+        done_mode: bool,
+        container_kind,
+        list_filter,
+    ):
+        """Task list view (may fetch from the API; runs on a worker on cache misses)."""
+        items = []
+        formatter = TaskFormatter()
+
         try:
-            tasks, cache_status = self._get_tasks(extension, force_refresh=force_refresh)
+            with span("get_tasks", force_refresh=force_refresh) as s:
+                tasks, cache_status = self._get_tasks(extension, force_refresh=force_refresh)
+                s.set(tasks=len(tasks), cache=cache_status)
 
             list_match_notice = None
             if list_filter:
-                name_maps = extension.cache.get_container_name_maps() if extension.cache else {}
-                tasks, list_match_notice = self._filter_tasks_by_container(
-                    tasks,
-                    list_filter,
-                    container_kind=container_kind,
-                    name_maps=name_maps,
-                )
+                with span("filter.container", kind=container_kind) as s:
+                    name_maps = _container_name_maps(extension)
+                    tasks, list_match_notice = self._filter_tasks_by_container(
+                        tasks,
+                        list_filter,
+                        container_kind=container_kind,
+                        name_maps=name_maps,
+                    )
+                    s.set(matched=len(tasks))
 
             # Search filtering (title + description)
             search_index = extension.cache.get_search_index() if extension.cache else None
-            with _timed("filter_tasks"):
-                filtered_tasks = self._filter_tasks(tasks, query, search_index=search_index)
+            with span("filter.search", query_len=len(query)) as s:
+                matched_ids = extension.cache.match_task_ids(query) if extension.cache and query else None
+                filtered_tasks = filter_tasks(tasks, query, search_index=search_index, matched_ids=matched_ids)
+                s.set(matched=len(filtered_tasks))
 
             if refresh_prefix_used:
                 items.append(self._refresh_prefix_notice(extension))
@@ -223,6 +461,12 @@ class KeywordQueryEventListener(EventListener):
             else:
                 enter_hint = "Enter: no action"
 
+            ttl_display = extension.cache.get_ttl_display() if extension.cache else ""
+            ttl_suffix = f" · {ttl_display}" if ttl_display else ""
+            pending = extension.outbox.pending_count() if extension.outbox else 0
+            if pending:
+                ttl_suffix += f" · {pending} pending sync"
+
             if list_filter and container_kind:
                 list_suffix = f" — {self._container_label(container_kind)}: {list_filter}"
             elif list_filter:
@@ -232,10 +476,14 @@ class KeywordQueryEventListener(EventListener):
             items.append(ExtensionResultItem(
                 icon='images/icon.png',
                 name=f'{"Morgen Tasks — Done" if done_mode else "Morgen Tasks"}{list_suffix} ({len(filtered_tasks)})',
-                description=f'Cache: {cache_status} | {enter_hint} | "help" for commands | "refresh"/"!" to refresh',
+                description=f'Cache: {cache_status}{ttl_suffix} | {enter_hint} | "help" for commands | "refresh"/"!" to refresh',
                 on_enter=HideWindowAction()
             ))
 
+            # Only for a search: a bare "mg d" lists every open task in the account.
+            if done_mode and query and len(filtered_tasks) > 1:
+                items.append(self._complete_all_item(filtered_tasks, query))
+
             if not filtered_tasks:
                 items.append(ExtensionResultItem(
                     icon='images/icon.png',
@@ -249,8 +497,9 @@ class KeywordQueryEventListener(EventListener):
                 max_display = _MAX_CONDENSED if condensed else _MAX_NORMAL
                 display_tasks = filtered_tasks[:max_display]
 
-                with _timed(f"format_{len(display_tasks)}_tasks"):
-                    name_maps = extension.cache.get_container_name_maps() if extension.cache else {}
+                extension.background.ensure_current()
+                with span("format", tasks=len(display_tasks), condensed=condensed):
+                    name_maps = _container_name_maps(extension)
                     for task in display_tasks:
                         task_id = task.get("id") or ""
                         list_ref = get_task_list_ref(task, name_maps=name_maps)
@@ -301,14 +550,19 @@ class KeywordQueryEventListener(EventListener):
                 ],
             ))
 
-        except MorgenRateLimitError:
-            logger.warning("Rate limit exceeded (429)")
+        except MorgenRateLimitError as e:
+            logger.warning("Rate limit exceeded: %s", getattr(e, "message", e))
+            wait_hint = (
+                f"Wait about {_format_wait(e.retry_after)} and try again."
+                if e.retry_after
+                else "Wait a minute and try again."
+            )
             items.extend(self._fallback_to_cache(
                 extension,
                 "Rate limit exceeded",
                 query=query,
                 suggestions=[
-                    "Wait a minute and try again.",
+                    wait_hint,
                     "Avoid using refresh repeatedly; refresh is one-shot.",
                     'Use cached results, or increase "Cache Duration" preference.',
                 ],
@@ -346,7 +600,49 @@ class KeywordQueryEventListener(EventListener):
                 ],
             ))
 
-        return RenderResultListAction(items)
+        return items
+
+    def _complete_all_item(self, tasks, query: str):
+        task_ids = [t.get("id") for t in tasks if t.get("id")]
+        return ExtensionResultItem(
+            icon='images/icon.png',
+            name=f'Complete all {len(task_ids)} matching "{query}"',
+            description='Enter: mark every task in this result as done',
+            on_enter=ExtensionCustomAction(
+                {"action": "complete_all", "task_ids": task_ids, "query": query},
+                keep_app_open=True,
+            ),
+        )
+
+    def _render_or_defer(self, event, extension, build, *, force_refresh=False, query=""):
+        """
+        Render inline when the cache can answer; otherwise fetch on a worker and
+        return a loading view (with stale tasks, if any) unless it finishes quickly.
+        """
+        if not self._needs_fetch(extension, force_refresh):
+            return build()
+        items = extension.background.run(event, build)
+        if items is not None:
+            return items
+        logger.info("Cache miss: showing loading view while tasks are fetched")
+        annotate(deferred=True)
+        return self._loading_items(extension, query=query)
+
+    def _needs_fetch(self, extension, force_refresh: bool) -> bool:
+        if force_refresh or extension.cache is None:
+            return True
+        extension.cache.reload_if_changed()
+        return not extension.cache.is_fresh()
+
+    def _loading_items(self, extension, query=""):
+        if extension.cache and extension.cache.has_data():
+            return self._fallback_to_cache(extension, "Loading tasks…", query=query)
+        return [ExtensionResultItem(
+            icon='images/icon.png',
+            name='Loading tasks…',
+            description='Fetching your tasks from Morgen. Results appear here when ready.',
+            on_enter=HideWindowAction()
+        )]
 
     def _get_triggered_keyword(self, event) -> str:
         """
@@ -460,6 +756,19 @@ class KeywordQueryEventListener(EventListener):
             return "Space"
         return "List"
 
+    _CONTAINER_VIEW_KINDS = {
+        "lists": None,
+        "ls": None,
+        "list": "list",
+        "project": "project",
+        "projects": "project",
+        "space": "space",
+        "spaces": "space",
+    }
+
+    def _is_container_view_query(self, raw_query: str) -> bool:
+        return bool(raw_query) and raw_query.strip().lower() in self._CONTAINER_VIEW_KINDS
+
     def _maybe_build_container_view(self, raw_query: str, extension):
         """
         Build container views for:
@@ -467,21 +776,10 @@ class KeywordQueryEventListener(EventListener):
           - `mg list` / `mg project` / `mg space` (kind-specific)
           - `mg projects` / `mg spaces`
         """
-        if not raw_query:
+        if not self._is_container_view_query(raw_query):
             return None
 
-        normalized = raw_query.strip().lower()
-        container_kind = None
-        if normalized in {"lists", "ls"}:
-            container_kind = None
-        elif normalized in {"list"}:
-            container_kind = "list"
-        elif normalized in {"project", "projects"}:
-            container_kind = "project"
-        elif normalized in {"space", "spaces"}:
-            container_kind = "space"
-        else:
-            return None
+        container_kind = self._CONTAINER_VIEW_KINDS[raw_query.strip().lower()]
 
         try:
             tasks, cache_status = self._get_tasks(extension, force_refresh=False)
@@ -492,7 +790,8 @@ class KeywordQueryEventListener(EventListener):
                 suggestions=['Try "mg" first, or "mg refresh".', 'Run "mg debug" for logs.'],
             )
 
-        name_maps = extension.cache.get_container_name_maps() if extension.cache else {}
+        _refresh_container_metadata(extension)
+        name_maps = _container_name_maps(extension)
         grouped = group_tasks_by_list(tasks, name_maps=name_maps)
         if container_kind:
             grouped = [(ref, count) for ref, count in grouped if ref.kind == container_kind]
@@ -661,7 +960,7 @@ class KeywordQueryEventListener(EventListener):
         rest = parts[1].strip() if len(parts) > 1 else ""
         return True, rest
 
-    def _maybe_build_debug_flow(self, raw_query: str):
+    def _maybe_build_debug_flow(self, raw_query: str, extension):
         if not raw_query:
             return None
 
@@ -669,9 +968,9 @@ class KeywordQueryEventListener(EventListener):
         if normalized not in {"debug", "log", "logs"}:
             return None
 
-        return self._build_debug_view_items()
+        return self._build_debug_view_items(extension)
 
-    def _build_debug_view_items(self):
+    def _build_debug_view_items(self, extension):
         items = [
             ExtensionResultItem(
                 icon="images/icon.png",
@@ -686,6 +985,30 @@ class KeywordQueryEventListener(EventListener):
             description="Logs sample task keys (and list-like fields) to the runtime log",
             on_enter=ExtensionCustomAction({"action": "dump_task_fields"}, keep_app_open=True),
         ))
+        stats = extension.sync.stats()
+        items.append(ExtensionResultItem(
+            icon="images/icon.png",
+            name="Sync queue: " + ", ".join(f"{lane} {n}" for lane, n in stats["queued"].items()),
+            description="Longest wait (s): " + ", ".join(f"{lane} {s}" for lane, s in stats["max_wait"].items()),
+            on_enter=HideWindowAction(),
+        ))
+        pool = extension.connections
+        items.append(ExtensionResultItem(
+            icon="images/icon.png",
+            name=f"Connections: {pool.idle_count()} warm",
+            description=f"Opened {pool.connections_opened}, reused {pool.reused}",
+            on_enter=HideWindowAction(),
+        ))
+        queries = tracer.traces("on_event")
+        if queries:
+            # The debug query itself is still running, so this is the one before it.
+            last = queries[-1]
+            items.append(ExtensionResultItem(
+                icon="images/icon.png",
+                name=f"Last query: {last.duration_ms:.1f} ms",
+                description=format_trace(last, max_depth=3),
+                on_enter=HideWindowAction(),
+            ))
         items.extend(self._runtime_log_access_items())
         return items
 
@@ -728,6 +1051,13 @@ class KeywordQueryEventListener(EventListener):
     def _build_create_flow_items(self, rest: str, *, usage: str):
         items = []
 
+        # ";" separates entries; so does a newline, for lists pasted from notes.
+        entries = [e.strip() for e in rest.replace("\n", ";").split(";") if e.strip()]
+        if len(entries) > 1:
+            return self._build_batch_create_items(entries, usage=usage)
+        if entries:
+            rest = entries[0]
+
         if not rest:
             items.append(ExtensionResultItem(
                 icon="images/icon.png",
@@ -772,6 +1102,8 @@ class KeywordQueryEventListener(EventListener):
             "title": title,
             "due": due,
             "priority": priority,
+            # One per rendered item: a repeated Enter is one task, a second "mg new" another.
+            "token": uuid.uuid4().hex,
         }
 
         items.append(ExtensionResultItem(
@@ -790,6 +1122,59 @@ class KeywordQueryEventListener(EventListener):
 
         return items
 
+    def _build_batch_create_items(self, entries, *, usage: str):
+        """Preview for `mg new a @due !p; b; c` — one task per `;`-separated (or pasted) line."""
+        parsed = [(entry, self._parse_create_args(entry, usage=usage)) for entry in entries]
+        valid = [p for _entry, p in parsed if not p.get("error")]
+        invalid = len(parsed) - len(valid)
+
+        items = []
+        if valid:
+            payload = {
+                "action": "create_tasks",
+                "tasks": [
+                    {"title": p["title"], "due": p.get("due"), "priority": p.get("priority", 0), "token": uuid.uuid4().hex}
+                    for p in valid
+                ],
+            }
+            skipped = f" ({_count(invalid, 'invalid entry', 'invalid entries')} skipped)" if invalid else ""
+            items.append(ExtensionResultItem(
+                icon="images/icon.png",
+                name=f"Create {_count(len(valid), 'task')}",
+                description=f"Press Enter to create {'it' if len(valid) == 1 else 'all of them'}{skipped}",
+                on_enter=ExtensionCustomAction(payload, keep_app_open=True),
+            ))
+        else:
+            items.append(ExtensionResultItem(
+                icon="images/icon.png",
+                name="Cannot create tasks",
+                description=f"No valid entries. Usage: {usage}; <title> ...",
+                on_enter=HideWindowAction(),
+            ))
+
+        for index, (entry, p) in enumerate(parsed, start=1):
+            if p.get("error"):
+                items.append(ExtensionResultItem(
+                    icon="images/icon.png",
+                    name=f"{index}. Invalid: {entry}",
+                    description=p["error"],
+                    on_enter=HideWindowAction(),
+                ))
+                continue
+            summary = []
+            if p.get("due"):
+                summary.append(f"Due: {p.get('due_display')}")
+            if p.get("priority"):
+                summary.append(f"Priority: {p['priority']}")
+            items.append(ExtensionResultItem(
+                icon="images/icon.png",
+                name=f"{index}. {p['title']}",
+                description=" | ".join(summary) or "No due date / priority",
+                on_enter=HideWindowAction(),
+            ))
+
+        return items
+
     _PRIORITY_NAMES = {
         "high": 1, "hi": 1, "h": 1, "urgent": 1,
         "medium": 5, "med": 5, "m": 5, "normal": 5,
@@ -908,68 +1293,65 @@ class KeywordQueryEventListener(EventListener):
         return False, raw_query, False
 
     def _get_tasks(self, extension, force_refresh: bool):
-        # Cache-first: check cache before making API call
-        if force_refresh and extension.cache:
-            logger.info("Force refresh requested (invalidating cache)")
-            extension.cache.invalidate()
+        # Cache-first: check cache before making API call. A forced refresh keeps the
+        # old data until the new response replaces it, so the loading view and
+        # error fallbacks can still show it.
+        if force_refresh:
+            logger.info("Force refresh requested (bypassing cache)")
 
-        with _timed("cache_lookup"):
+        with span("cache_lookup"):
             tasks = extension.cache.get_tasks() if extension.cache and not force_refresh else None
         if tasks is not None:
             cache_status = f"cached {extension.cache.get_age_display()}"
             logger.info("Using cached tasks: %d tasks (age=%s)", len(tasks), extension.cache.get_age_display())
             return tasks, cache_status
 
-        logger.info("Fetching tasks from API%s...", " (force refresh)" if force_refresh else "")
-        with _timed("api_call"):
-            response = extension.api_client.list_tasks(limit=100)
-        if extension.cache:
-            with _timed("cache_store"):
-                extension.cache.set_tasks(response)
-            cache_status = "refreshed" if force_refresh else "fresh"
-        else:
-            cache_status = "fresh"
+        # Queries typed while a fetch is in flight join it instead of starting
+        # their own; a superseded query stops here rather than rendering.
+        cache = extension.cache
+        tasks, cache_status = extension.background.shared(
+            ("list_tasks", id(cache)),
+            lambda: self._fetch_tasks(extension, cache, force_refresh),
+        )
+        extension.background.ensure_current()
+        return tasks, cache_status
+
+    def _fetch_tasks(self, extension, cache, force_refresh: bool):
+        # One refetch per machine: other Ulauncher sessions/scripts sharing the
+        # cache file wait here and then pick up the result from disk.
+        with (cache.refresh_lock() if cache else nullcontext()):
+            if cache and not force_refresh:
+                tasks = cache.get_tasks()
+                if tasks is not None:
+                    logger.info("Cache refreshed by another process: %d tasks", len(tasks))
+                    return tasks, f"cached {cache.get_age_display()}"
+
+            logger.info("Fetching tasks from API%s...", " (force refresh)" if force_refresh else "")
+            client = extension.api_client
+            validators = cache.get_validators() if cache else None
+            _refresh_container_metadata(extension)
+            with span("api_call"):
+                response = extension.sync.call(
+                    INTERACTIVE_FETCH, lambda: client.list_tasks(limit=100, validators=validators)
+                )
+            tasks = None
+            if cache:
+                with span("cache_store"):
+                    tasks = _store_task_list(extension, cache, response)
+                if tasks is None:
+                    # Not modified, but the cache was cleared meanwhile: fetch in full.
+                    response = extension.sync.call(INTERACTIVE_FETCH, lambda: client.list_tasks(limit=100))
+                    tasks = _store_task_list(extension, cache, response)
+                cache_status = "refreshed" if force_refresh else "fresh"
+            else:
+                cache_status = "fresh"
         if force_refresh:
             extension.last_manual_refresh_at = time.time()
-        tasks = response.get("data", {}).get("tasks", [])
+        if tasks is None:
+            tasks = response.get("data", {}).get("tasks", [])
         logger.info("API tasks loaded: %d tasks", len(tasks))
         return tasks, cache_status
 
-    def _filter_tasks(self, tasks, query: str, search_index=None):
-        if not query:
-            return tasks
-
-        words = query.lower().split()
-        if not words:
-            return tasks
-
-        filtered = []
-
-        # Use pre-computed search index if available (O(1) lowercase lookup)
-        if search_index:
-            for task in tasks:
-                task_id = task.get("id")
-                indexed = search_index.get(task_id) if task_id else None
-                if indexed:
-                    title, description = indexed
-                else:
-                    # Fallback for tasks not in index
-                    title = (task.get("title") or "").lower()
-                    description = (task.get("description") or "").lower()
-                text = title + " " + description
-                if all(w in text for w in words):
-                    filtered.append(task)
-        else:
-            # No index: compute lowercase on the fly
-            for task in tasks:
-                title = (task.get("title") or "").lower()
-                description = (task.get("description") or "").lower()
-                text = title + " " + description
-                if all(w in text for w in words):
-                    filtered.append(task)
-
-        return filtered
-
     def _get_task_action(self, task_id: str):
         task_id = (task_id or "").strip()
         if not task_id:
@@ -1044,7 +1426,8 @@ class KeywordQueryEventListener(EventListener):
 
         tasks = cached.get("data", {}).get("tasks", [])
         search_index = extension.cache.get_search_index() if extension.cache else None
-        filtered_tasks = self._filter_tasks(tasks, query, search_index=search_index)
+        matched_ids = extension.cache.match_task_ids(query) if extension.cache and query else None
+        filtered_tasks = filter_tasks(tasks, query, search_index=search_index, matched_ids=matched_ids)
         age = extension.cache.get_age_display() if extension.cache else "unknown"
         logger.info("Fallback to cached response: %d tasks (cache age=%s)", len(tasks), age)
 
@@ -1173,7 +1556,9 @@ class ItemEnterEventListener(EventListener):
             return HideWindowAction()
 
         action = data.get("action")
-        if action not in {"create_task", "complete_task", "show_list", "dump_task_fields"}:
+        if action not in {
+            "create_task", "create_tasks", "complete_task", "complete_all", "show_list", "dump_task_fields",
+        }:
             return HideWindowAction()
 
         title = (data.get("title") or "").strip()
@@ -1191,13 +1576,8 @@ class ItemEnterEventListener(EventListener):
         container_kind = (data.get("container_kind") or "").strip().lower() or None
 
         api_key = extension.preferences.get("api_key", "").strip()
-        cache_ttl_str = extension.preferences.get("cache_ttl", "600")
-        try:
-            cache_ttl = int(cache_ttl_str)
-        except ValueError:
-            cache_ttl = 600
 
-        if not api_key and action in {"create_task", "complete_task"}:
+        if not api_key and action in {"create_task", "create_tasks", "complete_task", "complete_all"}:
             return RenderResultListAction([ExtensionResultItem(
                 icon='images/icon.png',
                 name='Cannot create task',
@@ -1205,12 +1585,9 @@ class ItemEnterEventListener(EventListener):
                 on_enter=HideWindowAction()
             )])
 
-        # Ensure cache is initialized (needed for list view and for invalidation on actions)
-        if extension.api_client is None or extension.api_client.api_key != api_key:
-            if api_key:
-                extension.api_client = MorgenAPIClient(api_key)
-        if extension.cache is None:
-            extension.cache = TaskCache(ttl=cache_ttl)
+        # Ensure this account's cache is selected (needed for list view and for cache updates on actions)
+        if api_key:
+            _select_account(extension, api_key)
 
         try:
             if action == "dump_task_fields":
@@ -1250,7 +1627,7 @@ class ItemEnterEventListener(EventListener):
                         break
 
                 try:
-                    name_maps = extension.cache.get_container_name_maps() if extension.cache else {}
+                    name_maps = _container_name_maps(extension)
                 except Exception:
                     name_maps = {}
 
@@ -1292,8 +1669,13 @@ class ItemEnterEventListener(EventListener):
                 kind_label = KeywordQueryEventListener()._container_label(container_kind)
                 list_label = list_name or list_id or kind_label
                 filtered = []
-                name_maps = extension.cache.get_container_name_maps() if extension.cache else {}
-                for t in tasks:
+                name_maps = _container_name_maps(extension)
+                if list_id and not list_name:
+                    # Indexed lookup on SQLite; a plain scan on the JSON cache.
+                    filtered = extension.cache.get_tasks_in_container(container_kind, list_id)
+                # Tasks may match by name only (no id, or an id the index doesn't know),
+                # so with a name the single combined scan stays authoritative.
+                for t in ([] if filtered else tasks):
                     ref = get_task_list_ref(t, name_maps=name_maps)
                     if container_kind and ref.kind != container_kind:
                         continue
@@ -1360,21 +1742,25 @@ class ItemEnterEventListener(EventListener):
                 return RenderResultListAction(items)
 
             if action == "create_task":
-                resp = extension.api_client.create_task(title=title, due=due, priority=priority)
-                created_id = resp.get("data", {}).get("id") or ""
-
-                if extension.cache:
-                    extension.cache.invalidate()
-
-                description = f"Created (id: {created_id})" if created_id else "Created"
-                logger.info("Task created (id=%s)", created_id or "unknown")
+                # Queued locally and shown in the cache right away; the outbox
+                # drainer sends it to Morgen (now, or once reachable again).
+                local_id = extension.outbox.enqueue_create(
+                    title=title, due=due, priority=priority, token=data.get("token") or None
+                )
+                logger.info("Task queued for creation (local id=%s)", local_id)
                 return RenderResultListAction([ExtensionResultItem(
                     icon='images/icon.png',
                     name='Task created',
-                    description=description,
+                    description=f'{title} — syncing to Morgen in the background',
                     on_enter=HideWindowAction()
                 )])
 
+            if action == "create_tasks":
+                return RenderResultListAction(self._create_all(extension, data.get("tasks") or []))
+
+            if action == "complete_all":
+                return RenderResultListAction(self._complete_all(extension, data.get("task_ids") or []))
+
             if not task_id:
                 return RenderResultListAction([ExtensionResultItem(
                     icon='images/icon.png',
@@ -1383,12 +1769,10 @@ class ItemEnterEventListener(EventListener):
                     on_enter=HideWindowAction()
                 )])
 
-            extension.api_client.close_task(task_id)
-            if extension.cache:
-                extension.cache.invalidate()
+            extension.outbox.enqueue_close(task_id)
 
             completed_title = task_title or task_id
-            logger.info("Task completed (id=%s)", task_id)
+            logger.info("Task queued for completion (id=%s)", task_id)
             return RenderResultListAction([
                 ExtensionResultItem(
                     icon='images/icon.png',
@@ -1413,12 +1797,13 @@ class ItemEnterEventListener(EventListener):
                 on_enter=HideWindowAction()
             )])
 
-        except MorgenRateLimitError:
+        except MorgenRateLimitError as e:
             logger.warning("%s failed: rate limit", action)
+            when = f"in about {_format_wait(e.retry_after)}" if e.retry_after else "later"
             return RenderResultListAction([ExtensionResultItem(
                 icon='images/icon.png',
                 name='Rate limit exceeded',
-                description='Try again later. Run "mg debug" for logs.',
+                description=f'Try again {when}. Run "mg debug" for logs.',
                 on_enter=HideWindowAction()
             )])
 
@@ -1440,6 +1825,109 @@ class ItemEnterEventListener(EventListener):
                 on_enter=HideWindowAction()
             )])
 
+    def _complete_all(self, extension, task_ids):
+        """Close every task concurrently; failures that are only connectivity/rate limits go to the outbox."""
+        task_ids = [str(t).strip() for t in task_ids if str(t or "").strip()]
+        cached = extension.cache.get_full_response() if extension.cache else None
+        titles = {
+            t.get("id"): t.get("title") or t.get("id")
+            for t in ((cached or {}).get("data") or {}).get("tasks") or []
+        }
+
+        # Tasks created offline have no server id yet; the outbox closes them after syncing.
+        queued = [t for t in task_ids if t.startswith(LOCAL_ID_PREFIX)]
+        for task_id in queued:
+            extension.outbox.enqueue_close(task_id, apply_to_cache=False)
+        remote_ids = [t for t in task_ids if not t.startswith(LOCAL_ID_PREFIX)]
+
+        with span("complete_all", tasks=len(remote_ids), queued=len(queued)):
+            # Each close is bounded by its retry deadline, so this needs no timeout of its own.
+            results = extension.event_loop.run(BulkRunner().arun(remote_ids, extension.async_client.close_task))
+
+        closed = [r.item for r in results if r.ok]
+        failed = []
+        for r in results:
+            if r.ok:
+                continue
+            if isinstance(r.error, (MorgenNetworkError, MorgenRateLimitError)):
+                extension.outbox.enqueue_close(r.item, apply_to_cache=False)
+                queued.append(r.item)
+            else:
+                failed.append(r)
+
+        # One cache update for the whole batch.
+        if extension.cache and (closed or queued):
+            extension.cache.remove_tasks(closed + queued)
+        logger.info("Complete all: %d closed, %d queued, %d failed", len(closed), len(queued), len(failed))
+
+        summary = f"Completed {len(closed)} of {_count(len(task_ids), 'task')}"
+        details = []
+        if queued:
+            details.append(f"{len(queued)} will sync when Morgen is reachable")
+        if failed:
+            details.append(f"{len(failed)} failed")
+        items = [ExtensionResultItem(
+            icon='images/icon.png',
+            name=summary,
+            description="; ".join(details) or 'All done. Run "mg" to reload tasks.',
+            on_enter=HideWindowAction(),
+        )]
+        for r in failed:
+            items.append(ExtensionResultItem(
+                icon='images/icon.png',
+                name=f'Failed: {titles.get(r.item, r.item)}',
+                description=str(getattr(r.error, "message", r.error)),
+                on_enter=HideWindowAction(),
+            ))
+        return items
+
+    def _create_all(self, extension, entries):
+        """
+        Queue every entry in the outbox, like a single create: Enter returns at
+        once, and each entry's token makes a repeated Enter a no-op.
+        """
+        created = []
+        failed = []
+        with span("create_all", tasks=len(entries)):
+            for entry in entries:
+                if not isinstance(entry, dict) or not str(entry.get("title") or "").strip():
+                    continue
+                title = str(entry["title"]).strip()
+                try:
+                    extension.outbox.enqueue_create(
+                        title=title,
+                        due=entry.get("due") or None,
+                        priority=int(entry.get("priority") or 0),
+                        token=entry.get("token") or None,
+                    )
+                    created.append(title)
+                except (TypeError, ValueError) as e:
+                    failed.append((title, e))
+        logger.info("Create all: %d queued, %d invalid", len(created), len(failed))
+
+        description = "Syncing to Morgen in the background"
+        if failed:
+            description += f"; {len(failed)} failed"
+        items = [ExtensionResultItem(
+            icon='images/icon.png',
+            name=f"Created {_count(len(created), 'task')}",
+            description=description,
+            on_enter=HideWindowAction(),
+        )]
+        for title in created:
+            items.append(ExtensionSmallResultItem(
+                icon='images/icon.png',
+                name=f"Created: {title}",
+                on_enter=HideWindowAction(),
+            ))
+        for title, error in failed:
+            items.append(ExtensionResultItem(
+                icon='images/icon.png',
+                name=f"Failed: {title}",
+                description=str(error),
+                on_enter=HideWindowAction(),
+            ))
+        return items
 
 if __name__ == '__main__':
     MorgenTasksExtension().run()
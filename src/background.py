@@ -0,0 +1,145 @@
+"""
+Background Rendering
+
+Runs renders that may hit the network off the Ulauncher event thread.
+
+The event handler returns immediately (a "loading" view with any stale data)
+when the render does not finish within a short grace period; the real result
+is pushed to Ulauncher once ready, but only if its query is still the latest
+one, so a slow or offline network never freezes the launcher.
+
+Every query gets a sequence number (latest wins); each worker keeps the
+number of the query it renders, and workers for queries that have been
+superseded stop at their next `ensure_current()` checkpoint, and
+fetches started through `shared()` are joined by every query waiting on them
+instead of being repeated.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+
+try:
+    from src.singleflight import SingleFlight
+except Exception:  # pragma: no cover - test/import environment differences
+    from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_GRACE = 0.15  # seconds to wait before falling back to the loading view
+
+
+class QueryCancelled(BaseException):
+    """
+    Raised at a checkpoint when the worker's query has been superseded.
+
+    A BaseException (like asyncio.CancelledError) so the listeners' broad
+    `except Exception` error views do not swallow it.
+    """
+
+
+class BackgroundRenderer:
+    """Run render callables on worker threads and push late results for the current query."""
+
+    def __init__(self, send, grace: float = _DEFAULT_GRACE):
+        """
+        Args:
+            send: Callable(event, items) delivering a late result to Ulauncher.
+                  None disables background rendering (renders run inline).
+            grace: Seconds to wait for the worker before returning None.
+        """
+        self._send = send
+        self.grace = grace
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._local = threading.local()
+        self._flights = SingleFlight()
+        self.cancelled = 0
+
+    def mark_current(self, event) -> int:
+        """Start a new query (`event` is the latest); returns its sequence number."""
+        with self._lock:
+            self._seq += 1
+            return self._seq
+
+    def is_current(self, seq: int) -> bool:
+        """True while no query has been marked since the one numbered `seq`."""
+        with self._lock:
+            return self._seq == seq
+
+    def ensure_current(self):
+        """
+        Checkpoint for render code: raise QueryCancelled if this worker's query
+        is no longer the latest. No-op for inline renders.
+        """
+        seq = getattr(self._local, "seq", None)
+        if seq is not None and not self.is_current(seq):
+            raise QueryCancelled()
+
+    def shared(self, key, fn):
+        """Run `fn()` once for all queries currently waiting on `key` (e.g. the task fetch)."""
+        return self._flights.do(key, fn)
+
+    def run(self, event, build, seq: int | None = None):
+        """
+        Run `build()` (returning result items) for `event` on a worker thread.
+
+        Returns the items if they are ready within the grace period, otherwise
+        None; the caller then renders a loading view and the items are pushed
+        via `send` when ready (if `event` is still current).
+
+        `seq` is the number `mark_current(event)` returned; by default the
+        latest query's, which is `event`'s when called from its handler.
+        """
+        if self._send is None:
+            return build()
+        if seq is None:
+            with self._lock:
+                seq = self._seq
+
+        state = {"items": None, "done": False, "deferred": False}
+        lock = threading.Lock()
+        finished = threading.Event()
+
+        def worker():
+            self._local.seq = seq
+            try:
+                self.ensure_current()
+                items = build()
+            except QueryCancelled:
+                with self._lock:
+                    self.cancelled += 1
+                logger.debug("Background render cancelled (query superseded)")
+                items = None
+            except Exception:
+                logger.exception("Background render failed")
+                items = None
+            finally:
+                self._local.seq = None
+            with lock:
+                state["items"] = items
+                state["done"] = True
+                deferred = state["deferred"]
+            finished.set()
+            if not deferred or items is None:
+                return
+            if not self.is_current(seq):
+                logger.info("Dropping background result for an outdated query")
+                return
+            try:
+                self._send(event, items)
+                logger.info("Pushed background result (%d items)", len(items))
+            except Exception:
+                logger.exception("Failed to push background result")
+
+        # The worker inherits the caller's context (and so its tracing span).
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(worker,), name="morgen-render", daemon=True).start()
+        finished.wait(self.grace)
+        with lock:
+            if state["done"]:
+                return state["items"]
+            state["deferred"] = True
+        return None
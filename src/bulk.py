@@ -0,0 +1,162 @@
+"""
+Bulk Operations
+
+Run one API call per item on a small pool of worker threads, or as
+coroutines on an event loop (`arun`, for the asyncio client).
+
+Concurrency starts at `max_workers` and is halved (down to 1) whenever Morgen
+rate-limits us; the rate-limited item is retried after its `retry_after` if
+that is short enough, otherwise it is reported as failed so the caller can
+queue it for later. Results come back in input order with per-item errors.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+
+try:
+    from src.morgen_api import MorgenRateLimitError
+except Exception:  # pragma: no cover - test/import environment differences
+    from morgen_api import MorgenRateLimitError
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_WORKERS = 4
+_DEFAULT_MAX_WAIT = 5.0       # longest Retry-After we wait out inside one user action
+_MAX_RATE_LIMIT_RETRIES = 3
+
+
+class BulkResult:
+    """Outcome for one item: `value` on success, `error` (an exception) on failure."""
+
+    __slots__ = ("item", "value", "error")
+
+    def __init__(self, item, value=None, error=None):
+        self.item = item
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"BulkResult({self.item!r}, ok={self.ok})"
+
+
+class BulkRunner:
+    """Bounded, rate-limit-aware parallel map."""
+
+    def __init__(
+        self,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        max_wait: float = _DEFAULT_MAX_WAIT,
+        sleep=time.sleep,
+        async_sleep=asyncio.sleep,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+
+    def run(self, items, fn) -> list[BulkResult]:
+        """Call `fn(item)` for every item; returns a BulkResult per item, in input order."""
+        items = list(items)
+        results: list[BulkResult | None] = [None] * len(items)
+        queue = deque(range(len(items)))
+        attempts = [0] * len(items)
+        cond = threading.Condition()
+        state = {"limit": self.max_workers, "active": 0, "paused_until": 0.0}
+
+        def worker():
+            while True:
+                with cond:
+                    while queue and state["active"] >= state["limit"]:
+                        cond.wait()
+                    if not queue:
+                        return
+                    index = queue.popleft()
+                    state["active"] += 1
+                    wait = state["paused_until"] - time.monotonic()
+                try:
+                    if wait > 0:
+                        self._sleep(wait)
+                    results[index] = BulkResult(items[index], value=fn(items[index]))
+                except MorgenRateLimitError as e:
+                    with cond:
+                        self._on_rate_limited(e, index, items, results, queue, attempts, state)
+                except Exception as e:
+                    results[index] = BulkResult(items[index], error=e)
+                finally:
+                    with cond:
+                        state["active"] -= 1
+                        cond.notify_all()
+
+        # Each worker runs in its own copy of the caller's context (tracing spans).
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(worker,), name=f"morgen-bulk-{i}", daemon=True)
+            for i in range(min(self.max_workers, len(items)))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        failed = sum(1 for r in results if r is not None and not r.ok)
+        logger.info("Bulk run: %d items, %d failed", len(items), failed)
+        return results
+
+    async def arun(self, items, fn) -> list[BulkResult]:
+        """`run` for coroutine functions: awaits `fn(item)` on the running loop, same limits and order."""
+        items = list(items)
+        results: list[BulkResult | None] = [None] * len(items)
+        queue = deque(range(len(items)))
+        attempts = [0] * len(items)
+        cond = asyncio.Condition()
+        state = {"limit": self.max_workers, "active": 0, "paused_until": 0.0}
+
+        async def worker():
+            while True:
+                async with cond:
+                    while queue and state["active"] >= state["limit"]:
+                        await cond.wait()
+                    if not queue:
+                        return
+                    index = queue.popleft()
+                    state["active"] += 1
+                    wait = state["paused_until"] - time.monotonic()
+                try:
+                    if wait > 0:
+                        await self._async_sleep(wait)
+                    results[index] = BulkResult(items[index], value=await fn(items[index]))
+                except MorgenRateLimitError as e:
+                    self._on_rate_limited(e, index, items, results, queue, attempts, state)
+                except Exception as e:
+                    results[index] = BulkResult(items[index], error=e)
+                finally:
+                    async with cond:
+                        state["active"] -= 1
+                        cond.notify_all()
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_workers, len(items)))))
+
+        failed = sum(1 for r in results if r is not None and not r.ok)
+        logger.info("Bulk run: %d items, %d failed", len(items), failed)
+        return results
+
+    def _on_rate_limited(self, error, index, items, results, queue, attempts, state):
+        """Halve the limit and requeue the item unless the wait is too long; the caller holds the run's lock."""
+        retry_after = error.retry_after or 1.0
+        state["limit"] = max(1, state["limit"] // 2)
+        attempts[index] += 1
+        if retry_after > self.max_wait or attempts[index] > _MAX_RATE_LIMIT_RETRIES:
+            results[index] = BulkResult(items[index], error=error)
+            return
+        state["paused_until"] = max(state["paused_until"], time.monotonic() + retry_after)
+        queue.appendleft(index)
+        logger.info("Bulk run rate-limited; concurrency now %d, pausing %.1fs", state["limit"], retry_after)
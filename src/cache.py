@@ -3,41 +3,285 @@ Task Cache
 
 In-memory cache for Morgen tasks with TTL-based expiration.
 Minimizes API calls since the list endpoint costs 10 points per request.
+
+On disk the cache is a base snapshot (tasks_cache.json) plus an append-only
+journal (tasks_cache.json.journal) of upserts and deletions. Each refresh or
+local mutation appends only what changed; the journal is folded back into the
+snapshot on a background thread once it grows past `journal_max_bytes`.
+
+Several processes may share the same cache files: writers serialize on an
+fcntl advisory lock (tasks_cache.json.lock), readers notice another process's
+writes through a cheap stat() stamp and reload only then, and refresh_lock()
+lets one process refetch while the others wait for its result.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
 import time
 import logging
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+try:
+    from src.search import build_search_index
+    from src.tracing import annotate, traced
+except Exception:  # pragma: no cover - test/import environment differences
+    from search import build_search_index
+    from tracing import annotate, traced
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ulauncher-morgen-tasks")
-_DEFAULT_CACHE_FILE = os.path.join(_DEFAULT_CACHE_DIR, "tasks_cache.json")
+_ACCOUNTS_DIR = "accounts"
+_DEFAULT_JOURNAL_MAX_BYTES = 256 * 1024
+_REFRESH_LOCK_TIMEOUT = 15.0  # seconds; a little above MorgenAPIClient.timeout
+
+# Adaptive TTL ("auto" cache_ttl preference)
+_DEFAULT_TTL = 600
+_DEFAULT_TTL_BOUNDS = (120, 3600)
+_TTL_GROWTH = 1.5           # no task changed since the last refresh
+_TTL_SHRINK = 0.5           # many tasks changed
+_BUSY_MIN_CHANGES = 3
+_BUSY_CHANGE_RATIO = 0.05
+
+
+def parse_ttl_preference(value, default: int = _DEFAULT_TTL):
+    """
+    Parse the `cache_ttl` preference.
+
+      "600"          -> (600, None)          static TTL
+      "auto"         -> (600, (120, 3600))   adaptive within default bounds
+      "auto:60-1800" -> (600, (60, 1800))    adaptive within custom bounds
+
+    Returns (ttl, bounds); bounds is None for a static TTL. Invalid values
+    fall back to the static default.
+    """
+    text = str(value if value is not None else "").strip().lower()
+    try:
+        return int(text), None
+    except ValueError:
+        pass
+
+    if not text.startswith("auto"):
+        return default, None
+
+    bounds = _DEFAULT_TTL_BOUNDS
+    spec = text[4:].lstrip(":= ").strip()
+    if spec:
+        try:
+            low, high = (int(part) for part in spec.split("-", 1))
+            if 0 < low <= high:
+                bounds = (low, high)
+        except ValueError:
+            pass
+    return min(max(default, bounds[0]), bounds[1]), bounds
+
+
+def account_partition_id(api_key: str) -> str:
+    """Stable, non-reversible directory name for an API key."""
+    return hashlib.sha256(api_key.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def account_cache_dir(api_key: str, base_dir: str | None = None) -> str:
+    """The account's partition directory (what CachePool uses for `api_key`)."""
+    return os.path.join(base_dir or _DEFAULT_CACHE_DIR, _ACCOUNTS_DIR, account_partition_id(api_key))
+
+
+def _format_duration(seconds) -> str:
+    seconds = int(seconds)
+    if seconds < 120:
+        return f"{seconds}s"
+    if seconds < 7200:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+
+def _count_changes(record) -> int | None:
+    """Tasks added, changed or removed by a `_diff_responses` record; None if unknown."""
+    if record is None:
+        return None
+    return len(record.get("upsert") or ()) + len(record.get("delete") or ())
+
+
+@contextmanager
+def _flock(path: str, *, blocking: bool = True, timeout: float | None = None):
+    """
+    Exclusive fcntl advisory lock on `path`; yields True when held.
+
+    With `timeout`, polls until the lock is free or the timeout passes (then
+    yields False). A no-op that always yields True where fcntl is unavailable.
+    """
+    if fcntl is None:
+        yield True
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    acquired = False
+    try:
+        if blocking and timeout is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            acquired = True
+        else:
+            deadline = time.monotonic() + (timeout or 0.0)
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if not blocking or time.monotonic() >= deadline:
+                        break
+                    time.sleep(0.05)
+        yield acquired
+    finally:
+        if acquired:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def _stat_stamp(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _response_envelope(api_response) -> dict:
+    """Copy of an API response without the task list (lists/projects/spaces/labelDefs...)."""
+    data = (api_response or {}).get("data") or {}
+    envelope = {k: v for k, v in (api_response or {}).items() if k != "data"}
+    envelope["data"] = {k: v for k, v in data.items() if k != "tasks"}
+    return envelope
+
+
+def _merge_tasks(current, incoming_tasks):
+    """Return `current` with `incoming_tasks` upserted by id (new ones appended)."""
+    incoming = {t.get("id"): t for t in incoming_tasks or [] if isinstance(t, dict) and t.get("id")}
+    merged = []
+    for task in current:
+        task_id = task.get("id")
+        merged.append(incoming.pop(task_id, task) if task_id else task)
+    merged.extend(incoming.values())
+    return merged
+
+
+def _diff_responses(old, new):
+    """
+    Journal record turning `old` into `new`, or None if the responses can't be
+    diffed by task id (missing/duplicate ids) and need a full snapshot.
+    """
+    old_tasks = old.get("data", {}).get("tasks") or []
+    new_tasks = new.get("data", {}).get("tasks") or []
+    old_by_id = {t.get("id"): t for t in old_tasks}
+    new_ids = [t.get("id") for t in new_tasks]
+    if None in old_by_id or None in new_ids:
+        return None
+    if len(old_by_id) != len(old_tasks) or len(set(new_ids)) != len(new_ids):
+        return None
+
+    record = {}
+    upsert = [t for t in new_tasks if old_by_id.get(t.get("id")) != t]
+    if upsert:
+        record["upsert"] = upsert
+    keep = set(new_ids)
+    delete = [task_id for task_id in old_by_id if task_id not in keep]
+    if delete:
+        record["delete"] = delete
+    # Replaying upsert+delete keeps old order and appends new ids; record
+    # the full order only when the API actually reordered tasks.
+    expected = [task_id for task_id in old_by_id if task_id in keep]
+    expected += [task_id for task_id in new_ids if task_id not in old_by_id]
+    if expected != new_ids:
+        record["order"] = new_ids
+    envelope = _response_envelope(new)
+    if envelope != _response_envelope(old):
+        record["envelope"] = envelope
+    return record
+
+
+def _apply_journal_record(cache: dict, record: dict) -> dict:
+    """Apply one journal record to a cached response; returns the updated response."""
+    tasks = cache.get("data", {}).get("tasks") or []
+    if "envelope" in record:
+        cache = dict(record["envelope"])
+        cache["data"] = dict(cache.get("data") or {})
+    if record.get("upsert"):
+        tasks = _merge_tasks(tasks, record["upsert"])
+    if record.get("delete"):
+        drop = set(record["delete"])
+        tasks = [t for t in tasks if t.get("id") not in drop]
+    if record.get("order"):
+        by_id = {t.get("id"): t for t in tasks}
+        ordered = [by_id.pop(task_id) for task_id in record["order"] if task_id in by_id]
+        tasks = ordered + list(by_id.values())
+    cache.setdefault("data", {})["tasks"] = tasks
+    return cache
 
 
 class TaskCache:
     """In-memory cache for Morgen tasks with TTL."""
 
-    def __init__(self, ttl=600, cache_path: str | None = None):
+    _default_file_name = "tasks_cache.json"
+
+    def __init__(
+        self,
+        ttl=600,
+        cache_path: str | None = None,
+        journal_max_bytes=_DEFAULT_JOURNAL_MAX_BYTES,
+        ttl_bounds: tuple[int, int] | None = None,
+        api_key: str | None = None,
+    ):
         """
         Args:
             ttl: Time-to-live in seconds (default 600 = 10 minutes).
-            cache_path: Optional path to persist cache to disk (JSON).
+            cache_path: Path to persist the cache to disk (JSON).
+            journal_max_bytes: Journal size that triggers background compaction.
+            ttl_bounds: (min, max) seconds to enable adaptive TTL; None keeps `ttl` static.
+            api_key: Without `cache_path`, use this account's partition, i.e. the
+                same files the extension uses for that key.
+
+        Raises:
+            ValueError: Neither `cache_path` nor `api_key` was given.
         """
+        if not cache_path:
+            if not api_key or not api_key.strip():
+                raise ValueError("TaskCache needs a cache_path or an api_key")
+            cache_path = os.path.join(account_cache_dir(api_key), self._default_file_name)
         self.ttl = ttl
-        self.cache_path = cache_path or _DEFAULT_CACHE_FILE
+        self.ttl_bounds = None
+        self._ttl_reason = "static"
+        self.set_ttl_policy(ttl, ttl_bounds)
+        self.cache_path = cache_path
+        self.journal_max_bytes = journal_max_bytes
+        self._journal_path = self.cache_path + ".journal"
+        self._lock_path = self.cache_path + ".lock"
+        self._journal_bytes = 0
+        self._io_lock = threading.RLock()
+        self._lock_depth = 0
+        self._disk_stamp = None  # (snapshot, journal) stat stamps as of our last read/write
+        self._generation = 0  # bumped when the on-disk base is replaced or deleted
+        self._compaction_thread = None
         self._cache = None
         self._timestamp = None
         self._last_updated = None  # newest task's 'updated' field, for updatedAfter
         self._search_index = None  # pre-computed lowercase text for fast search
+        self._validators = None  # ETag / Last-Modified / content hash of the cached response
 
         self._load_from_disk()
 
     def get_tasks(self):
         """Return cached task list if fresh, else None."""
+        self.reload_if_changed()
         if self._cache is None:
             logger.debug("Cache miss: empty")
             return None
@@ -52,6 +296,7 @@ class TaskCache:
 
     def get_full_response(self):
         """Return full cached API response if any data exists (even if expired)."""
+        self.reload_if_changed()
         return self._cache
 
     def get_container_name_maps(self) -> dict[str, dict[str, str]]:
@@ -70,35 +315,146 @@ class TaskCache:
 
         return build_container_name_maps(self._cache or {})
 
-    def set_tasks(self, api_response):
+    @traced("cache.set_tasks")
+    def set_tasks(self, api_response, validators=None):
         """
         Store an API response in the cache.
 
+        Only the difference against the previous response is appended to the
+        journal; a full snapshot is written when there is nothing to diff against.
+
         Args:
             api_response: Full response dict from MorgenAPIClient.list_tasks().
+            validators: The response's validators (etag / last_modified /
+                content_hash), sent back on the next conditional fetch.
         """
+        self.reload_if_changed()  # diff against what is on disk, not a stale copy
+        previous = self._cache
         self._cache = api_response
         self._timestamp = time.time()
+        self._validators = dict(validators) if validators else None
 
         tasks = api_response.get("data", {}).get("tasks", [])
         updated_times = [t.get("updated") for t in tasks if t.get("updated")]
         if updated_times:
             self._last_updated = max(updated_times)
 
+        record = _diff_responses(previous, api_response) if previous is not None else None
+        if previous is not None:
+            self._adapt_ttl(_count_changes(record), len(tasks))
+
         self._build_search_index(tasks)
         logger.info("Cache updated: %d tasks stored", len(tasks))
-        self._save_to_disk()
+        annotate(tasks=len(tasks))
 
-    def _build_search_index(self, tasks):
-        """Pre-compute lowercase title+description for fast searching."""
-        self._search_index = {}
+        if record is None:
+            self._save_to_disk()
+        else:
+            record["timestamp"] = self._timestamp
+            record["validators"] = self._validators
+            if self.ttl_bounds:
+                record["ttl"] = self._ttl_state()
+            self._append_journal(record)
+
+    def touch(self, validators=None) -> bool:
+        """
+        Mark the cached response as fresh again without rewriting it (the API
+        answered 304 Not Modified, or sent an identical body).
+
+        Costs one small journal line; the task list and search index are kept.
+        Returns False if there is nothing cached to touch.
+        """
+        self.reload_if_changed()
+        if self._cache is None:
+            return False
+        self._timestamp = time.time()
+        if validators:
+            self._validators = dict(self._validators or {}, **validators)
+        tasks = self._cache.get("data", {}).get("tasks") or []
+        self._adapt_ttl(0, len(tasks))
+        record = {"timestamp": self._timestamp, "validators": self._validators}
+        if self.ttl_bounds:
+            record["ttl"] = self._ttl_state()
+        self._append_journal(record)
+        logger.info("Cache revalidated: %d tasks unchanged", len(tasks))
+        return True
+
+    def get_validators(self) -> dict | None:
+        """Validators of the cached response, for a conditional list_tasks(); None if unknown."""
+        self.reload_if_changed()
+        if self._cache is None or not self._validators:
+            return None
+        return dict(self._validators)
+
+    @traced("cache.upsert")
+    def upsert_tasks(self, tasks):
+        """
+        Insert or update individual tasks (delta sync / local mutation).
+
+        New tasks are appended; existing tasks keep their position.
+        """
+        self.reload_if_changed()
+        if self._cache is None:
+            return
+        incoming = [t for t in tasks or [] if isinstance(t, dict) and t.get("id")]
+        if not incoming:
+            return
+
+        current = self._cache.setdefault("data", {}).setdefault("tasks", [])
+        merged = _merge_tasks(current, incoming)
+        self._cache["data"]["tasks"] = merged
+
+        updated_times = [t.get("updated") for t in merged if t.get("updated")]
+        self._last_updated = max(updated_times) if updated_times else None
+        self._build_search_index(merged)
+        # The cache no longer matches what the server sent: no 304 shortcut.
+        self._validators = None
+        self._append_journal({"upsert": incoming})
+
+    @traced("cache.remove")
+    def remove_tasks(self, task_ids):
+        """Drop tasks by id (e.g. after closing them)."""
+        self.reload_if_changed()
+        if self._cache is None:
+            return
+        drop = {str(i) for i in task_ids or [] if i}
+        if not drop:
+            return
+        data = self._cache.setdefault("data", {})
+        data["tasks"] = [t for t in data.get("tasks", []) if t.get("id") not in drop]
+        if self._search_index:
+            for task_id in drop:
+                self._search_index.pop(task_id, None)
+        self._validators = None
+        self._append_journal({"delete": sorted(drop)})
+
+    def match_task_ids(self, query: str):
+        """
+        Ids of tasks matching `query` via a backend index, or None when the
+        backend has no index and callers should scan (see search.filter_tasks).
+        """
+        return None
+
+    def get_tasks_in_container(self, container_kind: str | None, container_id: str):
+        """Cached tasks (even if expired) whose container id matches, case-insensitively."""
+        try:
+            from src.task_lists import get_task_list_ref, matches_container_id
+        except Exception:  # pragma: no cover - test/import environment differences
+            from task_lists import get_task_list_ref, matches_container_id
+
+        tasks = (self._cache or {}).get("data", {}).get("tasks", [])
+        matched = []
         for task in tasks:
-            task_id = task.get("id")
-            if not task_id:
+            ref = get_task_list_ref(task)
+            if container_kind and ref.kind != container_kind:
                 continue
-            title = (task.get("title") or "").lower()
-            description = (task.get("description") or "").lower()
-            self._search_index[task_id] = (title, description)
+            if ref.list_id and matches_container_id(ref.list_id, container_id):
+                matched.append(task)
+        return matched
+
+    def _build_search_index(self, tasks):
+        """Pre-compute lowercase title+description for fast searching."""
+        self._search_index = build_search_index(tasks)
         logger.debug("Search index built: %d entries", len(self._search_index))
 
     def get_search_index(self):
@@ -111,6 +467,71 @@ class TaskCache:
             return False
         return (time.time() - self._timestamp) < self.ttl
 
+    def set_ttl_policy(self, ttl, bounds: tuple[int, int] | None = None):
+        """
+        Use a static `ttl`, or adapt it within `bounds` from observed change rate.
+
+        Re-applying the same adaptive bounds keeps the TTL learned so far.
+        """
+        if not bounds:
+            self.ttl = ttl
+            self.ttl_bounds = None
+            self._ttl_reason = "static"
+            return
+        bounds = (int(bounds[0]), int(bounds[1]))
+        if bounds != self.ttl_bounds:
+            self.ttl_bounds = bounds
+            self.ttl = min(max(int(ttl), bounds[0]), bounds[1])
+            self._ttl_reason = "initial"
+
+    def get_ttl_display(self):
+        """Effective TTL and why it was chosen (adaptive mode only), e.g. 'TTL 15m (no changes)'."""
+        if not self.ttl_bounds:
+            return ""
+        return f"TTL {_format_duration(self.ttl)} ({self._ttl_reason})"
+
+    def _adapt_ttl(self, changed: int | None, total: int):
+        """
+        Lengthen the TTL after quiet refreshes, shorten it after busy ones.
+
+        `changed` is None when the refresh could not be compared with the
+        previous one (tasks without ids); the TTL is kept as it is.
+        """
+        if not self.ttl_bounds or changed is None:
+            return
+        low, high = self.ttl_bounds
+        if changed == 0:
+            ttl = min(high, self.ttl * _TTL_GROWTH)
+            reason = "no changes"
+        elif changed >= max(_BUSY_MIN_CHANGES, total * _BUSY_CHANGE_RATIO):
+            ttl = max(low, self.ttl * _TTL_SHRINK)
+            reason = f"{changed} changed"
+        else:
+            ttl = self.ttl
+            reason = f"{changed} changed"
+        if int(ttl) != self.ttl:
+            logger.info("Adaptive TTL %ds -> %ds (%s)", self.ttl, int(ttl), reason)
+        self.ttl = int(ttl)
+        self._ttl_reason = reason
+
+    def _ttl_state(self):
+        return {"value": self.ttl, "reason": self._ttl_reason}
+
+    def _restore_ttl_state(self, state):
+        if not self.ttl_bounds or not isinstance(state, dict):
+            return
+        try:
+            value = int(state.get("value"))
+        except (TypeError, ValueError):
+            return
+        low, high = self.ttl_bounds
+        self.ttl = min(max(value, low), high)
+        self._ttl_reason = str(state.get("reason") or "restored")
+
+    def has_data(self):
+        """True if any cached response exists (fresh or expired)."""
+        return self._cache is not None and self._timestamp is not None
+
     def get_age(self):
         """Cache age in seconds, or 0 if empty."""
         if self._timestamp is None:
@@ -141,46 +562,292 @@ class TaskCache:
         self._timestamp = None
         self._last_updated = None
         self._search_index = None
+        self._validators = None
         self._delete_from_disk()
 
     def get_last_updated(self):
         """Newest task 'updated' timestamp, for use with updatedAfter param."""
         return self._last_updated
 
+    def reload_if_changed(self) -> bool:
+        """
+        Pick up cache writes made by another process.
+
+        Costs two stat() calls when nothing changed. A grown journal is
+        applied incrementally; a replaced or deleted snapshot triggers a full
+        reload. Returns True if in-memory state changed.
+        """
+        if not self.cache_path or self._read_disk_stamp() == self._disk_stamp:
+            return False
+        try:
+            with self._locked():
+                if self._read_disk_stamp() == self._disk_stamp:
+                    return False
+                self._load_locked()
+            return True
+        except Exception as e:
+            logger.debug("Failed to reload cache from disk: %s", e)
+            return False
+
+    @contextmanager
+    def refresh_lock(self, timeout: float = _REFRESH_LOCK_TIMEOUT):
+        """
+        Machine-wide lock around an API refetch, so only one process fetches.
+
+        Callers should re-check get_tasks() inside the block: when another
+        process held the lock, its result has usually landed by then. Yields
+        False if the lock could not be taken within `timeout` (fetch anyway).
+        """
+        with _flock(self.cache_path + ".refresh.lock", timeout=timeout) as acquired:
+            if not acquired:
+                logger.info("Refresh lock busy for %.0fs; fetching anyway", timeout)
+            yield acquired
+
+    @traced("cache.compact")
+    def compact(self):
+        """
+        Fold the journal into a fresh snapshot.
+
+        Normally runs on a background thread once the journal passes
+        `journal_max_bytes`. Journal lines appended while the snapshot is being
+        written are kept (records are idempotent, so replaying them is safe).
+        """
+        with self._locked():
+            if self._read_disk_stamp() != self._disk_stamp:
+                self._load_locked()
+            if self._cache is None or self._timestamp is None:
+                return
+            cache = dict(self._cache)
+            cache["data"] = dict(self._cache.get("data") or {})
+            payload = {
+                "timestamp": self._timestamp,
+                "cache": cache,
+                "ttl": self._ttl_state(),
+                "validators": self._validators,
+            }
+            offset = self._journal_bytes
+            generation = self._generation
+            snapshot_stamp = self._disk_stamp[0]
+
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+
+            with self._locked():
+                if generation != self._generation or _stat_stamp(self.cache_path) != snapshot_stamp:
+                    os.remove(tmp_path)
+                    return
+                os.replace(tmp_path, self.cache_path)
+                tail = b""
+                if os.path.exists(self._journal_path):
+                    with open(self._journal_path, "rb") as f:
+                        f.seek(offset)
+                        tail = f.read()
+                unseen = offset + len(tail) != self._journal_bytes
+                self._write_journal(tail)
+                self._generation += 1
+                if unseen:
+                    # Another process appended after our last read; re-read everything.
+                    self._disk_stamp = None
+                    self._load_locked()
+                else:
+                    self._disk_stamp = self._read_disk_stamp()
+            logger.info("Cache journal compacted (%d bytes folded, %d kept)", offset, len(tail))
+        except Exception as e:
+            logger.debug("Cache compaction failed: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def get_journal_size(self):
+        """Bytes currently in the on-disk journal."""
+        return self._journal_bytes
+
+    @contextmanager
+    def _locked(self):
+        """In-process lock plus the cross-process writer lock (re-entrant per instance)."""
+        with self._io_lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with _flock(self._lock_path):
+                self._lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+
+    def _read_disk_stamp(self):
+        return (_stat_stamp(self.cache_path), _stat_stamp(self._journal_path))
+
     def _load_from_disk(self):
         if not self.cache_path:
             return
         try:
             if not os.path.exists(self.cache_path):
                 return
+            with self._locked():
+                self._load_locked()
+            tasks = (self._cache or {}).get("data", {}).get("tasks", [])
+            logger.info("Loaded cache from disk: %d tasks (journal: %d bytes)", len(tasks), self._journal_bytes)
+            self._maybe_compact()
+        except Exception as e:
+            logger.debug("Failed to load cache from disk: %s", e)
+
+    @traced("cache.load")
+    def _load_locked(self):
+        # Caller holds self._locked().
+        snapshot_stamp, journal_stamp = self._read_disk_stamp()
+        if snapshot_stamp is None:
+            if self._cache is not None:
+                logger.info("Cache files were removed by another process")
+            self._cache = None
+            self._timestamp = None
+            self._last_updated = None
+            self._search_index = None
+            self._validators = None
+            self._journal_bytes = 0
+            self._disk_stamp = self._read_disk_stamp()
+            return
+
+        incremental = (
+            self._cache is not None
+            and self._disk_stamp is not None
+            and self._disk_stamp[0] == snapshot_stamp
+            and (journal_stamp[2] if journal_stamp else 0) >= self._journal_bytes
+        )
+        if incremental:
+            cached, timestamp, offset = self._cache, self._timestamp, self._journal_bytes
+        else:
             with open(self.cache_path, "r", encoding="utf-8") as f:
                 payload = json.load(f)
             cached = payload.get("cache")
             timestamp = payload.get("timestamp")
             if not isinstance(cached, dict) or not isinstance(timestamp, (int, float)):
                 return
-            self._cache = cached
-            self._timestamp = float(timestamp)
+            timestamp = float(timestamp)
+            offset = 0
+            self._restore_ttl_state(payload.get("ttl"))
+            self._validators = payload.get("validators")
 
-            tasks = cached.get("data", {}).get("tasks", [])
-            updated_times = [t.get("updated") for t in tasks if t.get("updated")]
-            self._last_updated = max(updated_times) if updated_times else None
+        cached, timestamp = self._replay_journal(cached, timestamp, offset)
+        self._cache = cached
+        self._timestamp = timestamp
 
-            # Rebuild search index from loaded cache
-            self._build_search_index(tasks)
+        tasks = cached.get("data", {}).get("tasks", [])
+        updated_times = [t.get("updated") for t in tasks if t.get("updated")]
+        self._last_updated = max(updated_times) if updated_times else None
 
-            logger.info("Loaded cache from disk: %d tasks", len(tasks))
+        # Rebuild search index from loaded cache
+        self._build_search_index(tasks)
+        self._disk_stamp = self._read_disk_stamp()
+
+    def _replay_journal(self, cached, timestamp, offset=0):
+        """Apply journal records after `offset` on top of `cached`; drops a torn trailing line."""
+        if not os.path.exists(self._journal_path):
+            self._journal_bytes = 0
+            return cached, timestamp
+
+        good_bytes = offset
+        torn = False
+        with open(self._journal_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete journal line")
+                    record = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                cached = _apply_journal_record(cached, record)
+                if isinstance(record.get("timestamp"), (int, float)):
+                    timestamp = float(record["timestamp"])
+                if "ttl" in record:
+                    self._restore_ttl_state(record["ttl"])
+                if "validators" in record:
+                    self._validators = record["validators"]
+                elif "upsert" in record or "delete" in record:
+                    self._validators = None  # local mutation
+                good_bytes += len(line)
+
+        self._journal_bytes = good_bytes
+        if torn:
+            # Writers hold the file lock while appending, so this is a crashed write.
+            logger.info("Dropping torn cache journal tail after %d bytes", good_bytes)
+            with open(self._journal_path, "r+b") as f:
+                f.truncate(good_bytes)
+        return cached, timestamp
+
+    @traced("cache.append_journal")
+    def _append_journal(self, record):
+        if not self.cache_path or self._cache is None:
+            return
+        if not os.path.exists(self.cache_path):
+            # No base snapshot to append to (first write, or deleted externally).
+            self._save_to_disk()
+            return
+        try:
+            line = (json.dumps(record) + "\n").encode("utf-8")
+            with self._locked():
+                up_to_date = self._read_disk_stamp() == self._disk_stamp
+                with open(self._journal_path, "ab") as f:
+                    f.write(line)
+                annotate(bytes=len(line))
+                if up_to_date:
+                    self._journal_bytes += len(line)
+                    self._disk_stamp = self._read_disk_stamp()
+                else:
+                    # Another process wrote since our last read: re-read so memory
+                    # matches the file order (their records, then ours).
+                    self._load_locked()
         except Exception as e:
-            logger.debug("Failed to load cache from disk: %s", e)
+            logger.debug("Failed to append cache journal: %s", e)
+            return
+        self._maybe_compact()
 
+    def _maybe_compact(self):
+        if self._journal_bytes < self.journal_max_bytes:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(target=self.compact, name="morgen-cache-compact", daemon=True)
+        self._compaction_thread.start()
+
+    def _write_journal(self, content: bytes):
+        # Caller holds self._locked().
+        tmp_path = self._journal_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, self._journal_path)
+        self._journal_bytes = len(content)
+
+    @traced("cache.save")
     def _save_to_disk(self):
         if not self.cache_path or self._cache is None or self._timestamp is None:
             return
         try:
             os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
-            payload = {"timestamp": self._timestamp, "cache": self._cache}
-            with open(self.cache_path, "w", encoding="utf-8") as f:
-                json.dump(payload, f)
+            payload = {
+                "timestamp": self._timestamp,
+                "cache": self._cache,
+                "ttl": self._ttl_state(),
+                "validators": self._validators,
+            }
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with self._locked():
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.cache_path)
+                self._write_journal(b"")
+                self._generation += 1
+                self._disk_stamp = self._read_disk_stamp()
         except Exception as e:
             logger.debug("Failed to save cache to disk: %s", e)
 
@@ -188,7 +855,12 @@ class TaskCache:
         if not self.cache_path:
             return
         try:
-            if os.path.exists(self.cache_path):
-                os.remove(self.cache_path)
+            with self._locked():
+                self._generation += 1
+                self._journal_bytes = 0
+                for path in (self.cache_path, self._journal_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._disk_stamp = self._read_disk_stamp()
         except Exception as e:
             logger.debug("Failed to delete cache file: %s", e)
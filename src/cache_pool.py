@@ -0,0 +1,209 @@
+"""
+Cache Pool
+
+Per-account TaskCache partitions.
+
+Each API key gets its own directory under ~/.cache/ulauncher-morgen-tasks/accounts/,
+named by a hash of the key (the key itself is never written to disk). Recently
+used partitions stay loaded in an in-memory LRU, so switching between accounts
+reuses warm data instead of refetching, and the partitions on disk are capped
+in total size by evicting the least recently used ones.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
+
+try:
+    from src.cache import TaskCache, _ACCOUNTS_DIR, _DEFAULT_CACHE_DIR, _flock, account_cache_dir, account_partition_id
+    from src.sqlite_cache import SQLiteTaskCache
+except Exception:  # pragma: no cover - test/import environment differences
+    from cache import TaskCache, _ACCOUNTS_DIR, _DEFAULT_CACHE_DIR, _flock, account_cache_dir, account_partition_id
+    from sqlite_cache import SQLiteTaskCache
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_IN_MEMORY = 4
+_DEFAULT_MAX_DISK_BYTES = 50 * 1024 * 1024
+
+# Pre-partitioning versions stored every account's tasks in these shared files:
+# (data files, lock files a running old version may hold). The lock files are
+# left in place: unlinking one that is held would let the next opener lock a
+# new inode alongside the holder.
+_LEGACY_CACHES = (
+    (("tasks_cache.json", "tasks_cache.json.journal"), ("tasks_cache.json.lock", "tasks_cache.json.refresh.lock")),
+    (("tasks_cache.sqlite3", "tasks_cache.sqlite3-wal", "tasks_cache.sqlite3-shm"), ("tasks_cache.sqlite3.refresh.lock",)),
+)
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _has_unsynced_changes(path: str) -> bool:
+    # A non-empty outbox holds creates/closes not yet sent to Morgen.
+    try:
+        return os.path.getsize(os.path.join(path, "outbox.jsonl")) > 0
+    except OSError:
+        return False
+
+
+class CachePool:
+    """LRU of per-account TaskCache partitions with a disk-size cap."""
+
+    def __init__(
+        self,
+        base_dir: str | None = None,
+        max_in_memory: int = _DEFAULT_MAX_IN_MEMORY,
+        max_disk_bytes: int = _DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Args:
+            base_dir: Cache root (default: ~/.cache/ulauncher-morgen-tasks).
+            max_in_memory: Partitions kept loaded at once.
+            max_disk_bytes: Total size allowed for all partitions on disk.
+        """
+        self.base_dir = base_dir or _DEFAULT_CACHE_DIR
+        self.max_in_memory = max(1, max_in_memory)
+        self.max_disk_bytes = max_disk_bytes
+        self._caches: OrderedDict[tuple[str, str], TaskCache] = OrderedDict()
+        self._lock = threading.Lock()
+        self._retire_legacy_caches()
+
+    def get(self, api_key: str, *, ttl=600, ttl_bounds=None, backend: str = "json") -> TaskCache:
+        """
+        Return the cache partition for `api_key`, loading it if needed.
+
+        Args:
+            api_key: Morgen API key (only its hash is used).
+            ttl: Cache TTL in seconds; applied to already-loaded partitions too.
+            ttl_bounds: (min, max) to let the TTL adapt (see TaskCache.set_ttl_policy).
+            backend: "json" (TaskCache) or "sqlite" (SQLiteTaskCache).
+        """
+        if not api_key or not api_key.strip():
+            raise ValueError("API key cannot be empty")
+
+        backend = "sqlite" if (backend or "").strip().lower() == "sqlite" else "json"
+        partition = account_partition_id(api_key)
+        key = (partition, backend)
+
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is not None:
+                cache.set_ttl_policy(ttl, ttl_bounds)
+                if next(reversed(self._caches)) != key:
+                    self._caches.move_to_end(key)
+                    self._touch(partition)
+                return cache
+
+            cache = self._open(partition, backend, ttl, ttl_bounds)
+            self._caches[key] = cache
+            while len(self._caches) > self.max_in_memory:
+                (old_partition, old_backend), _old = self._caches.popitem(last=False)
+                logger.debug("Cache partition %s (%s) evicted from memory", old_partition, old_backend)
+            self._touch(partition)
+
+        self.enforce_disk_limit()
+        return cache
+
+    def partition_dir(self, api_key: str) -> str:
+        return account_cache_dir(api_key, self.base_dir)
+
+    def enforce_disk_limit(self):
+        """Delete least recently used partitions (not loaded in memory) until under max_disk_bytes."""
+        accounts_dir = os.path.join(self.base_dir, _ACCOUNTS_DIR)
+        try:
+            names = os.listdir(accounts_dir)
+        except OSError:
+            return
+
+        with self._lock:
+            in_use = {partition for partition, _backend in self._caches}
+
+        entries = []
+        total = 0
+        for name in names:
+            path = os.path.join(accounts_dir, name)
+            if not os.path.isdir(path):
+                continue
+            size = _dir_size(path)
+            total += size
+            try:
+                last_used = os.stat(path).st_mtime
+            except OSError:
+                last_used = 0.0
+            entries.append((last_used, name, path, size))
+
+        for _last_used, name, path, size in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            if name in in_use or _has_unsynced_changes(path):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            logger.info("Evicted cache partition %s from disk (%d bytes)", name, size)
+
+    def _open(self, partition: str, backend: str, ttl, ttl_bounds) -> TaskCache:
+        directory = os.path.join(self.base_dir, _ACCOUNTS_DIR, partition)
+        os.makedirs(directory, exist_ok=True)
+        if backend == "sqlite":
+            cache = SQLiteTaskCache(
+                ttl=ttl, db_path=os.path.join(directory, "tasks_cache.sqlite3"), ttl_bounds=ttl_bounds
+            )
+        else:
+            cache = TaskCache(ttl=ttl, cache_path=os.path.join(directory, "tasks_cache.json"), ttl_bounds=ttl_bounds)
+        logger.info("Opened cache partition %s (%s)", partition, backend)
+        return cache
+
+    def _touch(self, partition: str):
+        # Directory mtime doubles as the partition's last-used time for disk eviction.
+        try:
+            os.utime(os.path.join(self.base_dir, _ACCOUNTS_DIR, partition))
+        except OSError:
+            pass
+
+    def _retire_legacy_caches(self):
+        """
+        Delete the shared pre-partitioning cache, once, when nothing uses it.
+
+        Its tasks cannot be attributed to an account (the key was never
+        stored), so it is not adopted into a partition. A cache still in use by
+        a running older version (any of its locks held, or a SQLite database
+        with its -wal/-shm files present, i.e. open somewhere) is left alone
+        and retried on the next start.
+        """
+        for data_files, lock_files in _LEGACY_CACHES:
+            paths = [os.path.join(self.base_dir, name) for name in data_files]
+            if not any(os.path.isfile(path) for path in paths):
+                continue
+            if any(os.path.exists(path) for path in paths[1:] if path.endswith(("-wal", "-shm"))):
+                logger.info("Keeping shared cache %s: the database is open", paths[0])
+                continue
+            self._remove_unless_locked(paths, [os.path.join(self.base_dir, name) for name in lock_files])
+
+    def _remove_unless_locked(self, paths, lock_paths):
+        lock_paths = [path for path in lock_paths if os.path.isfile(path)]
+        with ExitStack() as stack:
+            for lock_path in lock_paths:
+                if not stack.enter_context(_flock(lock_path, blocking=False)):
+                    logger.info("Keeping shared cache %s: in use by another process", paths[0])
+                    return
+            for path in paths:
+                try:
+                    if os.path.isfile(path):
+                        os.remove(path)
+                        logger.info("Removed shared pre-partitioning cache file: %s", path)
+                except OSError as e:
+                    logger.debug("Failed to remove legacy cache file %s: %s", path, e)
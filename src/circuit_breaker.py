@@ -0,0 +1,117 @@
+"""
+Circuit Breaker
+
+Remembers that the Morgen API is unreachable so callers fail fast.
+
+After `failure_threshold` consecutive network errors / 5xx responses the
+circuit opens: calls are refused immediately (the UI falls back to cached
+data) until `cooldown` passes. The next call is then let through as a single
+half-open probe; success closes the circuit, failure re-opens it with a
+doubled cooldown (up to `max_cooldown`).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_DEFAULT_FAILURE_THRESHOLD = 3
+_DEFAULT_COOLDOWN = 30.0
+_DEFAULT_MAX_COOLDOWN = 300.0
+
+
+class CircuitOpen(Exception):
+    """The circuit is open; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"circuit open, retrying in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(
+        self,
+        failure_threshold: int = _DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = _DEFAULT_COOLDOWN,
+        max_cooldown: float = _DEFAULT_MAX_COOLDOWN,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._cooldown = cooldown
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self._cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def acquire(self) -> bool:
+        """
+        Ask to make a call. Returns True if this call is the half-open probe,
+        False for a normal call; raises CircuitOpen if the call must fail fast.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            now = self._clock()
+            if self._state == OPEN:
+                remaining = self._cooldown - (now - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpen(remaining)
+                self._state = HALF_OPEN
+            if self._probe_in_flight:
+                raise CircuitOpen(min(self._cooldown, 5.0))
+            self._probe_in_flight = True
+            logger.info("Circuit half-open: probing Morgen API")
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit closed: Morgen API reachable again")
+            self._state = CLOSED
+            self._failures = 0
+            self._cooldown = self.base_cooldown
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open_locked()
+            elif self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open_locked()
+            self._probe_in_flight = False
+
+    def release(self):
+        """The acquired call ended without reaching the network (e.g. refused locally)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open_locked(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        logger.warning(
+            "Circuit open after %d consecutive failures; failing fast for %.0fs",
+            self._failures,
+            self._cooldown,
+        )
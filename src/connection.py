@@ -0,0 +1,224 @@
+"""
+Connection Pool
+
+Keep-alive HTTP(S) connections to the Morgen API, with pre-warming.
+
+`prewarm()` resolves the host and completes the TCP + TLS handshakes ahead
+of time, so the first real request after Ulauncher starts (or after the
+cache runs out) costs a single round-trip. Warm connections are parked and
+handed to the next request; ones idle longer than `idle_timeout` are dropped
+rather than risking a server-side close mid-request.
+
+Used by MorgenAPIClient when it is given a pool; without one the client
+keeps using urllib.request.urlopen (one connection per request).
+"""
+
+from __future__ import annotations
+
+import http.client
+import logging
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_IDLE = 4
+_DEFAULT_IDLE_TIMEOUT = 30.0    # well below typical server keep-alive timeouts
+_DEFAULT_CONNECT_TIMEOUT = 2.0
+
+# Errors meaning a reused connection was closed by the server while idle.
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class PooledResponse:
+    """http.client response that returns its connection to the pool once fully read."""
+
+    def __init__(self, pool, conn, resp):
+        self._pool = pool
+        self._conn = conn
+        self._resp = resp
+        self._released = False
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def read(self, size=-1):
+        data = self._resp.read(None if size is None or size < 0 else size)
+        if not data or self._resp.isclosed():
+            self._release()
+        return data
+
+    def close(self):
+        if self._released:
+            return
+        if self._resp.length == 0 and not self._resp.will_close:
+            self._resp.read()  # empty body (204/304): the connection is reusable
+            self._release()
+        else:
+            self._released = True
+            self._conn.close()  # unread body: not reusable
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            self._pool._put(self._conn, reusable=not self._resp.will_close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """Keep-alive connections to one host, shared by the API clients."""
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        max_idle: int = _DEFAULT_MAX_IDLE,
+        idle_timeout: float = _DEFAULT_IDLE_TIMEOUT,
+        connect_timeout: float = _DEFAULT_CONNECT_TIMEOUT,
+        clock=time.monotonic,
+    ):
+        self.scheme, self.host, self.port = self._origin(urllib.parse.urlsplit(base_url))
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self._ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        self._prewarm_thread = None
+        self.connections_opened = 0
+        self.reused = 0
+
+    @staticmethod
+    def _origin(parsed) -> tuple[str, str | None, int]:
+        return parsed.scheme, parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    # --- Pre-warming ---
+
+    def prewarm(self) -> bool:
+        """Open one connection (DNS + TCP + TLS) and park it; False when offline (logged quietly)."""
+        if self.idle_count():
+            return True
+        start = self._clock()
+        try:
+            conn = self._connect()
+        except OSError as e:
+            logger.debug("Pre-warm of %s failed: %s", self.host, e)
+            return False
+        self._put(conn, reusable=True)
+        logger.info("Pre-warmed connection to %s in %.0fms", self.host, (self._clock() - start) * 1000)
+        return True
+
+    def prewarm_async(self):
+        """`prewarm()` on a daemon thread, unless one is running or a warm connection is parked."""
+        with self._lock:
+            if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+                return
+            if self._fresh_idle_locked():
+                return
+            self._prewarm_thread = threading.Thread(target=self.prewarm, name="morgen-prewarm", daemon=True)
+            self._prewarm_thread.start()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return self._fresh_idle_locked()
+
+    # --- Requests ---
+
+    def request(self, method: str, url: str, body=None, headers=None, timeout: float | None = None) -> PooledResponse:
+        """
+        Send one request on a parked or new connection and return the response.
+
+        Connection failures raise urllib.error.URLError (nothing was sent);
+        a parked connection the server had closed is replaced transparently.
+        Raises ValueError when `url` is not on this pool's scheme, host and port.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        if self._origin(parsed) != (self.scheme, self.host, self.port):
+            raise ValueError(f"{url} is not served by the connection pool for {self.scheme}://{self.host}:{self.port}")
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        conn, reused = self._get()
+        while True:
+            try:
+                if timeout is not None and conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.timeout = timeout
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                return PooledResponse(self, conn, resp)
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                logger.debug("Parked connection was closed by the server; reconnecting")
+                conn, reused = self._get(fresh=True)
+            except BaseException:
+                conn.close()
+                raise
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+    # --- Internals ---
+
+    def _connect(self):
+        if self._ssl_context is not None:
+            conn = http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.connect_timeout, context=self._ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _get(self, fresh: bool = False):
+        if not fresh:
+            with self._lock:
+                self._drop_expired_locked()
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    self.reused += 1
+                    return conn, True
+        try:
+            return self._connect(), False
+        except OSError as e:
+            raise urllib.error.URLError(e)
+
+    def _put(self, conn, reusable: bool):
+        if not reusable or conn.sock is None:
+            conn.close()
+            return
+        with self._lock:
+            self._drop_expired_locked()
+            if len(self._idle) < self.max_idle:
+                self._idle.append((conn, self._clock()))
+                return
+        conn.close()
+
+    def _fresh_idle_locked(self) -> int:
+        self._drop_expired_locked()
+        return len(self._idle)
+
+    def _drop_expired_locked(self):
+        now = self._clock()
+        keep = []
+        for conn, parked_at in self._idle:
+            if now - parked_at < self.idle_timeout:
+                keep.append((conn, parked_at))
+            else:
+                conn.close()
+        self._idle = keep
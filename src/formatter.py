@@ -56,6 +56,9 @@ class TaskFormatter:
 
         priority = task.get("priority", 0)
         priority_display = get_priority_label(priority)
+        if task.get("pendingSync"):
+            # Created locally; still queued in the outbox.
+            priority_display += " | Not synced yet"
 
         description = (task.get("description") or "").strip()
         if description:
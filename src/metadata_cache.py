@@ -0,0 +1,111 @@
+"""
+Container Metadata Cache
+
+Names of task lists, projects and spaces, fetched from their own endpoints
+and kept much longer than tasks (they rarely change). Stored per account in
+`containers.json` next to the task cache.
+
+Each kind is cached and refreshed independently; a stale entry is still
+served (names are better than ids) while a refresh runs in the background.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    from src.task_lists import build_container_name_maps
+except Exception:  # pragma: no cover - test/import environment differences
+    from task_lists import build_container_name_maps
+
+logger = logging.getLogger(__name__)
+
+CONTAINER_KINDS = ("list", "project", "space")
+_DEFAULT_TTL = 24 * 60 * 60
+_PAYLOAD_KEYS = {"list": "lists", "project": "projects", "space": "spaces"}
+
+
+class ContainerMetadataCache:
+    """Long-TTL {kind: {id: name}} maps for one account."""
+
+    def __init__(self, path: str | None = None, ttl: float = _DEFAULT_TTL, clock=time.time):
+        """
+        Args:
+            path: JSON file (e.g. <partition>/containers.json); None keeps it in memory.
+            ttl: Seconds before a kind is refetched (default 24h).
+        """
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}  # kind -> {"timestamp": float, "names": {id: name}}
+        self._load()
+
+    def get_name_maps(self) -> dict[str, dict[str, str]]:
+        """{"list": {...}, "project": {...}, "space": {...}}, stale entries included."""
+        with self._lock:
+            return {kind: dict((self._entries.get(kind) or {}).get("names") or {}) for kind in CONTAINER_KINDS}
+
+    def stale_kinds(self) -> list[str]:
+        """Kinds never fetched or older than the TTL."""
+        now = self._clock()
+        with self._lock:
+            return [
+                kind for kind in CONTAINER_KINDS
+                if kind not in self._entries or now - self._entries[kind]["timestamp"] >= self.ttl
+            ]
+
+    def has_data(self) -> bool:
+        with self._lock:
+            return bool(self._entries)
+
+    def set_containers(self, kind: str, items):
+        """Store the [{id, name}, ...] items fetched for `kind` (an empty list is cached too)."""
+        if kind not in _PAYLOAD_KEYS:
+            raise ValueError(f"Unknown container kind: {kind}")
+        names = build_container_name_maps({"data": {_PAYLOAD_KEYS[kind]: list(items or [])}})[kind]
+        with self._lock:
+            self._entries[kind] = {"timestamp": self._clock(), "names": names}
+            self._save_locked()
+        logger.info("Container metadata cached: %d %ss", len(names), kind)
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug("Cannot read container metadata %s: %s", self.path, e)
+            return
+        for kind in CONTAINER_KINDS:
+            entry = payload.get(kind) if isinstance(payload, dict) else None
+            if isinstance(entry, dict) and isinstance(entry.get("timestamp"), (int, float)):
+                self._entries[kind] = {"timestamp": float(entry["timestamp"]), "names": dict(entry.get("names") or {})}
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug("Failed to save container metadata: %s", e)
+
+
+def merge_name_maps(*maps) -> dict[str, dict[str, str]]:
+    """Combine name maps; later maps win for the same id."""
+    merged: dict[str, dict[str, str]] = {kind: {} for kind in CONTAINER_KINDS}
+    for name_maps in maps:
+        for kind, names in (name_maps or {}).items():
+            merged.setdefault(kind, {}).update(names or {})
+    return merged
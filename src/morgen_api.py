@@ -5,13 +5,41 @@ Handles all communication with the Morgen API v3.
 Uses urllib.request (stdlib) to avoid external dependencies.
 """
 
+import hashlib
 import json
 import logging
-import urllib.request
+import socket
+import threading
 import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+
+try:
+    from src.circuit_breaker import OPEN, CircuitBreaker, CircuitOpen
+    from src.rate_budget import BACKGROUND, INTERACTIVE, BudgetExhausted, RateBudget
+    from src.retry import RetryPolicy
+    from src.singleflight import SingleFlight
+    from src.tracing import annotate, span
+except Exception:  # pragma: no cover - test/import environment differences
+    from circuit_breaker import OPEN, CircuitBreaker, CircuitOpen
+    from rate_budget import BACKGROUND, INTERACTIVE, BudgetExhausted, RateBudget
+    from retry import RetryPolicy
+    from singleflight import SingleFlight
+    from tracing import annotate, span
 
 logger = logging.getLogger(__name__)
 
+_RETRYABLE_STATUS = {500, 502, 503, 504}
+
+# Container metadata (names for TaskListRef resolution), one endpoint per kind.
+CONTAINER_ENDPOINTS = {
+    "list": "/taskLists/list",
+    "project": "/projects/list",
+    "space": "/spaces/list",
+}
+_READ_CHUNK = 64 * 1024
+
 
 # --- Exceptions ---
 
@@ -31,8 +59,11 @@ class MorgenAuthError(MorgenAPIError):
 
 
 class MorgenRateLimitError(MorgenAPIError):
-    """Rate limit exceeded (429)."""
-    pass
+    """Rate limit exceeded (429), or the call was refused by the local point budget."""
+
+    def __init__(self, message, status_code=None, response_body=None, retry_after=None):
+        super().__init__(message, status_code=status_code, response_body=response_body)
+        self.retry_after = retry_after
 
 
 class MorgenValidationError(MorgenAPIError):
@@ -41,8 +72,194 @@ class MorgenValidationError(MorgenAPIError):
 
 
 class MorgenNetworkError(MorgenAPIError):
-    """Network connectivity issues (timeout, DNS, connection refused)."""
-    pass
+    """
+    Network connectivity issues (timeout, DNS, connection refused).
+
+    `request_sent` is False only when the request certainly never left this
+    machine (DNS failure, refused connection, failed probe, open circuit), which
+    makes even non-idempotent calls safe to retry.
+    """
+
+    def __init__(self, message, status_code=None, response_body=None, request_sent=True):
+        super().__init__(message, status_code=status_code, response_body=response_body)
+        self.request_sent = request_sent
+
+
+def http_error(status_code, error_body=None, reason=None, headers=None, rate_budget=None):
+    """
+    Map an HTTP error status to the matching MorgenAPIError subclass.
+
+    For 429 the wait is recorded in `rate_budget` (if given) and exposed as
+    `retry_after`. Shared by the blocking and the asyncio client.
+    """
+    if status_code == 401:
+        return MorgenAuthError(
+            "Invalid API key. Check your Morgen API key in preferences.",
+            status_code=401,
+            response_body=error_body,
+        )
+    elif status_code == 429:
+        retry_after = rate_budget.record_rate_limited(headers) if rate_budget is not None else None
+        return MorgenRateLimitError(
+            "Rate limit exceeded. Try again later.",
+            status_code=429,
+            response_body=error_body,
+            retry_after=retry_after,
+        )
+    elif status_code == 400:
+        return MorgenValidationError(
+            f"Bad request: {error_body or 'invalid parameters'}",
+            status_code=400,
+            response_body=error_body,
+        )
+    else:
+        return MorgenAPIError(
+            f"API error ({status_code}): {error_body or reason}",
+            status_code=status_code,
+            response_body=error_body,
+        )
+
+
+def is_retryable(error, idempotent=True):
+    """Whether a failed attempt may be repeated (network errors, 5xx for idempotent calls)."""
+    if isinstance(error, MorgenNetworkError):
+        return idempotent or not error.request_sent
+    if isinstance(error, (MorgenAuthError, MorgenRateLimitError, MorgenValidationError)):
+        return False
+    if isinstance(error, MorgenAPIError):
+        return idempotent and error.status_code in _RETRYABLE_STATUS
+    return False
+
+
+# --- Response bodies ---
+
+class BodyDecoder:
+    """
+    Incrementally undo a response's Content-Encoding (gzip / deflate / identity).
+
+    Feed wire chunks as they arrive; `finish()` returns the decoded bytes, which
+    `json.loads` accepts directly (no intermediate str copy).
+    """
+
+    def __init__(self, content_encoding=None):
+        encoding = (content_encoding or "identity").strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._inflater = zlib.decompressobj()
+        else:
+            self._inflater = None
+        self._parts = []
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def feed(self, chunk: bytes):
+        self.wire_bytes += len(chunk)
+        if self._inflater is not None:
+            try:
+                chunk = self._inflater.decompress(chunk)
+            except zlib.error as e:
+                raise MorgenAPIError(f"Invalid compressed response from API: {e}")
+        if chunk:
+            self._parts.append(chunk)
+            self.decoded_bytes += len(chunk)
+
+    def finish(self) -> bytes:
+        if self._inflater is not None:
+            tail = self._inflater.flush()
+            if tail:
+                self._parts.append(tail)
+                self.decoded_bytes += len(tail)
+        return b"".join(self._parts)
+
+
+class APIResponse(dict):
+    """
+    A parsed JSON object response plus its validators.
+
+    `not_modified` is True (and the dict empty) when the server answered 304,
+    or when the body hashed to the `content_hash` the caller already holds.
+    """
+
+    def __init__(self, data=(), *, not_modified=False, etag=None, last_modified=None, content_hash=None):
+        super().__init__(data)
+        self.not_modified = not_modified
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+
+    @property
+    def validators(self) -> dict:
+        """{"etag", "last_modified", "content_hash"} (known ones only), for TaskCache."""
+        values = {"etag": self.etag, "last_modified": self.last_modified, "content_hash": self.content_hash}
+        return {k: v for k, v in values.items() if v}
+
+
+def _content_hash(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _get_header(headers, name):
+    try:
+        return headers.get(name) if headers is not None else None
+    except Exception:
+        return None
+
+
+class TransferStats:
+    """Running totals of response bytes on the wire vs after decompression."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def record(self, decoder: BodyDecoder):
+        with self._lock:
+            self.responses += 1
+            self.wire_bytes += decoder.wire_bytes
+            self.decoded_bytes += decoder.decoded_bytes
+        if decoder.wire_bytes != decoder.decoded_bytes:
+            logger.debug("Response body: %d bytes on the wire, %d decoded", decoder.wire_bytes, decoder.decoded_bytes)
+
+    def as_dict(self):
+        with self._lock:
+            return {"responses": self.responses, "wire_bytes": self.wire_bytes, "decoded_bytes": self.decoded_bytes}
+
+
+# --- Request bodies ---
+
+def build_create_task_body(title, description=None, due=None, time_zone=None, priority=0):
+    """
+    Validate create-task arguments and build the /tasks/create JSON body.
+
+    Raises ValueError on invalid input (see MorgenAPIClient.create_task).
+    """
+    if not title or not title.strip():
+        raise ValueError("Task title is required")
+
+    if not 0 <= priority <= 9:
+        raise ValueError("Priority must be between 0 and 9")
+
+    if due:
+        if len(due) != 19:
+            raise ValueError(
+                f"Due date must be exactly 19 characters (YYYY-MM-DDTHH:mm:ss), got {len(due)}: {due}"
+            )
+        if due[4] != "-" or due[7] != "-" or due[10] != "T" or due[13] != ":" or due[16] != ":":
+            raise ValueError(f"Invalid due date format, expected YYYY-MM-DDTHH:mm:ss: {due}")
+
+    body = {"title": title.strip(), "priority": priority}
+
+    if description:
+        body["description"] = description
+    if due:
+        body["due"] = due
+        if time_zone:
+            body["timeZone"] = time_zone
+
+    return body
 
 
 # --- Client ---
@@ -52,107 +269,299 @@ class MorgenAPIClient:
 
     BASE_URL = "https://api.morgen.so/v3"
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, rate_budget=None, circuit=None, connections=None, base_url=None):
+        """
+        Args:
+            api_key: Morgen API key.
+            rate_budget: Shared RateBudget (default: a fresh in-memory one).
+            circuit: Shared CircuitBreaker (default: a fresh one).
+            connections: Optional connection.ConnectionPool for keep-alive /
+                pre-warmed connections; without it every request uses urlopen.
+            base_url: API root to use instead of BASE_URL (e.g. a local stand-in server).
+        """
         if not api_key or not api_key.strip():
             raise ValueError("API key cannot be empty")
         self.api_key = api_key.strip()
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.connections = connections
         self.timeout = 10  # seconds
+        self.connect_timeout = 2  # seconds, for the half-open probe
+        self.rate_budget = rate_budget or RateBudget()
+        self.circuit = circuit or CircuitBreaker()
+        # Someone is waiting on interactive calls; background ones can take their time.
+        self.retry_policies = {
+            INTERACTIVE: RetryPolicy(max_attempts=3, deadline=8.0),
+            BACKGROUND: RetryPolicy(max_attempts=5, max_delay=8.0, deadline=45.0),
+        }
+        # Concurrent identical reads (keystroke, list view, background refresh)
+        # share one HTTP request.
+        self._flights = SingleFlight()
+        self.transfer = TransferStats()
 
-    def _make_request(self, endpoint, method="GET", data=None):
+    def _call(self, endpoint, method="GET", data=None, priority=INTERACTIVE, idempotent=True, validators=None):
         """
-        Make an HTTP request to the Morgen API.
+        `_make_request` under the retry policy for `priority`.
 
-        Returns the parsed JSON response dict.
-        Raises MorgenAPIError subclasses on failure.
+        Idempotent calls are retried on network errors and 5xx responses;
+        non-idempotent ones only when the request was never sent. Each attempt's
+        timeout is capped by the time left before the policy's deadline.
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        policy = self.retry_policies.get(priority, self.retry_policies[INTERACTIVE])
 
-        headers = {
-            "Authorization": f"ApiKey {self.api_key}",
-            "Accept": "application/json",
-        }
+        def attempt(time_left):
+            timeout = max(1.0, min(self.timeout, time_left))
+            with span("api.request"):
+                return self._make_request(
+                    endpoint, method=method, data=data, priority=priority, timeout=timeout, validators=validators
+                )
+
+        def should_retry(e):
+            return self.circuit.state != OPEN and is_retryable(e, idempotent)
 
-        body = None
-        if data is not None:
-            headers["Content-Type"] = "application/json"
-            body = json.dumps(data).encode("utf-8")
+        with span("api.call", method=method, endpoint=endpoint.split("?", 1)[0], priority=priority):
+            return policy.call(attempt, should_retry)
 
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+    def _make_request(self, endpoint, method="GET", data=None, priority=INTERACTIVE, timeout=None, validators=None):
+        """
+        Make a single HTTP request to the Morgen API (no retries; see `_call`).
+
+        With `validators` (from a previous APIResponse) the request is
+        conditional: a 304, or a body identical to the one they describe,
+        returns an empty APIResponse with `not_modified` set and is not parsed.
+
+        `priority` is "interactive" or "background"; background calls are refused
+        (MorgenRateLimitError with retry_after) before they eat into the points
+        reserved for interactive use. While the circuit breaker is open (the API
+        was unreachable), calls fail immediately with MorgenNetworkError.
+
+        Returns the parsed JSON response (an APIResponse for JSON objects).
+        Raises MorgenAPIError subclasses on failure.
+        """
+        try:
+            probe = self.circuit.acquire()
+        except CircuitOpen as e:
+            raise MorgenNetworkError(
+                f"Cannot reach Morgen API (offline, retrying in {e.retry_after:.0f}s)",
+                request_sent=False,
+            )
 
+        # Exactly one of record_success/record_failure/release per acquire.
+        outcome = None
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                raw = resp.read()
-                if not raw:
-                    # Some endpoints return 204 No Content (empty body).
-                    return {}
-                return json.loads(raw.decode("utf-8"))
-
-        except urllib.error.HTTPError as e:
-            error_body = None
             try:
-                error_body = e.read().decode("utf-8")
-            except Exception:
-                pass
-
-            if e.code == 401:
-                raise MorgenAuthError(
-                    "Invalid API key. Check your Morgen API key in preferences.",
-                    status_code=401,
-                    response_body=error_body,
-                )
-            elif e.code == 429:
+                self.rate_budget.acquire(endpoint, priority)
+            except BudgetExhausted as e:
                 raise MorgenRateLimitError(
-                    "Rate limit exceeded. Try again later.",
-                    status_code=429,
-                    response_body=error_body,
-                )
-            elif e.code == 400:
-                raise MorgenValidationError(
-                    f"Bad request: {error_body or 'invalid parameters'}",
-                    status_code=400,
-                    response_body=error_body,
-                )
-            else:
-                raise MorgenAPIError(
-                    f"API error ({e.code}): {error_body or e.reason}",
-                    status_code=e.code,
-                    response_body=error_body,
+                    f"Rate limit budget exhausted: {e}. Try again in {e.retry_after:.0f}s.",
+                    retry_after=e.retry_after,
                 )
 
-        except urllib.error.URLError as e:
-            raise MorgenNetworkError(
-                f"Cannot reach Morgen API: {e.reason}",
-            )
+            if probe:
+                outcome = "failure"
+                self._probe_connection()
+                outcome = None
+
+            url = f"{self.BASE_URL}{endpoint}"
+
+            headers = {
+                "Authorization": f"ApiKey {self.api_key}",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip",
+            }
+            if validators:
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
+
+            body = None
+            if data is not None:
+                headers["Content-Type"] = "application/json"
+                body = json.dumps(data).encode("utf-8")
+
+            try:
+                with self._open(url, method, body, headers, timeout or self.timeout) as resp:
+                    response_headers = getattr(resp, "headers", None)
+                    self.rate_budget.record_response(response_headers)
+                    raw = self._read_body(resp, response_headers)
+                    outcome = "success"
+                    if not raw:
+                        # Some endpoints return 204 No Content (empty body).
+                        return {}
+                    meta = {
+                        "etag": _get_header(response_headers, "ETag"),
+                        "last_modified": _get_header(response_headers, "Last-Modified"),
+                        "content_hash": _content_hash(raw),
+                    }
+                    if validators and validators.get("content_hash") == meta["content_hash"]:
+                        logger.debug("Response body unchanged (%s)", endpoint)
+                        annotate(not_modified=True)
+                        return APIResponse(not_modified=True, **meta)
+                    with span("api.parse"):
+                        parsed = json.loads(raw)
+                    return APIResponse(parsed, **meta) if isinstance(parsed, dict) else parsed
+
+            except urllib.error.HTTPError as e:
+                try:
+                    annotate(status=e.code)
+                    if e.code == 304:
+                        outcome = "success"
+                        annotate(not_modified=True)
+                        self.rate_budget.record_response(e.headers)
+                        return APIResponse(
+                            not_modified=True,
+                            etag=_get_header(e.headers, "ETag") or (validators or {}).get("etag"),
+                            last_modified=_get_header(e.headers, "Last-Modified") or (validators or {}).get("last_modified"),
+                        )
+                    outcome = "failure" if e.code >= 500 else "success"
+                    self._raise_for_http_error(e)
+                finally:
+                    e.close()  # hands a pooled connection back
+
+            except urllib.error.URLError as e:
+                outcome = "failure"
+                raise MorgenNetworkError(
+                    f"Cannot reach Morgen API: {e.reason}",
+                    request_sent=not isinstance(e.reason, (socket.gaierror, ConnectionRefusedError)),
+                )
 
-        except json.JSONDecodeError as e:
-            raise MorgenAPIError(f"Invalid JSON response from API: {e}")
+            except OSError as e:
+                # Read timeouts / resets surface as raw socket errors.
+                outcome = "failure"
+                raise MorgenNetworkError(f"Cannot reach Morgen API: {e}")
+
+            except json.JSONDecodeError as e:
+                raise MorgenAPIError(f"Invalid JSON response from API: {e}")
+        finally:
+            if outcome == "success":
+                self.circuit.record_success()
+            elif outcome == "failure":
+                self.circuit.record_failure()
+            else:
+                self.circuit.release()
+
+    def _open(self, url, method, body, headers, timeout):
+        """Send the request; responses >= 300 raise urllib.error.HTTPError on both transports."""
+        if self.connections is None:
+            req = urllib.request.Request(url, data=body, headers=headers, method=method)
+            return urllib.request.urlopen(req, timeout=timeout)
+        resp = self.connections.request(method, url, body=body, headers=headers, timeout=timeout)
+        if resp.status >= 300:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, resp)
+        return resp
+
+    def _read_body(self, resp, headers) -> bytes:
+        """Read the body in chunks, decompressing as it arrives."""
+        decoder = BodyDecoder(headers.get("Content-Encoding") if headers is not None else None)
+        while True:
+            chunk = resp.read(_READ_CHUNK)
+            if not chunk:
+                break
+            decoder.feed(chunk)
+        raw = decoder.finish()
+        self.transfer.record(decoder)
+        annotate(wire_bytes=decoder.wire_bytes, bytes=decoder.decoded_bytes)
+        return raw
+
+    def _raise_for_http_error(self, e):
+        error_body = None
+        try:
+            decoder = BodyDecoder(e.headers.get("Content-Encoding") if e.headers is not None else None)
+            decoder.feed(e.read())
+            error_body = decoder.finish().decode("utf-8")
+        except Exception:
+            pass
+
+        raise http_error(e.code, error_body, reason=e.reason, headers=e.headers, rate_budget=self.rate_budget)
+
+    def _probe_connection(self):
+        """Half-open probe: a plain TCP connect with a short timeout before the real request."""
+        parsed = urllib.parse.urlsplit(self.BASE_URL)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        try:
+            socket.create_connection((parsed.hostname, port), timeout=self.connect_timeout).close()
+        except OSError as e:
+            raise MorgenNetworkError(f"Cannot reach Morgen API: {e}", request_sent=False)
 
-    def list_tasks(self, limit=100, updated_after=None):
+    def list_tasks(self, limit=100, updated_after=None, priority=INTERACTIVE, validators=None):
         """
         List tasks from Morgen.
 
-        WARNING: Costs 10 API points per call. Use caching!
+        WARNING: Costs 10 API points per call (see rate_budget.ENDPOINT_COSTS). Use caching!
 
         Args:
             limit: Max tasks to return (max 100).
             updated_after: ISO datetime string to fetch only newer tasks.
+            priority: "interactive" or "background" (keeps the interactive reserve).
+            validators: Validators stored with the cached response
+                (TaskCache.get_validators()) to make the request conditional.
 
         Returns:
-            Dict: {"data": {"tasks": [...], "labelDefs": [...], "spaces": [...]}}
+            APIResponse: {"data": {"tasks": [...], "labelDefs": [...], "spaces": [...]}},
+            or empty with `not_modified` True when the cached copy is still current.
         """
         params = f"?limit={min(limit, 100)}"
         if updated_after:
             params += f"&updatedAfter={updated_after}"
 
-        logger.info("Fetching tasks from Morgen API (limit=%d)", limit)
-        response = self._make_request(f"/tasks/list{params}")
-
-        task_count = len(response.get("data", {}).get("tasks", []))
-        logger.info("Retrieved %d tasks from API", task_count)
+        endpoint = f"/tasks/list{params}"
+        # Priority is part of the key: an interactive call must not inherit a
+        # background flight's budget refusal or its longer retry deadline.
+        key = ("GET", endpoint, priority, tuple(sorted(validators.items())) if validators else None)
+        if self._flights.in_flight(key):
+            logger.info("Joining in-flight task fetch (limit=%d)", limit)
+        else:
+            logger.info("Fetching tasks from Morgen API (limit=%d%s)", limit, ", conditional" if validators else "")
+        response = self._flights.do(
+            key, lambda: self._call(endpoint, priority=priority, validators=validators)
+        )
+
+        if getattr(response, "not_modified", False):
+            logger.info("Task list not modified since last fetch")
+        else:
+            task_count = len(response.get("data", {}).get("tasks", []))
+            logger.info("Retrieved %d tasks from API", task_count)
 
         return response
 
-    def create_task(self, title, description=None, due=None, time_zone=None, priority=0):
+    def list_containers(self, kind, priority=INTERACTIVE):
+        """
+        List the task lists / projects / spaces of the account.
+
+        Args:
+            kind: "list", "project" or "space" (see CONTAINER_ENDPOINTS).
+
+        Returns:
+            List of {"id": ..., "name": ...} dicts; empty when the account or
+            API version has no such endpoint (404).
+        """
+        endpoint = CONTAINER_ENDPOINTS[kind]
+        try:
+            response = self._call(endpoint, priority=priority)
+        except MorgenAPIError as e:
+            if e.status_code == 404:
+                logger.info("No %s metadata endpoint (%s)", kind, endpoint)
+                return []
+            raise
+
+        data = response.get("data", response) if isinstance(response, dict) else response
+        if isinstance(data, dict):
+            data = next((v for v in data.values() if isinstance(v, list)), [])
+        items = [it for it in data or [] if isinstance(it, dict)]
+        logger.info("Retrieved %d %s containers", len(items), kind)
+        return items
+
+    def get_stats(self):
+        """Request counters: {"list_calls": int, "list_coalesced": int}."""
+        return {"list_calls": self._flights.calls, "list_coalesced": self._flights.coalesced}
+
+    def get_transfer_stats(self):
+        """Response body totals: {"responses": int, "wire_bytes": int, "decoded_bytes": int}."""
+        return self.transfer.as_dict()
+
+    def create_task(self, title, description=None, due=None, time_zone=None, priority=0,
+                    request_priority=INTERACTIVE):
         """
         Create a new task in Morgen.
 
@@ -162,42 +571,24 @@ class MorgenAPIClient:
             due: Due date as YYYY-MM-DDTHH:mm:ss (exactly 19 chars, no tz suffix).
             time_zone: IANA timezone string (e.g. "Europe/Berlin").
             priority: 0 (undefined) through 9 (lowest). 1 = highest.
+            request_priority: "interactive" or "background" budget for the call
+                (`priority` is the task's own priority).
 
         Returns:
             Dict: {"data": {"id": "..."}}
         """
-        if not title or not title.strip():
-            raise ValueError("Task title is required")
-
-        if not 0 <= priority <= 9:
-            raise ValueError("Priority must be between 0 and 9")
-
-        if due:
-            if len(due) != 19:
-                raise ValueError(
-                    f"Due date must be exactly 19 characters (YYYY-MM-DDTHH:mm:ss), got {len(due)}: {due}"
-                )
-            if due[4] != "-" or due[7] != "-" or due[10] != "T" or due[13] != ":" or due[16] != ":":
-                raise ValueError(f"Invalid due date format, expected YYYY-MM-DDTHH:mm:ss: {due}")
-
-        body = {"title": title.strip(), "priority": priority}
-
-        if description:
-            body["description"] = description
-        if due:
-            body["due"] = due
-            if time_zone:
-                body["timeZone"] = time_zone
+        body = build_create_task_body(title, description=description, due=due, time_zone=time_zone, priority=priority)
 
         logger.info("Creating task: %s", title)
-        response = self._make_request("/tasks/create", method="POST", data=body)
+        # Not idempotent: only retried when the request never reached Morgen.
+        response = self._call("/tasks/create", method="POST", data=body, priority=request_priority, idempotent=False)
 
         task_id = response.get("data", {}).get("id")
         logger.info("Task created: %s", task_id)
 
         return response
 
-    def close_task(self, task_id: str):
+    def close_task(self, task_id: str, priority=INTERACTIVE):
         """
         Mark a task as completed in Morgen.
 
@@ -211,4 +602,5 @@ class MorgenAPIClient:
 
         body = {"id": str(task_id).strip()}
         logger.info("Closing task: %s", body["id"])
-        return self._make_request("/tasks/close", method="POST", data=body)
+        # Closing an already closed task is harmless, so this is safe to retry.
+        return self._call("/tasks/close", method="POST", data=body, priority=priority)
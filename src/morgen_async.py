@@ -0,0 +1,430 @@
+"""
+Async Morgen API Client
+
+asyncio counterpart of `MorgenAPIClient` for fan-out work (bulk operations,
+metadata, prefetch): many requests in flight on a few keep-alive connections
+instead of one thread per call.
+
+Same methods (as coroutines), same exceptions, and the same rate budget,
+circuit breaker and retry rules as the blocking client; pass the blocking
+client's `rate_budget` and `circuit` so both count against one budget.
+HTTP/1.1 is spoken directly over asyncio streams (stdlib only).
+
+`EventLoopThread` runs a loop on one daemon thread so synchronous code
+(Ulauncher listeners) can submit coroutines and wait for or cancel them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import http.client
+import json
+import logging
+import ssl
+import threading
+import urllib.parse
+
+try:
+    from src.circuit_breaker import OPEN, CircuitBreaker, CircuitOpen
+    from src.morgen_api import (
+        BodyDecoder,
+        MorgenAPIClient,
+        MorgenAPIError,
+        MorgenNetworkError,
+        MorgenRateLimitError,
+        TransferStats,
+        build_create_task_body,
+        http_error,
+        is_retryable,
+    )
+    from src.rate_budget import BACKGROUND, INTERACTIVE, BudgetExhausted, RateBudget
+    from src.retry import RetryPolicy
+    from src.tracing import span
+except Exception:  # pragma: no cover - test/import environment differences
+    from circuit_breaker import OPEN, CircuitBreaker, CircuitOpen
+    from morgen_api import (
+        BodyDecoder,
+        MorgenAPIClient,
+        MorgenAPIError,
+        MorgenNetworkError,
+        MorgenRateLimitError,
+        TransferStats,
+        build_create_task_body,
+        http_error,
+        is_retryable,
+    )
+    from rate_budget import BACKGROUND, INTERACTIVE, BudgetExhausted, RateBudget
+    from retry import RetryPolicy
+    from tracing import span
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_CONCURRENCY = 8
+_MAX_IDLE_CONNECTIONS = 4
+
+
+class _StaleConnection(Exception):
+    """A reused keep-alive connection was closed by the server before it answered."""
+
+
+# --- Event loop thread ---
+
+class EventLoopThread:
+    """An asyncio loop on a daemon thread, fed from synchronous code."""
+
+    def __init__(self, name: str = "morgen-async"):
+        self.name = name
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule `coro` on the loop; cancelling the returned future cancels the coroutine."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float | None = None):
+        """Run `coro` on the loop and block for its result (cancelled on timeout)."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self):
+        """Cancel outstanding coroutines, then stop and close the loop."""
+        with self._lock:
+            if self.loop is None or self._thread is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_all(), self.loop).result(5)
+            except Exception:
+                logger.debug("Event loop did not wind down cleanly", exc_info=True)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(5)
+            self._thread = None
+            if not self.loop.is_running():
+                self.loop.close()
+
+    async def _cancel_all(self):
+        current = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0)  # let transports run their close callbacks
+
+
+# --- Client ---
+
+class AsyncMorgenAPIClient:
+    """asyncio client for the Morgen API v3 (see MorgenAPIClient for the method docs)."""
+
+    BASE_URL = MorgenAPIClient.BASE_URL
+
+    def __init__(
+        self,
+        api_key,
+        rate_budget=None,
+        circuit=None,
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+        base_url=None,
+    ):
+        if not api_key or not api_key.strip():
+            raise ValueError("API key cannot be empty")
+        self.api_key = api_key.strip()
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.timeout = 10  # seconds
+        self.connect_timeout = 2  # seconds
+        self.rate_budget = rate_budget or RateBudget()
+        self.circuit = circuit or CircuitBreaker()
+        self.retry_policies = {
+            INTERACTIVE: RetryPolicy(max_attempts=3, deadline=8.0),
+            BACKGROUND: RetryPolicy(max_attempts=5, max_delay=8.0, deadline=45.0),
+        }
+        self.max_concurrency = max(1, max_concurrency)
+        self.connections_opened = 0
+        self.transfer = TransferStats()
+        self._semaphore = None
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._inflight: dict = {}
+        self._list_calls = 0
+        self._list_coalesced = 0
+
+    # --- Requests ---
+
+    async def _call(self, endpoint, method="GET", data=None, priority=INTERACTIVE, idempotent=True):
+        """`_make_request` under the retry policy for `priority` (same rules as the blocking client)."""
+        policy = self.retry_policies.get(priority, self.retry_policies[INTERACTIVE])
+
+        async def attempt(time_left):
+            timeout = max(1.0, min(self.timeout, time_left))
+            with span("api.request"):
+                return await self._make_request(endpoint, method=method, data=data, priority=priority, timeout=timeout)
+
+        def should_retry(e):
+            return self.circuit.state != OPEN and is_retryable(e, idempotent)
+
+        # Each asyncio task has its own context, so concurrent calls get separate spans.
+        with span("api.call", method=method, endpoint=endpoint.split("?", 1)[0], priority=priority):
+            return await policy.acall(attempt, should_retry)
+
+    async def _make_request(self, endpoint, method="GET", data=None, priority=INTERACTIVE, timeout=None):
+        """
+        Make a single HTTP request (no retries; see `_call`).
+
+        At most `max_concurrency` requests are on the wire at once. Cancelling
+        the calling task closes its connection and releases the circuit slot.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            try:
+                self.circuit.acquire()
+            except CircuitOpen as e:
+                raise MorgenNetworkError(
+                    f"Cannot reach Morgen API (offline, retrying in {e.retry_after:.0f}s)",
+                    request_sent=False,
+                )
+
+            # Exactly one of record_success/record_failure/release per acquire.
+            # A half-open probe needs no separate connect here: connecting is
+            # bounded by connect_timeout anyway.
+            outcome = None
+            try:
+                try:
+                    self.rate_budget.acquire(endpoint, priority)
+                except BudgetExhausted as e:
+                    raise MorgenRateLimitError(
+                        f"Rate limit budget exhausted: {e}. Try again in {e.retry_after:.0f}s.",
+                        retry_after=e.retry_after,
+                    )
+
+                body = None
+                if data is not None:
+                    body = json.dumps(data).encode("utf-8")
+
+                try:
+                    status, reason, headers, raw = await asyncio.wait_for(
+                        self._send(method, endpoint, body), timeout or self.timeout
+                    )
+                except MorgenNetworkError:
+                    outcome = "failure"
+                    raise
+                except (asyncio.TimeoutError, OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    outcome = "failure"
+                    raise MorgenNetworkError(f"Cannot reach Morgen API: {str(e) or 'timed out'}")
+
+                if status >= 400:
+                    outcome = "failure" if status >= 500 else "success"
+                    error_body = raw.decode("utf-8", errors="replace") or None
+                    raise http_error(status, error_body, reason=reason, headers=headers, rate_budget=self.rate_budget)
+
+                self.rate_budget.record_response(headers)
+                outcome = "success"
+                if not raw:
+                    return {}
+                try:
+                    return json.loads(raw.decode("utf-8"))
+                except json.JSONDecodeError as e:
+                    raise MorgenAPIError(f"Invalid JSON response from API: {e}")
+            finally:
+                if outcome == "success":
+                    self.circuit.record_success()
+                elif outcome == "failure":
+                    self.circuit.record_failure()
+                else:
+                    self.circuit.release()
+
+    async def _send(self, method, endpoint, body):
+        """Send one request on a pooled connection; returns (status, reason, headers, body)."""
+        conn, reused = await self._acquire_connection()
+        try:
+            try:
+                status, reason, headers, raw, keep_alive = await self._exchange(conn, method, endpoint, body)
+            except _StaleConnection:
+                self._close(conn)
+                if not reused:
+                    raise MorgenNetworkError("Cannot reach Morgen API: connection closed by server")
+                # The server dropped an idle connection without reading our request: resend.
+                conn, _ = await self._acquire_connection(fresh=True)
+                status, reason, headers, raw, keep_alive = await self._exchange(conn, method, endpoint, body)
+        except BaseException:
+            # Includes cancellation: a half-used connection must not be reused.
+            self._close(conn)
+            raise
+
+        if keep_alive and len(self._idle) < _MAX_IDLE_CONNECTIONS:
+            self._idle.append(conn)
+        else:
+            self._close(conn)
+
+        decoder = BodyDecoder(headers.get("Content-Encoding"))
+        decoder.feed(raw)
+        raw = decoder.finish()
+        self.transfer.record(decoder)
+        return status, reason, headers, raw
+
+    async def _acquire_connection(self, fresh: bool = False):
+        """Returns ((reader, writer), reused): an idle keep-alive connection or a new one."""
+        while self._idle and not fresh:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            self._close((reader, writer))
+
+        parsed = urllib.parse.urlsplit(self.BASE_URL)
+        https = parsed.scheme == "https"
+        port = parsed.port or (443 if https else 80)
+        try:
+            conn = await asyncio.wait_for(
+                asyncio.open_connection(parsed.hostname, port, ssl=ssl.create_default_context() if https else None),
+                self.connect_timeout,
+            )
+        except (asyncio.TimeoutError, OSError) as e:
+            # Nothing was sent yet, so even a create may be retried.
+            raise MorgenNetworkError(f"Cannot reach Morgen API: {str(e) or 'connect timed out'}", request_sent=False)
+        self.connections_opened += 1
+        return conn, False
+
+    async def _exchange(self, conn, method, endpoint, body):
+        reader, writer = conn
+        parsed = urllib.parse.urlsplit(self.BASE_URL)
+        lines = [
+            f"{method} {parsed.path}{endpoint} HTTP/1.1",
+            f"Host: {parsed.netloc}",
+            f"Authorization: ApiKey {self.api_key}",
+            "Accept: application/json",
+            "Accept-Encoding: gzip",
+            "Connection: keep-alive",
+        ]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(body or b'')}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise _StaleConnection()
+        version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+        status = int(status)
+
+        headers = http.client.HTTPMessage()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and (headers.get("Connection") or "").lower() != "close"
+        if status in (204, 304) or method == "HEAD":
+            raw = b""
+        elif "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+            raw = await self._read_chunked(reader)
+        elif headers.get("Content-Length") is not None:
+            raw = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            raw = await reader.read()
+            keep_alive = False
+        return status, reason, headers, raw, keep_alive
+
+    async def _read_chunked(self, reader) -> bytes:
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return b"".join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readline()
+
+    def _close(self, conn):
+        try:
+            conn[1].close()
+        except Exception:
+            pass
+
+    async def aclose(self):
+        """Close idle keep-alive connections."""
+        while self._idle:
+            self._close(self._idle.pop())
+
+    # --- Endpoints ---
+
+    async def list_tasks(self, limit=100, updated_after=None, priority=INTERACTIVE):
+        """List tasks; concurrent identical calls share one request (see MorgenAPIClient.list_tasks)."""
+        params = f"?limit={min(limit, 100)}"
+        if updated_after:
+            params += f"&updatedAfter={urllib.parse.quote(updated_after)}"
+        endpoint = f"/tasks/list{params}"
+
+        self._list_calls += 1
+        future = self._inflight.get(endpoint)
+        if future is not None:
+            self._list_coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[endpoint] = future
+        try:
+            response = await self._call(endpoint, priority=priority)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # retrieved: no "never retrieved" warning without followers
+            raise
+        else:
+            future.set_result(response)
+        finally:
+            self._inflight.pop(endpoint, None)
+
+        logger.info("Retrieved %d tasks from API (async)", len(response.get("data", {}).get("tasks", [])))
+        return response
+
+    def get_stats(self):
+        """Request counters: {"list_calls", "list_coalesced", "connections_opened"}."""
+        return {
+            "list_calls": self._list_calls,
+            "list_coalesced": self._list_coalesced,
+            "connections_opened": self.connections_opened,
+        }
+
+    def get_transfer_stats(self):
+        """Response body totals: {"responses": int, "wire_bytes": int, "decoded_bytes": int}."""
+        return self.transfer.as_dict()
+
+    async def create_task(self, title, description=None, due=None, time_zone=None, priority=0,
+                          request_priority=INTERACTIVE):
+        """Create a task; only retried when the request never reached Morgen."""
+        body = build_create_task_body(title, description=description, due=due, time_zone=time_zone, priority=priority)
+        logger.info("Creating task: %s", title)
+        return await self._call("/tasks/create", method="POST", data=body, priority=request_priority, idempotent=False)
+
+    async def close_task(self, task_id: str, priority=INTERACTIVE):
+        """Mark a task as completed (POST /tasks/close; may return 204)."""
+        if not task_id or not str(task_id).strip():
+            raise ValueError("Task id is required")
+        body = {"id": str(task_id).strip()}
+        logger.info("Closing task: %s", body["id"])
+        return await self._call("/tasks/close", method="POST", data=body, priority=priority)
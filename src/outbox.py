@@ -0,0 +1,401 @@
+"""
+Outbox
+
+Durable write-ahead queue for task mutations (create / close).
+
+Mutations are appended to `outbox.jsonl` in the account's cache partition
+and applied optimistically to the task cache, so capturing a task never waits
+on the network. A background drainer replays pending operations in order
+once Morgen is reachable, backing off on network errors and rate limits.
+
+Journal records (one JSON object per line):
+    {"op": "create", "id": ..., "ts": ..., "local_id": "local-…", "body": {...}, "token": ...}
+    {"op": "close", "id": ..., "ts": ..., "task_id": ...}
+    {"attempt": id}                 # about to send (a crash/timeout after this is ambiguous)
+    {"unsent": id}                  # that attempt certainly never reached Morgen
+    {"done": id, "task_id": ...}    # applied on the server
+    {"failed": id, "error": ...}    # permanently rejected (e.g. validation)
+
+A create whose earlier attempt may have reached the server is only replayed
+after checking the server's task list for it, so a lost response does not
+create the task twice. The check only looks at tasks created since the op was
+queued, and an attempt that certainly never left this machine (connection
+refused, DNS failure) or was refused outright (rate limit, auth) does not
+count as ambiguous, so coming back online does not cost a list call per
+queued create. Creates carry the submitting action's idempotency
+token: the same submit delivered twice is queued once, while two separate
+submits of an identical task are two tasks.
+
+Replays are background work: they run at BACKGROUND budget priority, so
+draining a backlog never spends the points reserved for interactive queries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+try:
+    from src.morgen_api import (
+        MorgenAPIError,
+        MorgenAuthError,
+        MorgenNetworkError,
+        MorgenRateLimitError,
+        MorgenValidationError,
+        build_create_task_body,
+    )
+    from src.rate_budget import BACKGROUND
+except Exception:  # pragma: no cover - test/import environment differences
+    from morgen_api import (
+        MorgenAPIError,
+        MorgenAuthError,
+        MorgenNetworkError,
+        MorgenRateLimitError,
+        MorgenValidationError,
+        build_create_task_body,
+    )
+    from rate_budget import BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+LOCAL_ID_PREFIX = "local-"
+_BACKOFF_BASE = 5.0
+_BACKOFF_MAX = 300.0
+_RATE_LIMIT_BACKOFF = 60.0
+_REMOTE_MATCH_SKEW = 300.0  # seconds of clock difference tolerated when matching remote creates
+
+
+class Outbox:
+    """Append-only queue of pending create/close operations for one account."""
+
+    def __init__(self, path: str, client, cache=None, execute=None):
+        """
+        Args:
+            path: Outbox file (e.g. <partition>/outbox.jsonl).
+            client: MorgenAPIClient for this account.
+            cache: TaskCache to update optimistically and after each replay.
+            execute: Callable(fn) running one API call and returning its result
+                (e.g. on the SyncWorker); defaults to calling it directly.
+        """
+        self.path = path
+        self.client = client
+        self.cache = cache
+        self.execute = execute or (lambda fn: fn())
+        self._lock = threading.RLock()
+        self._ops: dict[str, dict] = {}  # pending ops, insertion (= journal) order
+        self._attempted: set[str] = set()
+        self._resolved_ids: dict[str, str] = {}  # local id -> server id
+        self._tokens: dict[str, str] = {}  # create idempotency token -> local id
+        self.failed: list[dict] = []
+        self._network_failures = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._load()
+
+    # --- Enqueue ---
+
+    def enqueue_create(self, title, due=None, priority=0, description=None, time_zone=None, maybe_sent=False,
+                       token=None) -> str:
+        """
+        Queue a task creation; returns the local id used in the cache until synced.
+        Pass maybe_sent=True when a direct attempt may already have reached Morgen,
+        so the drainer checks the server before sending it again. `token`
+        identifies one submit (e.g. one rendered "Create" item): enqueueing the
+        same token again returns the first local id instead of a second task.
+        Raises ValueError for invalid input (nothing is queued).
+        """
+        body = build_create_task_body(title, description=description, due=due, time_zone=time_zone, priority=priority)
+        with self._lock:
+            if token and token in self._tokens:
+                logger.info("Outbox: create %s already queued (%s)", token, body["title"])
+                return self._tokens[token]
+            op = {
+                "op": "create",
+                "id": uuid.uuid4().hex,
+                "ts": time.time(),
+                "local_id": f"{LOCAL_ID_PREFIX}{uuid.uuid4().hex[:12]}",
+                "body": body,
+            }
+            if token:
+                op["token"] = token
+                self._tokens[token] = op["local_id"]
+            self._append(op)
+            self._ops[op["id"]] = op
+            if maybe_sent:
+                self._mark_attempt(op)
+        self._apply_op(self.cache, op)
+        self.kick()
+        return op["local_id"]
+
+    def enqueue_close(self, task_id: str, apply_to_cache: bool = True) -> bool:
+        """
+        Queue closing `task_id`; returns False if it is already queued.
+        Pass apply_to_cache=False when the caller updates the cache itself (batches).
+        """
+        task_id = str(task_id or "").strip()
+        if not task_id:
+            raise ValueError("Task id is required")
+        with self._lock:
+            if any(op["op"] == "close" and op["task_id"] == task_id for op in self._ops.values()):
+                return False
+            op = {"op": "close", "id": uuid.uuid4().hex, "ts": time.time(), "task_id": task_id}
+            self._append(op)
+            self._ops[op["id"]] = op
+        if apply_to_cache:
+            self._apply_op(self.cache, op)
+        self.kick()
+        return True
+
+    # --- State ---
+
+    def pending(self) -> list[dict]:
+        with self._lock:
+            return [dict(op) for op in self._ops.values()]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._ops)
+
+    def apply_to_cache(self, cache=None):
+        """Re-apply pending ops, e.g. after a full refresh replaced the cached tasks."""
+        cache = cache or self.cache
+        for op in self.pending():
+            self._apply_op(cache, op)
+
+    # --- Draining ---
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="morgen-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def kick(self):
+        """Wake the drainer (new op, or connectivity may be back)."""
+        self._wake.set()
+
+    def drain(self) -> float | None:
+        """
+        Replay pending ops in order until done or blocked.
+
+        Returns None when the queue is empty or the drainer should wait for a
+        kick (auth failure), otherwise seconds to wait before trying again.
+        """
+        while True:
+            with self._lock:
+                op = next(iter(self._ops.values()), None)
+            if op is None:
+                self._compact_if_empty()
+                return None
+            try:
+                self._replay(op)
+                self._network_failures = 0
+            except MorgenAuthError:
+                logger.warning("Outbox paused: API key rejected (%d pending)", self.pending_count())
+                return None
+            except MorgenRateLimitError as e:
+                return e.retry_after or _RATE_LIMIT_BACKOFF
+            except MorgenNetworkError as e:
+                self._network_failures += 1
+                logger.info("Outbox: Morgen unreachable (%s); %d pending", e, self.pending_count())
+                return min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** (self._network_failures - 1))
+            except (MorgenValidationError, ValueError) as e:
+                self._fail(op, e)
+            except MorgenAPIError as e:
+                if op["op"] == "close" and e.status_code == 404:
+                    self._complete(op, op["task_id"])  # already gone
+                elif e.status_code is not None and 400 <= e.status_code < 500:
+                    self._fail(op, e)
+                else:
+                    return _BACKOFF_BASE
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                delay = self.drain()
+            except Exception:
+                logger.exception("Outbox drainer error")
+                delay = _BACKOFF_MAX
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _replay(self, op: dict):
+        if op["op"] == "create":
+            if op["id"] in self._attempted:
+                existing = self._find_remote_create(op)
+                if existing:
+                    logger.info("Outbox: create %s already applied on server", op["id"])
+                    self._complete(op, existing)
+                    return
+            self._mark_attempt(op)
+            body = op["body"]
+            try:
+                response = self.execute(lambda: self.client.create_task(
+                    title=body["title"],
+                    description=body.get("description"),
+                    due=body.get("due"),
+                    time_zone=body.get("timeZone"),
+                    priority=body.get("priority", 0),
+                    request_priority=BACKGROUND,
+                ))
+            except MorgenNetworkError as e:
+                if not e.request_sent:
+                    self._clear_attempt(op)
+                raise
+            except (MorgenAuthError, MorgenRateLimitError):
+                self._clear_attempt(op)  # refused before it was processed
+                raise
+            self._complete(op, (response.get("data") or {}).get("id") or "")
+        else:
+            task_id = self._resolved_ids.get(op["task_id"], op["task_id"])
+            if task_id.startswith(LOCAL_ID_PREFIX):
+                # Its create was rejected; nothing to close on the server.
+                self._complete(op, task_id)
+                return
+            self.execute(lambda: self.client.close_task(task_id, priority=BACKGROUND))
+            self._complete(op, task_id)
+            if task_id != op["task_id"] and self.cache is not None:
+                # Closed before its create had synced: drop the server copy too.
+                self.cache.remove_tasks([task_id])
+
+    def _find_remote_create(self, op: dict) -> str | None:
+        """
+        Server id of a task this create already made, or None.
+
+        Only tasks updated and created since the op was queued (less a clock
+        skew margin) are candidates, so an older task with the same title is
+        not adopted and the match does not depend on the account's size.
+        """
+        since = _utc_stamp(op["ts"] - _REMOTE_MATCH_SKEW)
+        response = self.execute(lambda: self.client.list_tasks(
+            limit=100, updated_after=since, priority=BACKGROUND
+        ))
+        body = op["body"]
+        with self._lock:
+            adopted = set(self._resolved_ids.values())
+        for task in (response.get("data") or {}).get("tasks") or []:
+            if task.get("id") in adopted or (task.get("created") or since)[:19] < since[:19]:
+                continue
+            if task.get("title") == body["title"] and (task.get("due") or None) == body.get("due"):
+                return task.get("id")
+        return None
+
+    def _complete(self, op: dict, server_id: str):
+        with self._lock:
+            self._append({"done": op["id"], "task_id": server_id})
+            self._ops.pop(op["id"], None)
+            self._attempted.discard(op["id"])
+            if op["op"] == "create" and server_id:
+                self._resolved_ids[op["local_id"]] = server_id
+        if op["op"] == "create" and self.cache is not None:
+            self.cache.remove_tasks([op["local_id"]])
+            if server_id:
+                self.cache.upsert_tasks([_task_from_body(server_id, op["body"])])
+        logger.info("Outbox: %s %s synced", op["op"], server_id or op["id"])
+
+    def _fail(self, op: dict, error):
+        message = str(getattr(error, "message", error))
+        with self._lock:
+            self._append({"failed": op["id"], "error": message})
+            self._ops.pop(op["id"], None)
+            self.failed.append(dict(op, error=message))
+        if op["op"] == "create" and self.cache is not None:
+            self.cache.remove_tasks([op["local_id"]])
+        logger.warning("Outbox: %s rejected by Morgen, dropped: %s", op["op"], message)
+
+    def _mark_attempt(self, op: dict):
+        with self._lock:
+            self._append({"attempt": op["id"]})
+            self._attempted.add(op["id"])
+
+    def _clear_attempt(self, op: dict):
+        with self._lock:
+            self._append({"unsent": op["id"]})
+            self._attempted.discard(op["id"])
+
+    # --- Persistence ---
+
+    def _apply_op(self, cache, op: dict):
+        if cache is None:
+            return
+        if op["op"] == "create":
+            cache.upsert_tasks([_task_from_body(op["local_id"], op["body"], pending=True)])
+        else:
+            cache.remove_tasks([op["task_id"]])
+
+    def _append(self, record: dict):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("Cannot read outbox %s: %s", self.path, e)
+            return
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn tail from a crash mid-append
+            if "op" in record:
+                self._ops[record["id"]] = record
+                if record.get("token"):
+                    self._tokens[record["token"]] = record["local_id"]
+            elif "attempt" in record:
+                self._attempted.add(record["attempt"])
+            elif "unsent" in record:
+                self._attempted.discard(record["unsent"])
+            elif "done" in record:
+                op = self._ops.pop(record["done"], None)
+                if op and op["op"] == "create" and record.get("task_id"):
+                    self._resolved_ids[op["local_id"]] = record["task_id"]
+            elif "failed" in record:
+                self._ops.pop(record["failed"], None)
+        if self._ops:
+            logger.info("Outbox: %d pending operations from a previous session", len(self._ops))
+
+    def _compact_if_empty(self):
+        with self._lock:
+            if self._ops:
+                return
+            try:
+                if os.path.getsize(self.path) > 0:
+                    with open(self.path, "w", encoding="utf-8"):
+                        pass
+            except OSError:
+                pass
+            self._attempted.clear()
+
+
+def _utc_stamp(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _task_from_body(task_id: str, body: dict, pending: bool = False) -> dict:
+    task = {"id": task_id, "title": body["title"], "priority": body.get("priority", 0)}
+    if body.get("due"):
+        task["due"] = body["due"]
+    if body.get("description"):
+        task["description"] = body["description"]
+    if pending:
+        task["pendingSync"] = True
+    return task
@@ -0,0 +1,260 @@
+"""
+Rate Budget
+
+Client-side ledger of Morgen API points.
+
+Morgen meters its API in points per rolling window (list endpoints cost 10
+points, everything else 1). The ledger records what this client spent,
+follows the server's view whenever rate-limit headers are returned, and
+honours `Retry-After` after a 429. Background calls (prefetch, sync) must
+leave `background_reserve` points untouched so interactive refreshes are not
+starved, and are refused with a retry hint instead of spending the last
+points. State is persisted so restarts do not forget recent spending.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_LIMIT = 300          # points per window
+_DEFAULT_WINDOW = 15 * 60     # seconds
+_DEFAULT_BACKGROUND_RESERVE = 60
+_DEFAULT_COST = 1
+_DEFAULT_RETRY_AFTER = 60.0   # used for a 429 without Retry-After
+
+ENDPOINT_COSTS = {
+    "/tasks/list": 10,
+}
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+
+class BudgetExhausted(Exception):
+    """The call would exceed the budget; retry after `retry_after` seconds."""
+
+    def __init__(self, message, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def endpoint_cost(endpoint: str) -> int:
+    path = endpoint.split("?", 1)[0]
+    return ENDPOINT_COSTS.get(path, _DEFAULT_COST)
+
+
+def parse_retry_after(value, now: float | None = None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, parsed.timestamp() - now)
+
+
+def _header(headers, *names):
+    if headers is None:
+        return None
+    for name in names:
+        try:
+            value = headers.get(name)
+        except Exception:
+            return None
+        if value is not None:
+            return value
+    return None
+
+
+def _int_header(headers, *names):
+    value = _header(headers, *names)
+    try:
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateBudget:
+    """Rolling-window point ledger shared by all calls of one API client."""
+
+    def __init__(
+        self,
+        limit: int = _DEFAULT_LIMIT,
+        window: float = _DEFAULT_WINDOW,
+        background_reserve: int = _DEFAULT_BACKGROUND_RESERVE,
+        state_path: str | None = None,
+        clock=time.time,
+    ):
+        """
+        Args:
+            limit: Points per window (updated from RateLimit-Limit headers).
+            window: Window length in seconds.
+            background_reserve: Points background calls must leave unspent.
+            state_path: JSON file to persist the ledger (None = in-memory only).
+        """
+        self.limit = limit
+        self.window = window
+        self.background_reserve = background_reserve
+        self.state_path = state_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._spends: list[list[float]] = []  # [timestamp, cost]
+        self._blocked_until = 0.0
+        # Last server-reported state: remaining points as of `_server_seen_at`.
+        self._server_remaining = None
+        self._server_seen_at = None
+        self._server_reset_at = None
+        self._load()
+
+    def remaining(self) -> int:
+        """Estimated points left in the current window."""
+        with self._lock:
+            return self._remaining_locked(self._clock())
+
+    def acquire(self, endpoint: str, priority: str = INTERACTIVE) -> int:
+        """
+        Reserve the points for a call to `endpoint`.
+
+        Raises BudgetExhausted while a Retry-After is pending, or when the call
+        would dip below the reserve for its priority. Returns the cost.
+        """
+        cost = endpoint_cost(endpoint)
+        with self._lock:
+            now = self._clock()
+            if now < self._blocked_until:
+                raise BudgetExhausted("Rate limited by Morgen", self._blocked_until - now)
+
+            floor = self.background_reserve if priority == BACKGROUND else 0
+            remaining = self._remaining_locked(now)
+            if remaining - cost < floor:
+                wait = self._seconds_until_available(now, cost + floor - remaining)
+                raise BudgetExhausted(
+                    f"API budget low ({remaining} points left, {priority} call needs {cost} + {floor} reserve)",
+                    wait,
+                )
+
+            self._spends.append([now, cost])
+            self._save_locked()
+            return cost
+
+    def record_response(self, headers):
+        """Update from rate-limit headers of a successful response (if any)."""
+        limit = _int_header(headers, "RateLimit-Limit", "X-RateLimit-Limit")
+        remaining = _int_header(headers, "RateLimit-Remaining", "X-RateLimit-Remaining")
+        reset = _header(headers, "RateLimit-Reset", "X-RateLimit-Reset")
+        if limit is None and remaining is None:
+            return
+        with self._lock:
+            now = self._clock()
+            if limit is not None and limit > 0:
+                self.limit = limit
+            if remaining is not None:
+                self._server_remaining = max(0, remaining)
+                self._server_seen_at = now
+                self._server_reset_at = self._parse_reset(reset, now)
+            self._save_locked()
+
+    def record_rate_limited(self, headers):
+        """A 429 was returned: block all calls until Retry-After (or reset) passes."""
+        with self._lock:
+            now = self._clock()
+            wait = parse_retry_after(_header(headers, "Retry-After"), now)
+            if wait is None:
+                reset_at = self._parse_reset(_header(headers, "RateLimit-Reset", "X-RateLimit-Reset"), now)
+                wait = (reset_at - now) if reset_at else _DEFAULT_RETRY_AFTER
+            self._blocked_until = max(self._blocked_until, now + wait)
+            self._server_remaining = 0
+            self._server_seen_at = now
+            self._server_reset_at = now + wait
+            self._save_locked()
+            logger.warning("Morgen rate limit hit; pausing API calls for %.0fs", wait)
+            return wait
+
+    def retry_after(self) -> float:
+        """Seconds until calls are allowed again after a 429 (0 if not blocked)."""
+        with self._lock:
+            return max(0.0, self._blocked_until - self._clock())
+
+    def _remaining_locked(self, now: float) -> int:
+        self._spends = [s for s in self._spends if now - s[0] < self.window]
+        local = self.limit - sum(cost for _ts, cost in self._spends)
+        if self._server_remaining is not None and self._server_seen_at is not None:
+            if self._server_reset_at is not None and now >= self._server_reset_at:
+                self._server_remaining = self._server_seen_at = self._server_reset_at = None
+            elif now - self._server_seen_at < self.window:
+                spent_since = sum(cost for ts, cost in self._spends if ts > self._server_seen_at)
+                return max(0, min(local, self._server_remaining - spent_since))
+        return max(0, local)
+
+    def _seconds_until_available(self, now: float, needed: int) -> float:
+        if self._server_reset_at is not None and self._server_reset_at > now:
+            return self._server_reset_at - now
+        freed = 0
+        for ts, cost in sorted(self._spends):
+            freed += cost
+            if freed >= needed:
+                return max(0.0, ts + self.window - now)
+        return self.window
+
+    def _parse_reset(self, value, now: float) -> float | None:
+        try:
+            reset = float(value)
+        except (TypeError, ValueError):
+            return None
+        # Epoch timestamp vs. seconds-until-reset
+        return reset if reset > 1_000_000_000 else now + reset
+
+    def _load(self):
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._spends = [[float(ts), int(cost)] for ts, cost in data.get("spends", [])]
+            self._blocked_until = float(data.get("blocked_until") or 0.0)
+            self.limit = int(data.get("limit") or self.limit)
+            self._server_remaining = data.get("server_remaining")
+            self._server_seen_at = data.get("server_seen_at")
+            self._server_reset_at = data.get("server_reset_at")
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable rate budget state %s: %s", self.state_path, e)
+
+    def _save_locked(self):
+        if not self.state_path:
+            return
+        data = {
+            "limit": self.limit,
+            "spends": self._spends,
+            "blocked_until": self._blocked_until,
+            "server_remaining": self._server_remaining,
+            "server_seen_at": self._server_seen_at,
+            "server_reset_at": self._server_reset_at,
+        }
+        tmp = self.state_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            logger.debug("Failed to persist rate budget: %s", e)
@@ -0,0 +1,101 @@
+"""
+Retry Policy
+
+Exponential backoff with equal jitter, bounded by an overall deadline.
+
+Each attempt receives the time left before the deadline so the caller can cap
+its own timeout; retries stop as soon as the next backoff would overrun it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """How often, how fast and for how long to retry one logical call."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 4.0,
+        deadline: float = 8.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+        rng: random.Random | None = None,
+    ):
+        """
+        Args:
+            max_attempts: Attempts including the first one.
+            base_delay: Backoff before the 2nd attempt; doubles each retry (with jitter).
+            max_delay: Upper bound for a single backoff.
+            deadline: Seconds the whole call (attempts + backoffs) may take.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Jittered delay after failed attempt number `attempt` (1-based).
+
+        Equal jitter: uniform in [ceiling/2, ceiling], so a retry never fires
+        immediately after a failure.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return self._rng.uniform(ceiling / 2, ceiling)
+
+    def call(self, fn, should_retry):
+        """
+        Run `fn(time_left)` until it succeeds, `should_retry(exc)` is False,
+        attempts run out, or the next backoff would pass the deadline.
+        The last exception is re-raised.
+        """
+        start = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            time_left = self.deadline - (self._clock() - start)
+            try:
+                return fn(time_left)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, start, should_retry)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+
+    async def acall(self, fn, should_retry, sleep=asyncio.sleep):
+        """`call` for coroutine functions: awaits `fn(time_left)` and backs off with `sleep`."""
+        start = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            time_left = self.deadline - (self._clock() - start)
+            try:
+                return await fn(time_left)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, start, should_retry)
+                if delay is None:
+                    raise
+                await sleep(delay)
+
+    def _retry_delay(self, error, attempt: int, start: float, should_retry) -> float | None:
+        """Backoff before the next attempt, or None when `error` should be re-raised."""
+        if attempt >= self.max_attempts or not should_retry(error):
+            return None
+        delay = self.backoff(attempt)
+        if self._clock() - start + delay >= self.deadline:
+            logger.info("Not retrying (%s): deadline of %.1fs reached", error, self.deadline)
+            return None
+        logger.info("Attempt %d failed (%s); retrying in %.2fs", attempt, error, delay)
+        return delay
@@ -0,0 +1,166 @@
+"""
+Prefetch Scheduler
+
+Background thread that refreshes the active task cache shortly before its TTL
+runs out, so the user-facing `mg` path almost always hits a warm cache.
+
+Scheduled refreshes are jittered, spaced at least `min_interval` apart, back
+off exponentially on errors (longer on rate limits), and pause entirely while
+the extension is idle. Activity (any query) resumes the schedule.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+
+try:
+    from src.morgen_api import MorgenAuthError, MorgenRateLimitError
+except Exception:  # pragma: no cover - test/import environment differences
+    from morgen_api import MorgenAuthError, MorgenRateLimitError
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_LEAD_TIME = 30.0        # refresh this many seconds before expiry
+_DEFAULT_JITTER = 15.0           # plus up to this many seconds earlier, at random
+_DEFAULT_IDLE_TIMEOUT = 30 * 60  # pause after 30 minutes without queries
+_DEFAULT_MIN_INTERVAL = 120.0    # never refresh more often than this (10 API points each)
+_BACKOFF_BASE = 30.0
+_BACKOFF_MAX = 15 * 60.0
+_RATE_LIMIT_BACKOFF = 5 * 60.0
+
+
+class PrefetchScheduler:
+    """Refresh the current cache shortly before `TaskCache.is_fresh()` would turn false."""
+
+    def __init__(
+        self,
+        get_cache,
+        refresh,
+        *,
+        lead_time: float = _DEFAULT_LEAD_TIME,
+        jitter: float = _DEFAULT_JITTER,
+        idle_timeout: float = _DEFAULT_IDLE_TIMEOUT,
+        min_interval: float = _DEFAULT_MIN_INTERVAL,
+        clock=time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        """
+        Args:
+            get_cache: Callable returning the active TaskCache (or None).
+            refresh: Callable(cache) performing the API fetch + cache update.
+            lead_time: Seconds before expiry at which to refresh.
+            jitter: Max extra seconds (random) to refresh earlier, per cycle.
+            idle_timeout: Pause after this many seconds without activity.
+            min_interval: Minimum seconds between scheduled refreshes.
+        """
+        self.get_cache = get_cache
+        self.refresh = refresh
+        self.lead_time = lead_time
+        self.jitter = jitter
+        self.idle_timeout = idle_timeout
+        self.min_interval = min_interval
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+        self._last_activity = None  # paused until the first query
+        self._last_refresh = None
+        self._failures = 0
+        self._backoff_until = None
+        self._cycle_jitter = self._rng.uniform(0, self.jitter)
+        self._wake = threading.Event()
+        self._waiting_for_activity = False
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.refresh_count = 0
+        self.error_count = 0
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="morgen-prefetch", daemon=True)
+        self._thread.start()
+        logger.info("Prefetch scheduler started")
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def notify_activity(self):
+        """Record user activity; resumes a paused schedule."""
+        was_idle = self._is_idle(self._clock())
+        self._last_activity = self._clock()
+        # Also wake a thread parked without a timeout while active (e.g. the
+        # first query arrived before its cache existed), or it never rechecks.
+        if was_idle or self._waiting_for_activity:
+            self._wake.set()
+
+    def tick(self) -> float | None:
+        """
+        Refresh if due. Returns seconds until the next check, or None to wait
+        for activity (idle, no cache yet, or auth failure).
+        """
+        now = self._clock()
+        if self._is_idle(now):
+            return None
+        if self._backoff_until is not None and now < self._backoff_until:
+            return self._backoff_until - now
+
+        cache = self.get_cache()
+        if cache is None or not cache.has_data():
+            return None  # the user path does the first fetch
+
+        due_in = self._due_in(cache)
+        if due_in > 0:
+            return due_in
+        if self._last_refresh is not None and now - self._last_refresh < self.min_interval:
+            return self.min_interval - (now - self._last_refresh)
+
+        try:
+            self.refresh(cache)
+        except MorgenAuthError:
+            logger.warning("Prefetch paused: API key rejected")
+            self._last_activity = None
+            return None
+        except Exception as e:
+            self.error_count += 1
+            self._failures += 1
+            backoff = min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** (self._failures - 1))
+            if isinstance(e, MorgenRateLimitError):
+                backoff = max(backoff, e.retry_after or _RATE_LIMIT_BACKOFF)
+            backoff += self._rng.uniform(0, backoff / 4)
+            self._backoff_until = self._clock() + backoff
+            logger.info("Prefetch failed (%s); retrying in %.0fs", e, backoff)
+            return backoff
+
+        self.refresh_count += 1
+        self._failures = 0
+        self._backoff_until = None
+        self._last_refresh = self._clock()
+        self._cycle_jitter = self._rng.uniform(0, self.jitter)
+        return max(self._due_in(cache), self.min_interval)
+
+    def _due_in(self, cache) -> float:
+        remaining = cache.ttl - cache.get_age()
+        return remaining - self.lead_time - self._cycle_jitter
+
+    def _is_idle(self, now) -> bool:
+        return self._last_activity is None or now - self._last_activity > self.idle_timeout
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                delay = self.tick()
+            except Exception:
+                logger.exception("Prefetch scheduler error")
+                delay = _BACKOFF_MAX
+            if delay is None:
+                logger.debug("Prefetch waiting for activity")
+                self._waiting_for_activity = True
+            self._wake.wait(delay)
+            self._waiting_for_activity = False
+            self._wake.clear()
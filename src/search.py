@@ -0,0 +1,58 @@
+"""
+Search
+
+Title/description matching for the task list view. Every word of the query
+must appear (case-insensitively) in the title or description.
+
+Kept free of Ulauncher imports so it can be tested and benchmarked directly.
+"""
+
+from __future__ import annotations
+
+
+def build_search_index(tasks) -> dict[str, tuple[str, str]]:
+    """Pre-compute lowercase (title, description) per task id."""
+    index = {}
+    for task in tasks:
+        task_id = task.get("id")
+        if not task_id:
+            continue
+        index[task_id] = ((task.get("title") or "").lower(), (task.get("description") or "").lower())
+    return index
+
+
+def filter_tasks(tasks, query: str, search_index=None, matched_ids=None):
+    """
+    Tasks matching every word of `query`, in their original order.
+
+    Args:
+        search_index: {task_id: (title_lower, desc_lower)} from build_search_index;
+            tasks missing from it are lowercased on the fly.
+        matched_ids: Ids the cache backend already matched through its own
+            index (SQLite FTS); used instead of scanning.
+    """
+    if not query:
+        return tasks
+
+    words = query.lower().split()
+    if not words:
+        return tasks
+
+    # Backend already resolved the query through its own index (SQLite FTS)
+    if matched_ids is not None:
+        return [task for task in tasks if task.get("id") in matched_ids]
+
+    search_index = search_index or {}
+    filtered = []
+    for task in tasks:
+        task_id = task.get("id")
+        indexed = search_index.get(task_id) if task_id else None
+        if indexed:
+            title, description = indexed
+        else:
+            title = (task.get("title") or "").lower()
+            description = (task.get("description") or "").lower()
+        text = title + " " + description
+        if all(w in text for w in words):
+            filtered.append(task)
+    return filtered
@@ -0,0 +1,53 @@
+"""
+Single-flight
+
+Collapse concurrent calls for the same key into one execution: the first
+caller runs the function, later callers block until it finishes and share
+its result (or exception).
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run `fn()` unless a call for `key` is in flight; then wait for and return its result."""
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def in_flight(self, key) -> bool:
+        with self._lock:
+            return key in self._inflight
@@ -0,0 +1,454 @@
+"""
+SQLite Task Cache
+
+Optional TaskCache backend that keeps tasks in a local SQLite database
+(stdlib sqlite3) instead of one big JSON file.
+
+Tasks are stored one row each, with an FTS5 index over title/description and
+a B-tree index on the container, so search and container filters are indexed
+queries. Writes are upserts, so a delta sync only touches the rows that
+changed.
+
+The database runs in WAL mode, so several processes can share it; other
+processes' commits are picked up through PRAGMA data_version.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    from src.cache import TaskCache, _response_envelope
+    from src.task_lists import get_task_list_ref
+    from src.tracing import annotate, traced
+except Exception:  # pragma: no cover - test/import environment differences
+    from cache import TaskCache, _response_envelope
+    from task_lists import get_task_list_ref
+    from tracing import annotate, traced
+
+logger = logging.getLogger(__name__)
+
+# FTS5 trigram tokens are 3 characters; shorter words fall back to LIKE.
+_MIN_FTS_WORD = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    rid            INTEGER PRIMARY KEY,
+    id             TEXT NOT NULL UNIQUE,
+    position       INTEGER NOT NULL,
+    title          TEXT NOT NULL DEFAULT '',
+    description    TEXT NOT NULL DEFAULT '',
+    due            TEXT,
+    priority       INTEGER NOT NULL DEFAULT 0,
+    container_kind TEXT,
+    container_id   TEXT COLLATE NOCASE,
+    updated        TEXT,
+    data           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_position ON tasks(position);
+DROP INDEX IF EXISTS idx_tasks_due;
+DROP INDEX IF EXISTS idx_tasks_priority;
+CREATE INDEX IF NOT EXISTS idx_tasks_container ON tasks(container_kind, container_id);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description, content='tasks', content_rowid='rid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_ai AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_ad AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+    VALUES ('delete', old.rid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_au AFTER UPDATE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+    VALUES ('delete', old.rid, old.title, old.description);
+    INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rid, new.title, new.description);
+END;
+"""
+
+_UPSERT_SQL = """
+INSERT INTO tasks (id, position, title, description, due, priority, container_kind, container_id, updated, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    position = CASE WHEN ? THEN excluded.position ELSE tasks.position END,
+    title = excluded.title,
+    description = excluded.description,
+    due = excluded.due,
+    priority = excluded.priority,
+    container_kind = excluded.container_kind,
+    container_id = excluded.container_id,
+    updated = excluded.updated,
+    data = excluded.data
+WHERE tasks.data != excluded.data OR (? AND tasks.position != excluded.position)
+"""
+
+
+def _priority_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SQLiteTaskCache(TaskCache):
+    """TaskCache backed by SQLite with FTS5 search and indexed container lookups."""
+
+    _default_file_name = "tasks_cache.sqlite3"
+
+    def __init__(
+        self,
+        ttl=600,
+        db_path: str | None = None,
+        ttl_bounds: tuple[int, int] | None = None,
+        api_key: str | None = None,
+    ):
+        """
+        Args:
+            ttl: Time-to-live in seconds (default 600 = 10 minutes).
+            db_path: SQLite database path.
+            ttl_bounds: (min, max) seconds to enable adaptive TTL; None keeps `ttl` static.
+            api_key: Without `db_path`, use this account's partition (tasks_cache.sqlite3).
+        """
+        self._conn = None
+        self._has_fts = False
+        self._db_lock = threading.RLock()
+        self._tasks_memo = None  # decoded task list, dropped on every write
+        self._data_version = None
+        super().__init__(ttl=ttl, cache_path=db_path, ttl_bounds=ttl_bounds, api_key=api_key)
+
+    # --- TaskCache overrides ---
+
+    def get_tasks(self):
+        """Return cached task list if fresh, else None."""
+        self.reload_if_changed()
+        if self._cache is None:
+            logger.debug("Cache miss: empty")
+            return None
+
+        if not self.is_fresh():
+            logger.debug("Cache expired (age: %.1fs, TTL: %ds)", self.get_age(), self.ttl)
+            return None
+
+        tasks = self._all_tasks()
+        logger.debug("Cache hit: %d tasks (age: %.1fs)", len(tasks), self.get_age())
+        return tasks
+
+    def get_full_response(self):
+        """Return full cached API response if any data exists (even if expired)."""
+        self.reload_if_changed()
+        if self._cache is None:
+            return None
+        response = dict(self._cache)
+        response["data"] = dict(self._cache.get("data") or {})
+        response["data"]["tasks"] = self._all_tasks()
+        return response
+
+    @traced("cache.set_tasks")
+    def set_tasks(self, api_response, validators=None):
+        """
+        Replace the cached task set with an API response.
+
+        Rows whose payload did not change are left untouched; tasks missing
+        from the response are deleted.
+        """
+        tasks = api_response.get("data", {}).get("tasks", [])
+        timestamp = time.time()
+        validators = dict(validators) if validators else None
+        with self._db_lock:
+            if self._conn is None:
+                return self._set_tasks_in_memory(api_response, validators)
+            try:
+                with self._conn:
+                    stored = dict(self._conn.execute("SELECT id, data FROM tasks"))
+                    self._upsert_rows(tasks, start_position=0, reposition=True)
+                    keep = {str(t.get("id")) for t in tasks if t.get("id")}
+                    stale = [(rid,) for rid in stored if rid not in keep]
+                    self._conn.executemany("DELETE FROM tasks WHERE id = ?", stale)
+                    if self._cache is not None:
+                        changed = sum(
+                            1 for t in tasks
+                            if t.get("id") and stored.get(str(t["id"])) != json.dumps(t, sort_keys=True)
+                        )
+                        self._adapt_ttl(changed + len(stale), len(tasks))
+                    self._write_meta(_response_envelope(api_response), timestamp, validators)
+            except sqlite3.Error as e:
+                logger.warning("SQLite cache write failed: %s", e)
+                return self._set_tasks_in_memory(api_response, validators)
+
+            self._cache = _response_envelope(api_response)
+            self._timestamp = timestamp
+            self._validators = validators
+            self._last_updated = self._query_last_updated()
+            self._tasks_memo = None
+        logger.info("Cache updated: %d tasks stored", len(tasks))
+        annotate(tasks=len(tasks))
+
+    def touch(self, validators=None) -> bool:
+        """Mark the cache fresh again without touching any task row (see TaskCache.touch)."""
+        with self._db_lock:
+            if self._conn is None:
+                return super().touch(validators)
+            self.reload_if_changed()
+            if self._cache is None:
+                return False
+            timestamp = time.time()
+            merged = dict(self._validators or {}, **(validators or {})) or None
+            try:
+                count = self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+                self._adapt_ttl(0, count)
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [
+                            ("timestamp", repr(timestamp)),
+                            ("validators", json.dumps(merged)),
+                            ("ttl", json.dumps(self._ttl_state())),
+                        ],
+                    )
+            except sqlite3.Error as e:
+                logger.warning("SQLite cache touch failed: %s", e)
+                return False
+            self._timestamp = timestamp
+            self._validators = merged
+        logger.info("Cache revalidated: %d tasks unchanged", count)
+        return True
+
+    def upsert_tasks(self, tasks):
+        """Insert or update individual tasks (delta sync / local mutation)."""
+        tasks = [t for t in tasks or [] if isinstance(t, dict) and t.get("id")]
+        if not tasks:
+            return
+        with self._db_lock:
+            if self._conn is None or self._cache is None:
+                return super().upsert_tasks(tasks)
+            try:
+                with self._conn:
+                    row = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM tasks").fetchone()
+                    self._upsert_rows(tasks, start_position=row[0] + 1, reposition=False)
+                    self._conn.execute("DELETE FROM meta WHERE key = 'validators'")
+            except sqlite3.Error as e:
+                logger.warning("SQLite cache upsert failed: %s", e)
+                return
+            self._validators = None
+            self._last_updated = self._query_last_updated()
+            self._tasks_memo = None
+        logger.debug("Cache upserted %d tasks", len(tasks))
+
+    def remove_tasks(self, task_ids):
+        """Delete tasks by id (e.g. after closing them)."""
+        ids = [(str(i),) for i in task_ids or [] if i]
+        if not ids:
+            return
+        with self._db_lock:
+            if self._conn is None or self._cache is None:
+                return super().remove_tasks(task_ids)
+            try:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM tasks WHERE id = ?", ids)
+                    self._conn.execute("DELETE FROM meta WHERE key = 'validators'")
+            except sqlite3.Error as e:
+                logger.warning("SQLite cache delete failed: %s", e)
+                return
+            self._validators = None
+            self._tasks_memo = None
+        logger.debug("Cache removed %d tasks", len(ids))
+
+    @traced("cache.match")
+    def match_task_ids(self, query: str):
+        """
+        Return ids of tasks whose title+description contain every query word.
+
+        Words of 3+ characters use the FTS5 trigram index; shorter words are
+        checked on its candidates with the same str.lower() substring test as
+        search.filter_tasks (SQLite's LIKE only folds ASCII case, so "ü" would
+        not match "Über").
+        """
+        words = (query or "").lower().split()
+        if not words or self._conn is None:
+            return None
+
+        fts_words = [w for w in words if len(w) >= _MIN_FTS_WORD] if self._has_fts else []
+        short_words = [w for w in words if w not in fts_words]
+
+        sql = "SELECT id, title, description FROM tasks" if short_words else "SELECT id FROM tasks"
+        params = []
+        if fts_words:
+            sql += " WHERE rid IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)"
+            params.append(" AND ".join('"' + w.replace('"', '""') + '"' for w in fts_words))
+
+        try:
+            with self._db_lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.debug("SQLite search failed (%s); falling back to scan", e)
+            return None
+        if not short_words:
+            return {row[0] for row in rows}
+        return {
+            task_id for task_id, title, description in rows
+            if all(w in f"{title} {description}".lower() for w in short_words)
+        }
+
+    def get_tasks_in_container(self, container_kind: str | None, container_id: str):
+        """Tasks whose container id matches (case-insensitive), via the container index."""
+        sql = "SELECT data FROM tasks WHERE container_id = ?"
+        params = [(container_id or "").strip()]
+        if container_kind:
+            sql += " AND container_kind = ?"
+            params.append(container_kind)
+        with self._db_lock:
+            if self._conn is None or self._cache is None:
+                return super().get_tasks_in_container(container_kind, container_id)
+            return self._select_tasks(sql + " ORDER BY position", params)
+
+    def get_search_index(self):
+        """SQLite searches through FTS (see match_task_ids); no in-memory index."""
+        return None
+
+    def reload_if_changed(self) -> bool:
+        """Re-read cache metadata when another connection committed (PRAGMA data_version)."""
+        if self._conn is None:
+            return False
+        try:
+            with self._db_lock:
+                version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if version == self._data_version:
+                    return False
+                self._data_version = version
+                self._read_meta()
+                self._tasks_memo = None
+            return True
+        except sqlite3.Error as e:
+            logger.debug("SQLite cache reload failed: %s", e)
+            return False
+
+    # --- Storage ---
+
+    @traced("cache.load")
+    def _load_from_disk(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+                self._has_fts = True
+            except sqlite3.Error as e:
+                logger.info("SQLite FTS5 trigram unavailable (%s); search uses LIKE", e)
+
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._read_meta():
+                count = self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+                logger.info("Loaded SQLite cache: %d tasks", count)
+        except Exception as e:
+            logger.warning("Failed to open SQLite cache %s: %s", self.cache_path, e)
+            self._conn = None
+
+    def _read_meta(self) -> bool:
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if "timestamp" not in meta:
+            self._cache = None
+            self._timestamp = None
+            self._last_updated = None
+            self._validators = None
+            return False
+        self._cache = json.loads(meta.get("envelope") or '{"data": {}}')
+        self._timestamp = float(meta["timestamp"])
+        self._validators = json.loads(meta["validators"]) if meta.get("validators") else None
+        self._last_updated = self._query_last_updated()
+        if meta.get("ttl"):
+            self._restore_ttl_state(json.loads(meta["ttl"]))
+        return True
+
+    def _save_to_disk(self):
+        # Rows are written transactionally by set_tasks/upsert_tasks/remove_tasks.
+        pass
+
+    def _append_journal(self, record):
+        # SQLite commits row-level changes itself; there is no JSON journal.
+        pass
+
+    def _delete_from_disk(self):
+        if self._conn is None:
+            return
+        try:
+            with self._db_lock, self._conn:
+                self._conn.execute("DELETE FROM tasks")
+                self._conn.execute("DELETE FROM meta")
+            self._tasks_memo = None
+        except sqlite3.Error as e:
+            logger.debug("Failed to clear SQLite cache: %s", e)
+
+    def _set_tasks_in_memory(self, api_response, validators=None):
+        # Degraded mode when the database is unavailable: behave like TaskCache.
+        self._conn = None
+        self._tasks_memo = None
+        super().set_tasks(api_response, validators)
+
+    def _all_tasks(self):
+        with self._db_lock:
+            if self._conn is None:
+                return (self._cache or {}).get("data", {}).get("tasks", [])
+            if self._tasks_memo is None:
+                self._tasks_memo = self._select_tasks("SELECT data FROM tasks ORDER BY position", ())
+            return self._tasks_memo
+
+    def _select_tasks(self, sql, params):
+        # Callers check `self._conn is None` (degraded mode) under _db_lock first.
+        try:
+            with self._db_lock:
+                return [json.loads(data) for (data,) in self._conn.execute(sql, params)]
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache read failed: %s", e)
+            return []
+
+    def _upsert_rows(self, tasks, *, start_position: int, reposition: bool):
+        rows = []
+        for offset, task in enumerate(tasks):
+            task_id = task.get("id")
+            if not task_id:
+                continue
+            ref = get_task_list_ref(task)
+            rows.append((
+                str(task_id),
+                start_position + offset,
+                task.get("title") or "",
+                task.get("description") or "",
+                task.get("due") or None,
+                _priority_int(task.get("priority")),
+                ref.kind,
+                ref.list_id,
+                task.get("updated") or None,
+                json.dumps(task, sort_keys=True),
+                reposition,
+                reposition,
+            ))
+        self._conn.executemany(_UPSERT_SQL, rows)
+
+    def _write_meta(self, envelope, timestamp, validators=None):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [
+                ("envelope", json.dumps(envelope)),
+                ("timestamp", repr(timestamp)),
+                ("ttl", json.dumps(self._ttl_state())),
+                ("validators", json.dumps(validators)),
+            ],
+        )
+
+    def _query_last_updated(self):
+        row = self._conn.execute("SELECT MAX(updated) FROM tasks").fetchone()
+        return row[0] if row else None
@@ -0,0 +1,209 @@
+"""
+Sync Worker
+
+Runs all Morgen API work on a small set of worker threads fed from one
+priority queue, so a background refresh can never hold up a user action.
+
+Lanes, highest priority first:
+    INTERACTIVE_MUTATION   create / close triggered by the user
+    INTERACTIVE_FETCH      task list someone is waiting for
+    BACKGROUND_SYNC        scheduled prefetch
+    HOUSEKEEPING           anything that can wait indefinitely
+
+Queued work is always started lane by lane, so newly queued interactive work
+jumps ahead of every queued background job. Background lanes may only occupy
+`background_slots` threads at a time; the remaining threads stay free for
+interactive work. A job that is already running is never interrupted (its HTTP
+request is in flight), only queued work is overtaken.
+
+Jobs run in a copy of the submitter's context, so tracing spans opened inside
+a job nest under the span that queued it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE_MUTATION = 0
+INTERACTIVE_FETCH = 1
+BACKGROUND_SYNC = 2
+HOUSEKEEPING = 3
+
+LANE_NAMES = {
+    INTERACTIVE_MUTATION: "interactive_mutation",
+    INTERACTIVE_FETCH: "interactive_fetch",
+    BACKGROUND_SYNC: "background_sync",
+    HOUSEKEEPING: "housekeeping",
+}
+
+_DEFAULT_WORKERS = 4
+_DEFAULT_BACKGROUND_SLOTS = 1
+
+
+class SyncWorker:
+    """Prioritised executor for API calls."""
+
+    def __init__(self, workers: int = _DEFAULT_WORKERS, background_slots: int = _DEFAULT_BACKGROUND_SLOTS, clock=time.monotonic):
+        """
+        Args:
+            workers: Threads executing jobs.
+            background_slots: Max threads busy with BACKGROUND_SYNC / HOUSEKEEPING jobs
+                (kept below `workers` so interactive work always finds a free thread).
+        """
+        self.workers = max(1, workers)
+        self.background_slots = max(1, min(background_slots, self.workers - 1 or 1))
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: list = []  # heap of (lane, seq, job)
+        self._seq = itertools.count()
+        self._keyed: dict = {}  # (lane, key) -> queued job
+        self._running = {lane: 0 for lane in LANE_NAMES}
+        self._completed = {lane: 0 for lane in LANE_NAMES}
+        self._max_wait = {lane: 0.0 for lane in LANE_NAMES}
+        self._threads: list[threading.Thread] = []
+        self._stopped = False
+        self._local = threading.local()
+
+    def start(self):
+        with self._cond:
+            if self._threads:
+                return
+            self._stopped = False
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"morgen-sync-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        """Stop the threads once their current job is done; queued jobs are cancelled."""
+        with self._cond:
+            self._stopped = True
+            pending = [job for _lane, _seq, job in self._queue]
+            self._queue.clear()
+            self._keyed.clear()
+            threads, self._threads = self._threads, []
+            self._cond.notify_all()
+        for job in pending:
+            job["future"].cancel()
+        for t in threads:
+            t.join(5)
+
+    # --- Submitting ---
+
+    def submit(self, lane: int, fn, key=None) -> Future:
+        """
+        Queue `fn()` in `lane`; returns a Future for its result.
+
+        With a `key`, a job already queued (not yet running) in the same lane
+        under that key is reused instead of queueing a duplicate.
+        """
+        if lane not in LANE_NAMES:
+            raise ValueError(f"Unknown lane: {lane}")
+        with self._cond:
+            if key is not None:
+                queued = self._keyed.get((lane, key))
+                if queued is not None:
+                    return queued["future"]
+            if self._stopped or not self._threads:
+                raise RuntimeError("Sync worker is not running")
+            job = {
+                "fn": fn,
+                "future": Future(),
+                "key": key,
+                "queued_at": self._clock(),
+                "context": contextvars.copy_context(),
+            }
+            heapq.heappush(self._queue, (lane, next(self._seq), job))
+            if key is not None:
+                self._keyed[(lane, key)] = job
+            self._cond.notify_all()
+        return job["future"]
+
+    def call(self, lane: int, fn, key=None, timeout: float | None = None):
+        """
+        Run `fn()` in `lane` and wait for its result (exceptions propagate).
+
+        Called from a worker thread (a job calling the API again) it runs inline,
+        so jobs never wait on the queue they are blocking.
+        """
+        if getattr(self._local, "in_worker", False):
+            return fn()
+        return self.submit(lane, fn, key=key).result(timeout)
+
+    # --- Metrics ---
+
+    def queue_depths(self) -> dict:
+        """Queued (not yet running) jobs per lane name."""
+        with self._cond:
+            depths = {name: 0 for name in LANE_NAMES.values()}
+            for lane, _seq, _job in self._queue:
+                depths[LANE_NAMES[lane]] += 1
+            return depths
+
+    def stats(self) -> dict:
+        """{"queued": {...}, "running": {...}, "completed": {...}, "max_wait": {...}} per lane name."""
+        depths = self.queue_depths()
+        with self._cond:
+            return {
+                "queued": depths,
+                "running": {LANE_NAMES[lane]: n for lane, n in self._running.items()},
+                "completed": {LANE_NAMES[lane]: n for lane, n in self._completed.items()},
+                "max_wait": {LANE_NAMES[lane]: round(s, 3) for lane, s in self._max_wait.items()},
+            }
+
+    # --- Workers ---
+
+    def _next_job_locked(self):
+        """Highest-priority runnable job, or None (background lanes may be capped)."""
+        if not self._queue:
+            return None
+        lane, _seq, job = self._queue[0]
+        if lane >= BACKGROUND_SYNC:
+            busy = self._running[BACKGROUND_SYNC] + self._running[HOUSEKEEPING]
+            if busy >= self.background_slots:
+                return None
+        heapq.heappop(self._queue)
+        if job["key"] is not None:
+            self._keyed.pop((lane, job["key"]), None)
+        return lane, job
+
+    def _worker(self):
+        self._local.in_worker = True
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    picked = self._next_job_locked()
+                    if picked is not None:
+                        break
+                    self._cond.wait()
+                lane, job = picked
+                self._running[lane] += 1
+                waited = self._clock() - job["queued_at"]
+                self._max_wait[lane] = max(self._max_wait[lane], waited)
+
+            future = job["future"]
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(job["context"].run(job["fn"]))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running[lane] -= 1
+                    self._completed[lane] += 1
+                    self._cond.notify_all()
+            if waited > 1.0:
+                logger.info("Sync job waited %.1fs in %s", waited, LANE_NAMES[lane])
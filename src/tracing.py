@@ -0,0 +1,214 @@
+"""
+Tracing
+
+Nested timing spans with attributes, kept in in-memory ring buffers.
+
+    with span("on_event", query_len=len(query)) as s:
+        with span("get_tasks") as t:
+            ...
+            t.set(tasks=len(tasks), cache_status=status)
+
+A span opened while another is active (in the same thread, or in a job
+started from it: SyncWorker and BackgroundRenderer carry the context over)
+becomes its child. Root spans are pushed to the tracer's ring buffer for
+their name when they finish, and logged at DEBUG level as one line per trace.
+Each root name keeps its own last `capacity` traces, so background roots
+(prefetch, outbox replays, sync jobs) never push out the keystroke traces.
+
+Disabled (MORGEN_TRACING=0 in the environment, or `tracer.enabled = False`),
+`span()` returns a shared no-op object: one attribute check per call, no
+clock read, nothing recorded.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CAPACITY = 64
+
+_current = contextvars.ContextVar("morgen_current_span", default=None)
+
+
+class Span:
+    """One timed operation; `children` are the spans started inside it."""
+
+    __slots__ = ("name", "attrs", "start", "end", "children", "parent", "_tracer", "_token")
+
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.end = None
+        self.children: list[Span] = []
+        self.parent = None
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.start is None or self.end is None:
+            return None
+        return (self.end - self.start) * 1000
+
+    def set(self, **attrs):
+        """Add or update attributes (e.g. counts only known at the end)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.parent = _current.get()
+        if self.parent is not None:
+            self.parent.children.append(self)
+        self._token = _current.set(self)
+        self.start = self._tracer._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = self._tracer._clock()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            _current.set(self.parent)  # exited in another context than it was entered
+        if self.parent is None:
+            self._tracer._finish(self)
+        return False
+
+    def to_dict(self) -> dict:
+        duration = self.duration_ms
+        return {
+            "name": self.name,
+            "ms": round(duration, 3) if duration is not None else None,
+            "attrs": dict(self.attrs),
+            "children": [child.to_dict() for child in list(self.children)],
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """Creates spans and keeps the last `capacity` finished traces per root span name."""
+
+    def __init__(self, capacity: int = _DEFAULT_CAPACITY, enabled: bool = True, clock=time.perf_counter):
+        self.enabled = enabled
+        self._clock = clock
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._traces: dict[str, deque] = {}
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, attrs)
+
+    def traces(self, name: str | None = None) -> list[Span]:
+        """Finished root spans, oldest first (only those called `name`, if given)."""
+        with self._lock:
+            if name is not None:
+                return list(self._traces.get(name, ()))
+            traces = [t for ring in self._traces.values() for t in ring]
+        return sorted(traces, key=lambda t: t.start)
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+    def aggregate(self) -> dict:
+        """{span name: {"count", "total_ms", "max_ms"}} over every span in the buffer."""
+        totals: dict[str, dict] = {}
+        stack = self.traces()
+        while stack:
+            s = stack.pop()
+            stack.extend(s.children)
+            duration = s.duration_ms
+            if duration is None:
+                continue
+            entry = totals.setdefault(s.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += duration
+            entry["max_ms"] = max(entry["max_ms"], duration)
+        for entry in totals.values():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+        return totals
+
+    def _finish(self, root: Span):
+        with self._lock:
+            ring = self._traces.get(root.name)
+            if ring is None:
+                ring = self._traces[root.name] = deque(maxlen=self.capacity)
+            ring.append(root)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TRACE %s", format_trace(root, max_depth=2))
+
+
+def format_trace(root: Span, max_depth: int | None = None) -> str:
+    """One line, e.g. "on_event 4.1ms [query_len=3] { get_tasks 0.2ms, filter 1.3ms [matched=12] }"."""
+    def fmt(s: Span, depth: int) -> str:
+        duration = s.duration_ms
+        text = f"{s.name} {duration:.1f}ms" if duration is not None else f"{s.name} (running)"
+        if s.attrs:
+            text += " [" + " ".join(f"{k}={v}" for k, v in s.attrs.items()) + "]"
+        children = list(s.children)
+        if children and (max_depth is None or depth < max_depth):
+            text += " { " + ", ".join(fmt(c, depth + 1) for c in children) + " }"
+        return text
+
+    return fmt(root, 1)
+
+
+tracer = Tracer(enabled=os.environ.get("MORGEN_TRACING", "1") != "0")
+
+
+def span(name: str, **attrs):
+    """`tracer.span(...)` on the shared tracer."""
+    return tracer.span(name, **attrs)
+
+
+def traced(name: str):
+    """Decorator running the function inside `span(name)`; add attributes via current_span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_span():
+    """The innermost active span in this context, or None."""
+    return _current.get()
+
+
+def annotate(**attrs):
+    """Set attributes on the innermost active span, if any."""
+    active = _current.get()
+    if active is not None:
+        active.attrs.update(attrs)
@@ -0,0 +1,92 @@
+"""
+Test setup shared by every module.
+
+main.py imports Ulauncher's API at module level, but Ulauncher is a desktop
+application and is rarely importable from a development virtualenv. When it
+is missing, a minimal stand-in with the names main.py imports is registered
+so tests/test_main.py runs everywhere; the real package is used when present.
+"""
+
+import importlib.util
+import sys
+import types
+
+
+class _Extension:
+    def __init__(self):
+        self.preferences = {}
+
+    def subscribe(self, event_type, listener):
+        pass
+
+    def run(self):
+        pass
+
+
+class _EventListener:
+    pass
+
+
+class _Event:
+    pass
+
+
+class _Item:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _RenderResultListAction:
+    def __init__(self, result_list):
+        self.result_list = result_list
+
+
+class _HideWindowAction:
+    pass
+
+
+class _ExtensionCustomAction:
+    def __init__(self, data, keep_app_open=False):
+        self.data = data
+        self.keep_app_open = keep_app_open
+
+
+class _CopyToClipboardAction:
+    def __init__(self, text):
+        self.text = text
+
+
+_STUB_MODULES = {
+    "ulauncher.api.client.Extension": {"Extension": _Extension},
+    "ulauncher.api.client.EventListener": {"EventListener": _EventListener},
+    "ulauncher.api.shared.event": {
+        "KeywordQueryEvent": type("KeywordQueryEvent", (_Event,), {}),
+        "ItemEnterEvent": type("ItemEnterEvent", (_Event,), {}),
+    },
+    "ulauncher.api.shared.item.ExtensionResultItem": {"ExtensionResultItem": type("ExtensionResultItem", (_Item,), {})},
+    "ulauncher.api.shared.item.ExtensionSmallResultItem": {
+        "ExtensionSmallResultItem": type("ExtensionSmallResultItem", (_Item,), {})
+    },
+    "ulauncher.api.shared.action.RenderResultListAction": {"RenderResultListAction": _RenderResultListAction},
+    "ulauncher.api.shared.action.HideWindowAction": {"HideWindowAction": _HideWindowAction},
+    "ulauncher.api.shared.action.ExtensionCustomAction": {"ExtensionCustomAction": _ExtensionCustomAction},
+    "ulauncher.api.shared.action.CopyToClipboardAction": {"CopyToClipboardAction": _CopyToClipboardAction},
+}
+
+
+def _install_ulauncher_stub():
+    for name, attrs in _STUB_MODULES.items():
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            module_name = ".".join(parts[:i])
+            if module_name not in sys.modules:
+                module = types.ModuleType(module_name)
+                module.__path__ = []  # a package, so submodules resolve
+                sys.modules[module_name] = module
+                if i > 1:
+                    setattr(sys.modules[".".join(parts[:i - 1])], parts[i - 1], module)
+        vars(sys.modules[name]).update(attrs)
+
+
+if importlib.util.find_spec("ulauncher") is None:
+    _install_ulauncher_stub()
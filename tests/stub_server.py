@@ -0,0 +1,374 @@
+"""
+Morgen API Stand-in
+
+A local HTTP server implementing the parts of the Morgen API v3 the
+extension uses, with in-memory state, so MorgenAPIClient (and the caching
+and retry logic above it) can be exercised end to end without the network.
+
+Endpoints:
+    GET  /v3/tasks/list?limit=&updatedAfter=   (ETag / If-None-Match, gzip)
+    POST /v3/tasks/create   {"title": ..., ...}  -> 201 {"data": {"id": ...}}
+    POST /v3/tasks/close    {"id": ...}          -> 204 (404 for unknown ids)
+
+Anything else is a 404, like a container endpoint the account lacks.
+
+Conditions are configurable: `latency` + `jitter` per request, a point
+budget with RateLimit-* headers and 429 + Retry-After once it is spent, and
+faults that are either queued (`inject("503")` fails the next request) or
+random (`fault_rates={"timeout": 0.1}`, seeded). Fault kinds:
+    "429", "500", "502", "503"  that status (429 with Retry-After)
+    "timeout"                   hold the request, then drop it unanswered
+    "reset"                     drop the connection without a response
+
+Usage in tests:
+    with StubMorgenServer(make_tasks(500)) as server:
+        client = MorgenAPIClient(server.api_key, base_url=server.base_url)
+
+Standalone (for benchmarks or manual runs):
+    python tests/stub_server.py --tasks 100000 --latency 0.05 --jitter 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.dataset import format_timestamp, make_tasks  # noqa: E402  (make_tasks re-exported for tests)
+
+DEFAULT_API_KEY = "stub-api-key"
+# Morgen's documented costs; everything else is 1 point.
+_COSTS = {"/tasks/list": 10}
+_STATUS_FAULTS = {"429": 429, "500": 500, "502": 502, "503": 503}
+_FAULT_KINDS = set(_STATUS_FAULTS) | {"timeout", "reset"}
+
+
+class StubMorgenServer:
+    """In-memory Morgen API on 127.0.0.1, served from a background thread."""
+
+    def __init__(
+        self,
+        tasks=(),
+        *,
+        api_key: str = DEFAULT_API_KEY,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        fault_rates: dict | None = None,
+        rate_limit: int | None = None,
+        rate_window: float = 900.0,
+        timeout_hold: float = 30.0,
+        max_limit: int = 100,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        clock=time.time,
+    ):
+        """
+        Args:
+            tasks: Initial tasks (e.g. make_tasks(n)); copied.
+            latency / jitter: Seconds added to every request (jitter is uniform 0..jitter).
+            fault_rates: {kind: probability} of a random fault per request.
+            rate_limit: Points per `rate_window`; None disables rate limiting.
+            timeout_hold: Seconds a "timeout" fault holds the request before dropping it.
+            max_limit: Largest `limit` honoured by /tasks/list (the real API caps at 100).
+        """
+        unknown = set(fault_rates or {}) - _FAULT_KINDS
+        if unknown:
+            raise ValueError(f"Unknown fault kinds: {sorted(unknown)}")
+        self.api_key = api_key
+        self.latency = latency
+        self.jitter = jitter
+        self.fault_rates = dict(fault_rates or {})
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.timeout_hold = timeout_hold
+        self.max_limit = max_limit
+        self.requests: list[dict] = []  # {"method", "path", "status"} per request answered
+        self._clock = clock
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tasks = {t["id"]: dict(t) for t in tasks}
+        self._ids = itertools.count(len(self._tasks))
+        self._faults: list[str] = []
+        self._spends: list[tuple[float, int]] = []  # (timestamp, points)
+        self._stopping = threading.Event()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    # --- Lifecycle ---
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="morgen-stub", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()  # releases held "timeout" requests
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    # --- Test controls ---
+
+    def inject(self, kind: str, count: int = 1):
+        """Fail the next `count` requests with `kind` (queued faults run before random ones)."""
+        if kind not in _FAULT_KINDS:
+            raise ValueError(f"Unknown fault kind: {kind}")
+        with self._lock:
+            self._faults.extend([kind] * count)
+
+    def tasks(self) -> list[dict]:
+        with self._lock:
+            return [dict(t) for t in self._tasks.values()]
+
+    def update_task(self, task_id: str, **fields):
+        """Change a task server-side (as another device would), bumping `updated`."""
+        with self._lock:
+            task = self._tasks[task_id]
+            task.update(fields)
+            task["updated"] = self._now_stamp()
+
+    def delete_task(self, task_id: str):
+        with self._lock:
+            self._tasks.pop(task_id, None)
+
+    def count(self, path: str | None = None, status: int | None = None) -> int:
+        """Requests answered, optionally only those for `path` and/or with `status`."""
+        with self._lock:
+            return sum(
+                1 for r in self.requests
+                if (path is None or r["path"] == path) and (status is None or r["status"] == status)
+            )
+
+    # --- Request handling (called from handler threads) ---
+
+    def _next_fault(self):
+        with self._lock:
+            if self._faults:
+                return self._faults.pop(0)
+            for kind, rate in self.fault_rates.items():
+                if self._rng.random() < rate:
+                    return kind
+            return None
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _spend(self, path: str):
+        """Charge the call; returns (headers, retry_after) with retry_after set when over budget."""
+        if self.rate_limit is None:
+            return {}, None
+        now = self._clock()
+        cost = _COSTS.get(path, 1)
+        with self._lock:
+            self._spends = [(t, c) for t, c in self._spends if now - t < self.rate_window]
+            used = sum(c for _, c in self._spends)
+            reset = self._spends[0][0] + self.rate_window - now if self._spends else self.rate_window
+            if used + cost > self.rate_limit:
+                headers = {"RateLimit-Limit": self.rate_limit, "RateLimit-Remaining": max(0, self.rate_limit - used)}
+                return headers, max(1, int(reset + 0.999))
+            self._spends.append((now, cost))
+            remaining = self.rate_limit - used - cost
+        return {
+            "RateLimit-Limit": self.rate_limit,
+            "RateLimit-Remaining": remaining,
+            "RateLimit-Reset": max(1, int(reset + 0.999)),
+        }, None
+
+    def _now_stamp(self) -> str:
+        return format_timestamp(self._clock())
+
+    def _list(self, query: dict):
+        try:
+            limit = int(query.get("limit", ["100"])[0])
+        except ValueError:
+            return 400, {"message": "limit must be an integer"}
+        limit = max(1, min(limit, self.max_limit))
+        updated_after = query.get("updatedAfter", [None])[0]
+        with self._lock:
+            tasks = list(self._tasks.values())
+            if updated_after:
+                tasks = [t for t in tasks if t.get("updated", "") > updated_after]
+            tasks = [dict(t) for t in tasks[:limit]]
+        return 200, {"data": {"tasks": tasks, "labelDefs": [], "spaces": []}}
+
+    def _create(self, body: dict):
+        title = body.get("title")
+        if not isinstance(title, str) or not title.strip():
+            return 400, {"message": "title is required"}
+        with self._lock:
+            task_id = f"task-{next(self._ids):06d}"
+            while task_id in self._tasks:
+                task_id = f"task-{next(self._ids):06d}"
+            stamp = self._now_stamp()
+            task = {k: v for k, v in body.items() if k in ("title", "description", "due", "timeZone", "priority")}
+            task.update(id=task_id, progress="needs-action", created=stamp, updated=stamp)
+            self._tasks[task_id] = task
+        return 201, {"data": {"id": task_id}}
+
+    def _close(self, body: dict):
+        with self._lock:
+            task = self._tasks.get(str(body.get("id") or ""))
+            if task is None:
+                return 404, {"message": "task not found"}
+            task["progress"] = "completed"
+            task["updated"] = self._now_stamp()
+        return 204, None
+
+    def _route(self, method: str, path: str, query: dict, body):
+        if method == "GET" and path == "/tasks/list":
+            return self._list(query)
+        if method == "POST" and path in ("/tasks/create", "/tasks/close"):
+            if not isinstance(body, dict):
+                return 400, {"message": "invalid JSON body"}
+            return self._create(body) if path == "/tasks/create" else self._close(body)
+        return 404, {"message": "not found"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        stub = self.server.stub
+        parsed = urllib.parse.urlsplit(self.path)
+        path = parsed.path[3:] if parsed.path.startswith("/v3/") else parsed.path
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+
+        delay = stub._delay()
+        if delay:
+            time.sleep(delay)
+
+        fault = stub._next_fault()
+        if fault in ("timeout", "reset"):
+            if fault == "timeout":
+                stub._stopping.wait(stub.timeout_hold)
+            self._record(method, path, fault)
+            self.close_connection = True
+            return
+        if fault is not None:
+            status = _STATUS_FAULTS[fault]
+            headers = {"Retry-After": 1} if status == 429 else {}
+            return self._reply(method, path, status, {"message": f"injected {fault}"}, headers)
+
+        if self.headers.get("Authorization") != f"ApiKey {stub.api_key}":
+            return self._reply(method, path, 401, {"message": "Unauthorized"})
+
+        rate_headers, retry_after = stub._spend(path)
+        if retry_after is not None:
+            return self._reply(method, path, 429, {"message": "Too many requests"}, {**rate_headers, "Retry-After": retry_after})
+
+        status, payload = stub._route(method, path, urllib.parse.parse_qs(parsed.query), body)
+        self._reply(method, path, status, payload, rate_headers)
+
+    def _reply(self, method, path, status, payload, headers=None):
+        raw = json.dumps(payload).encode() if payload is not None else b""
+        headers = dict(headers or {})
+        if status == 200 and raw:
+            etag = '"%s"' % hashlib.blake2b(raw, digest_size=8).hexdigest()
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, raw = 304, b""
+        if raw and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            raw = gzip.compress(raw, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+
+        self._record(method, path, status)  # before replying, so clients see it recorded
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, str(value))
+        if raw:
+            self.send_header("Content-Type", "application/json")
+        if status not in (204, 304):
+            self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        if raw:
+            self.wfile.write(raw)
+
+    def _record(self, method, path, status):
+        stub = self.server.stub
+        with stub._lock:
+            stub.requests.append({"method": method, "path": path, "status": status})
+
+    def log_message(self, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Morgen API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tasks", type=int, default=1000, help="synthetic tasks to serve")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds (0..jitter)")
+    parser.add_argument("--rate-limit", type=int, default=None, help="points per 15 minutes")
+    parser.add_argument("--fault", action="append", default=[], metavar="KIND=RATE",
+                        help="random fault rate, e.g. 503=0.05 or timeout=0.01")
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    args = parser.parse_args(argv)
+
+    fault_rates = {}
+    for spec in args.fault:
+        kind, _, rate = spec.partition("=")
+        fault_rates[kind] = float(rate or 1)
+
+    server = StubMorgenServer(
+        make_tasks(args.tasks, seed=args.seed),
+        api_key=args.api_key,
+        latency=args.latency,
+        jitter=args.jitter,
+        fault_rates=fault_rates,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+        port=args.port,
+    )
+    print(f"Serving {args.tasks} tasks at {server.base_url} (API key: {args.api_key})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from background import BackgroundRenderer
+
+
+def test_fast_render_is_returned_inline():
+    sent = []
+    r = BackgroundRenderer(lambda e, items: sent.append((e, items)), grace=1.0)
+    event = object()
+    r.mark_current(event)
+
+    assert r.run(event, lambda: ["a"]) == ["a"]
+    assert sent == []
+
+
+def test_slow_render_is_pushed_when_still_current():
+    pushed = threading.Event()
+    sent = []
+
+    def send(event, items):
+        sent.append((event, items))
+        pushed.set()
+
+    release = threading.Event()
+    r = BackgroundRenderer(send, grace=0.01)
+    event = object()
+    r.mark_current(event)
+
+    def build():
+        release.wait(5)
+        return ["done"]
+
+    assert r.run(event, build) is None
+    release.set()
+    assert pushed.wait(5)
+    assert sent == [(event, ["done"])]
+
+
+def test_result_for_outdated_query_is_dropped():
+    sent = []
+    release = threading.Event()
+    finished = threading.Event()
+    r = BackgroundRenderer(lambda e, items: sent.append(items), grace=0.01)
+    old, new = object(), object()
+    r.mark_current(old)
+
+    def build():
+        release.wait(5)
+        finished.set()
+        return ["old"]
+
+    assert r.run(old, build) is None
+    r.mark_current(new)
+    release.set()
+    assert finished.wait(5)
+    threading.Event().wait(0.05)
+    assert sent == []
+
+
+def test_remarking_the_same_event_supersedes_its_earlier_render():
+    sent = []
+    release = threading.Event()
+    finished = threading.Event()
+    r = BackgroundRenderer(lambda e, items: sent.append(items), grace=0.01)
+    event = object()
+    first = r.mark_current(event)
+
+    def build():
+        release.wait(5)
+        r.ensure_current()
+        finished.set()
+        return ["first"]
+
+    assert r.run(event, build) is None
+    assert r.mark_current(event) == first + 1  # the same event object, marked again
+    release.set()
+    for _ in range(100):
+        if r.cancelled:
+            break
+        threading.Event().wait(0.01)
+    assert r.cancelled == 1
+    assert not finished.is_set()
+    assert sent == []
+
+
+def test_without_send_renders_inline():
+    r = BackgroundRenderer(None, grace=0)
+    assert r.run(object(), lambda: ["x"]) == ["x"]
+
+
+def test_superseded_worker_stops_at_checkpoint():
+    sent = []
+    release = threading.Event()
+    reached = []
+    r = BackgroundRenderer(lambda e, items: sent.append(items), grace=0.01)
+    old = object()
+    r.mark_current(old)
+
+    def build():
+        release.wait(5)
+        r.ensure_current()
+        reached.append("render")
+        return ["old"]
+
+    assert r.run(old, build) is None
+    r.mark_current(object())
+    release.set()
+    for _ in range(100):
+        if r.cancelled:
+            break
+        threading.Event().wait(0.01)
+    assert r.cancelled == 1
+    assert reached == []
+    assert sent == []
+
+
+def test_shared_fetch_runs_once_for_concurrent_queries():
+    r = BackgroundRenderer(None)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "tasks"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(r.shared("k", fetch)))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=lambda: results.append(r.shared("k", fetch)))
+    second.start()
+    for _ in range(100):
+        if r._flights.coalesced:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert results == ["tasks", "tasks"]
+    assert calls == [1]
@@ -0,0 +1,96 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from benchmarks import run
+from benchmarks.dataset import make_tasks
+from task_lists import get_task_list_ref
+
+
+def test_dataset_is_seeded_and_mixed():
+    tasks = make_tasks(2000, seed=7)
+    assert tasks == make_tasks(2000, seed=7)
+    assert tasks != make_tasks(2000, seed=8)
+
+    kinds = {get_task_list_ref(t).kind for t in tasks}
+    assert kinds == {"list", "project", "space", None}
+    with_due = sum(1 for t in tasks if t.get("due"))
+    assert 0.5 < with_due / len(tasks) < 0.7
+    assert all(len(t["due"]) == 19 for t in tasks if t.get("due"))
+    assert any(t.get("description") for t in tasks)
+
+
+def test_suite_runs_every_case():
+    results = run.run_suite(sizes=[50], min_runs=1, max_runs=1, budget=0, repeats=1, log=lambda line: None)
+    expected = {name if not sized else f"{name}[50]" for name, (_setup, sized) in run.CASES.items()}
+    assert set(results) == expected
+    assert all(r["runs"] == 1 and r["median_ms"] >= 0 for r in results.values())
+
+
+def test_summary_and_regression_check():
+    summary = run.summarize([0.004, 0.001, 0.002, 0.003])
+    assert summary == {"median_ms": 2.5, "p95_ms": 4.0, "runs": 4}
+
+    baseline = {"a": {"median_ms": 10.0}, "b": {"median_ms": 0.01}, "c": {"median_ms": 10.0}}
+    results = {
+        "a": {"median_ms": 14.0},   # +40%
+        "b": {"median_ms": 0.03},   # 3x, but only 0.02 ms
+        "c": {"median_ms": 12.0},   # within tolerance
+        "d": {"median_ms": 99.0},   # no baseline yet
+    }
+    assert run.compare(results, baseline, tolerance=0.3) == ["a"]
+
+
+def test_sub_millisecond_cases_get_more_headroom_and_use_best_round():
+    baseline = {"parse": {"median_ms": 0.107}, "filter": {"median_ms": 0.5}}
+    assert run.compare({"parse": {"median_ms": 0.155}, "filter": {"median_ms": 0.7}}, baseline) == []
+    assert run.compare({"parse": {"median_ms": 0.17}, "filter": {"median_ms": 0.8}}, baseline) == ["parse", "filter"]
+
+    # One noisy round does not move the reported median.
+    summary = run.summarize([0.001, 0.001, 0.001, 0.009, 0.009, 0.009], rounds=[[0.001] * 3, [0.009] * 3])
+    assert summary["median_ms"] == 1.0
+    assert summary["runs"] == 6
+
+
+def test_relative_timing_absorbs_a_slower_machine():
+    # Same code on a machine running 1.6x slower overall: the calibration loop slowed down too.
+    baseline = {"format": run.summarize([0.007] * 5, rounds=[[0.007] * 5], calibrations=[0.0075])}
+    slower = {"format": run.summarize([0.0112] * 5, rounds=[[0.0112] * 5], calibrations=[0.012])}
+    assert slower["format"]["relative"] == baseline["format"]["relative"] == pytest.approx(0.9333, abs=1e-3)
+    assert run.compare(slower, baseline) == []
+
+    # The code itself got slower.
+    regressed = {"format": run.summarize([0.0112] * 5, rounds=[[0.0112] * 5], calibrations=[0.0075])}
+    assert run.compare(regressed, baseline) == ["format"]
+
+
+def test_checked_in_baseline_covers_the_default_suite():
+    payload = json.loads(run.DEFAULT_BASELINE.read_text())
+    expected = {
+        name if not sized else f"{name}[{size}]"
+        for name, (_setup, sized) in run.CASES.items()
+        for size in run.DEFAULT_SIZES
+    }
+    assert set(payload["results"]) == expected
+    assert payload["meta"]["seed"] == run.DEFAULT_SEED
+
+
+def test_replay_sessions_type_from_the_previous_text():
+    from benchmarks.replay import parse_sessions, route
+
+    sessions = parse_sessions("# comment\n> mg ab\nmg a\n> mg ac\n\n\n> mgn x\n")
+    assert sessions == [
+        ["m", "mg", "mg ", "mg a", "mg ab", "mg a", "mg ac"],
+        ["m", "mg", "mgn", "mgn ", "mgn x"],
+    ]
+
+    keywords = ["mg", "mgn"]
+    assert route("mg", keywords) is None
+    event = route("mg ", keywords)
+    assert (event.get_keyword(), event.get_argument()) == ("mg", None)
+    event = route("mgn x", keywords)
+    assert (event.get_keyword(), event.get_argument()) == ("mgn", "x")
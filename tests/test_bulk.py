@@ -0,0 +1,106 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import bulk
+from bulk import BulkRunner
+
+# The exception class exactly as the bulk module imported it.
+MorgenRateLimitError = bulk.MorgenRateLimitError
+
+
+def test_runs_items_concurrently_and_keeps_order():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def fn(item):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        if item == "bad":
+            raise ValueError("nope")
+        return item.upper()
+
+    results = BulkRunner(max_workers=3).run(["a", "b", "bad", "c", "d", "e"], fn)
+
+    assert [r.item for r in results] == ["a", "b", "bad", "c", "d", "e"]
+    assert [r.value for r in results if r.ok] == ["A", "B", "C", "D", "E"]
+    assert isinstance(results[2].error, ValueError)
+    assert 1 < state["peak"] <= 3
+
+
+def test_rate_limit_halves_concurrency_and_retries_short_waits():
+    sleeps = []
+    calls = []
+    lock = threading.Lock()
+
+    def fn(item):
+        with lock:
+            calls.append(item)
+            first_b = item == "b" and calls.count("b") == 1
+        if first_b:
+            raise MorgenRateLimitError("slow down", retry_after=0.01)
+        return item
+
+    runner = BulkRunner(max_workers=4, max_wait=1.0, sleep=sleeps.append)
+    results = runner.run(["a", "b", "c"], fn)
+
+    assert all(r.ok for r in results)
+    assert calls.count("b") == 2
+
+
+def test_long_retry_after_is_reported_not_waited():
+    def fn(item):
+        raise MorgenRateLimitError("blocked", retry_after=120)
+
+    results = BulkRunner(max_workers=2, max_wait=5.0, sleep=lambda s: None).run(["a", "b"], fn)
+    assert [type(r.error) for r in results] == [MorgenRateLimitError, MorgenRateLimitError]
+
+
+def test_arun_bounds_concurrency_and_keeps_order():
+    state = {"active": 0, "peak": 0}
+
+    async def fn(item):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        if item == "bad":
+            raise ValueError("nope")
+        return item.upper()
+
+    results = asyncio.run(BulkRunner(max_workers=3).arun(["a", "b", "bad", "c", "d", "e"], fn))
+
+    assert [r.value for r in results if r.ok] == ["A", "B", "C", "D", "E"]
+    assert isinstance(results[2].error, ValueError)
+    assert state["peak"] == 3
+
+
+def test_arun_halves_concurrency_on_rate_limits():
+    sleeps = []
+    calls = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    async def fn(item):
+        calls.append(item)
+        if item == "b" and calls.count("b") == 1:
+            raise MorgenRateLimitError("slow down", retry_after=0.5)
+        if item == "c":
+            raise MorgenRateLimitError("blocked", retry_after=120)
+        return item
+
+    runner = BulkRunner(max_workers=4, max_wait=1.0, async_sleep=fake_sleep)
+    results = asyncio.run(runner.arun(["a", "b", "c"], fn))
+
+    assert [r.ok for r in results] == [True, True, False]
+    assert calls.count("b") == 2
+    assert sleeps and max(sleeps) <= 0.5
@@ -0,0 +1,237 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cache import TaskCache
+
+
+def _response(n, **overrides):
+    tasks = []
+    for i in range(n):
+        task = {"id": f"t{i}", "title": f"Task {i}", "description": "x" * 200, "updated": f"2026-02-01T00:00:{i % 60:02d}Z"}
+        task.update(overrides.get(f"t{i}", {}))
+        tasks.append(task)
+    return {"data": {"tasks": tasks}}
+
+
+def _ids(cache):
+    return [t["id"] for t in cache.get_full_response()["data"]["tasks"]]
+
+
+def test_set_tasks_appends_only_changed_tasks_to_journal(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path))
+    c.set_tasks(_response(200))
+    snapshot_size = path.stat().st_size
+    assert c.get_journal_size() == 0
+
+    c.set_tasks(_response(200, t5={"title": "Renamed"}))
+
+    assert path.stat().st_size == snapshot_size  # base untouched
+    lines = Path(str(path) + ".journal").read_text().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert [t["id"] for t in record["upsert"]] == ["t5"]
+    assert c.get_journal_size() < snapshot_size / 20
+
+
+def test_journal_replays_upserts_deletes_and_order_on_load(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path))
+    c.set_tasks(_response(4))
+
+    reordered = _response(4)
+    reordered["data"]["tasks"] = [reordered["data"]["tasks"][i] for i in (2, 0, 3)]
+    reordered["data"]["lists"] = [{"id": "l1", "name": "Inbox"}]
+    c.set_tasks(reordered)
+    c.upsert_tasks([{"id": "t9", "title": "Local"}])
+    c.remove_tasks(["t0"])
+
+    reloaded = TaskCache(ttl=600, cache_path=str(path))
+    assert _ids(reloaded) == ["t2", "t3", "t9"]
+    assert reloaded.get_container_name_maps()["list"]["l1"] == "Inbox"
+    assert reloaded.get_search_index()["t9"] == ("local", "")
+    assert reloaded.is_fresh()
+
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path))
+    c.set_tasks(_response(2))
+    c.remove_tasks(["t1"])
+    with open(str(path) + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"delete": ["t0"')  # crashed mid-write
+
+    reloaded = TaskCache(ttl=600, cache_path=str(path))
+    assert _ids(reloaded) == ["t0"]
+    reloaded.upsert_tasks([{"id": "t5", "title": "After crash"}])
+    assert _ids(TaskCache(ttl=600, cache_path=str(path))) == ["t0", "t5"]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path), journal_max_bytes=10**9)
+    c.set_tasks(_response(3))
+    for i in range(5):
+        c.upsert_tasks([{"id": f"n{i}", "title": f"New {i}"}])
+    assert c.get_journal_size() > 0
+
+    c.compact()
+
+    assert c.get_journal_size() == 0
+    assert Path(str(path) + ".journal").read_bytes() == b""
+    assert _ids(TaskCache(ttl=600, cache_path=str(path))) == ["t0", "t1", "t2", "n0", "n1", "n2", "n3", "n4"]
+
+
+def test_journal_threshold_triggers_background_compaction(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path), journal_max_bytes=512)
+    c.set_tasks(_response(3))
+    c.upsert_tasks([{"id": "big", "title": "y" * 1024}])
+
+    c._compaction_thread.join(timeout=5)
+    assert c.get_journal_size() == 0
+    assert "big" in _ids(TaskCache(ttl=600, cache_path=str(path)))
+
+
+def test_invalidate_removes_snapshot_and_journal(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path))
+    c.set_tasks(_response(2))
+    c.remove_tasks(["t0"])
+    c.invalidate()
+
+    assert not path.exists()
+    assert not Path(str(path) + ".journal").exists()
+    assert TaskCache(ttl=600, cache_path=str(path)).get_full_response() is None
+
+
+def test_reader_reloads_only_when_another_process_wrote(tmp_path):
+    path = tmp_path / "cache.json"
+    writer = TaskCache(ttl=600, cache_path=str(path))
+    writer.set_tasks(_response(3))
+    reader = TaskCache(ttl=600, cache_path=str(path))
+
+    assert reader.reload_if_changed() is False
+
+    writer.upsert_tasks([{"id": "t7", "title": "From other process"}])
+    assert reader.reload_if_changed() is True
+    assert "t7" in [t["id"] for t in reader.get_tasks()]
+    assert reader.reload_if_changed() is False
+
+    writer.invalidate()
+    assert reader.get_tasks() is None
+
+
+def test_concurrent_writers_keep_each_others_changes(tmp_path):
+    path = tmp_path / "cache.json"
+    a = TaskCache(ttl=600, cache_path=str(path))
+    a.set_tasks(_response(2))
+    b = TaskCache(ttl=600, cache_path=str(path))
+
+    a.upsert_tasks([{"id": "from-a", "title": "A"}])
+    b.remove_tasks(["t0"])  # b had not seen a's write yet
+
+    expected = ["t1", "from-a"]
+    assert _ids(b) == expected
+    assert _ids(a) == expected
+    assert _ids(TaskCache(ttl=600, cache_path=str(path))) == expected
+
+
+def test_refresh_lock_is_exclusive_across_instances(tmp_path):
+    path = tmp_path / "cache.json"
+    a = TaskCache(ttl=600, cache_path=str(path))
+    b = TaskCache(ttl=600, cache_path=str(path))
+
+    with a.refresh_lock() as held_a:
+        assert held_a is True
+        with b.refresh_lock(timeout=0.1) as held_b:
+            assert held_b is False
+    with b.refresh_lock(timeout=0.1) as held_b:
+        assert held_b is True
+
+
+def test_parse_ttl_preference():
+    from cache import parse_ttl_preference
+
+    assert parse_ttl_preference("300") == (300, None)
+    assert parse_ttl_preference("auto") == (600, (120, 3600))
+    assert parse_ttl_preference("auto:60-300") == (300, (60, 300))
+    assert parse_ttl_preference("auto:bad") == (600, (120, 3600))
+    assert parse_ttl_preference("nonsense") == (600, None)
+
+
+def test_adaptive_ttl_grows_when_quiet_and_shrinks_when_busy(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path), ttl_bounds=(120, 1200))
+    c.set_tasks(_response(20))
+    assert c.get_ttl_display() == "TTL 10m (initial)"
+
+    c.set_tasks(_response(20))
+    assert c.ttl == 900
+    c.set_tasks(_response(20))
+    assert c.ttl == 1200  # capped at max
+    assert c.get_ttl_display() == "TTL 20m (no changes)"
+
+    busy = {f"t{i}": {"updated": "2026-03-01T00:00:00Z"} for i in range(5)}
+    c.set_tasks(_response(20, **busy))
+    assert c.ttl == 600
+    assert c.get_ttl_display() == "TTL 10m (5 changed)"
+
+    # Learned TTL survives a restart
+    assert TaskCache(ttl=600, cache_path=str(path), ttl_bounds=(120, 1200)).ttl == 600
+
+
+def test_adaptive_ttl_counts_changes_without_updated_stamps(tmp_path):
+    def unstamped(**overrides):
+        response = _response(40, **overrides)
+        for task in response["data"]["tasks"]:
+            task.pop("updated", None)
+        return response
+
+    c = TaskCache(ttl=600, cache_path=str(tmp_path / "cache.json"), ttl_bounds=(120, 3600))
+    c.set_tasks(unstamped())
+    c.set_tasks(unstamped())
+    assert c.get_ttl_display() == "TTL 15m (no changes)"
+
+    c.set_tasks(unstamped(t1={"title": "Renamed"}))
+    assert c.get_ttl_display() == "TTL 15m (1 changed)"
+
+    # Without ids the refresh cannot be compared: the TTL is kept.
+    c.set_tasks({"data": {"tasks": [{"title": "No id"}]}})
+    assert c.ttl == 900
+
+
+def test_static_ttl_is_not_adapted(tmp_path):
+    c = TaskCache(ttl=600, cache_path=str(tmp_path / "cache.json"))
+    c.set_tasks(_response(3))
+    c.set_tasks(_response(3))
+    assert c.ttl == 600
+    assert c.get_ttl_display() == ""
+
+
+def test_touch_revalidates_without_rewriting_and_validators_persist(tmp_path):
+    path = tmp_path / "cache.json"
+    c = TaskCache(ttl=600, cache_path=str(path))
+    c.set_tasks(_response(50), validators={"etag": '"v1"', "content_hash": "abc"})
+    snapshot = path.read_bytes()
+    c._timestamp -= 500
+    index = c.get_search_index()
+
+    assert c.touch({"etag": '"v2"'}) is True
+    assert c.get_age() < 5
+    assert path.read_bytes() == snapshot
+    assert c.get_journal_size() < 200
+    assert c.get_search_index() is index  # not rebuilt
+    assert c.get_validators() == {"etag": '"v2"', "content_hash": "abc"}
+
+    reloaded = TaskCache(ttl=600, cache_path=str(path))
+    assert reloaded.get_validators() == {"etag": '"v2"', "content_hash": "abc"}
+    assert reloaded.get_age() < 5
+
+    # A local change means the cache no longer mirrors the server's body.
+    reloaded.remove_tasks(["t1"])
+    assert reloaded.get_validators() is None
+    assert TaskCache(ttl=600, cache_path=str(path)).get_validators() is None
@@ -0,0 +1,103 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import cache
+from cache import TaskCache, _flock
+from cache_pool import CachePool, account_partition_id
+
+
+def _response(task_id, padding=0):
+    return {"data": {"tasks": [{"id": task_id, "title": "x", "description": "y" * padding}]}}
+
+
+def test_partitions_are_per_account_and_keyed_by_hash(tmp_path):
+    pool = CachePool(base_dir=str(tmp_path))
+    work = pool.get("work-key", ttl=600)
+    personal = pool.get("personal-key", ttl=600)
+    work.set_tasks(_response("w1"))
+    personal.set_tasks(_response("p1"))
+
+    assert work is not personal
+    assert pool.get("work-key", ttl=600) is work
+    assert [t["id"] for t in pool.get("personal-key", ttl=600).get_tasks()] == ["p1"]
+    assert os.path.isdir(pool.partition_dir("work-key"))
+    assert "work-key" not in pool.partition_dir("work-key")
+    assert account_partition_id(" work-key ") == account_partition_id("work-key")
+
+
+def test_memory_lru_evicts_but_disk_keeps_warm_data(tmp_path):
+    pool = CachePool(base_dir=str(tmp_path), max_in_memory=1)
+    first = pool.get("a", ttl=600)
+    first.set_tasks(_response("a1"))
+    pool.get("b", ttl=600)
+
+    reopened = pool.get("a", ttl=600)
+    assert reopened is not first
+    assert [t["id"] for t in reopened.get_tasks()] == ["a1"]
+
+
+def test_get_updates_ttl_and_backend_selects_sqlite(tmp_path):
+    pool = CachePool(base_dir=str(tmp_path))
+    assert pool.get("a", ttl=600).ttl == 600
+    assert pool.get("a", ttl=60).ttl == 60
+    assert pool.get("a", ttl=60, backend="sqlite").cache_path.endswith("tasks_cache.sqlite3")
+
+
+def test_disk_cap_evicts_least_recently_used_unloaded_partition(tmp_path):
+    pool = CachePool(base_dir=str(tmp_path), max_in_memory=1, max_disk_bytes=10_000)
+    pool.get("old", ttl=600).set_tasks(_response("o", padding=6_000))
+    old_dir = pool.partition_dir("old")
+    os.utime(old_dir, (1, 1))
+    pool.get("new", ttl=600).set_tasks(_response("n", padding=6_000))
+
+    pool.enforce_disk_limit()
+
+    assert not os.path.exists(old_dir)
+    assert os.path.isdir(pool.partition_dir("new"))
+
+
+def test_legacy_shared_cache_is_removed_but_its_locks_are_kept(tmp_path):
+    legacy = tmp_path / "tasks_cache.json"
+    legacy.write_text("{}")
+    (tmp_path / "tasks_cache.json.journal").write_text("{}\n")
+    lock = tmp_path / "tasks_cache.json.lock"
+    lock.touch()
+
+    CachePool(base_dir=str(tmp_path))
+
+    assert not legacy.exists()
+    assert not (tmp_path / "tasks_cache.json.journal").exists()
+    assert lock.exists()
+
+
+def test_legacy_shared_cache_in_use_is_kept(tmp_path):
+    legacy = tmp_path / "tasks_cache.json"
+    legacy.write_text("{}")
+    database = tmp_path / "tasks_cache.sqlite3"
+    database.write_bytes(b"")
+    (tmp_path / "tasks_cache.sqlite3-wal").write_bytes(b"")  # open in another process
+
+    with _flock(str(tmp_path / "tasks_cache.json.lock")):  # an older version is writing
+        CachePool(base_dir=str(tmp_path))
+    assert legacy.exists() and database.exists()
+
+    CachePool(base_dir=str(tmp_path))
+    assert not legacy.exists()
+    assert database.exists()
+
+
+def test_task_cache_for_an_api_key_shares_the_pool_partition(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_DEFAULT_CACHE_DIR", str(tmp_path))
+    pool = CachePool(base_dir=str(tmp_path))
+    pool.get("work-key", ttl=600).set_tasks(_response("w1"))
+
+    script = TaskCache(ttl=600, api_key="work-key")
+    assert script.cache_path == pool.get("work-key", ttl=600).cache_path
+    assert [t["id"] for t in script.get_tasks()] == ["w1"]
+    with pytest.raises(ValueError):
+        TaskCache(ttl=600)
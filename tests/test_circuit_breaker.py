@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    clock = _Clock()
+    cb = CircuitBreaker(failure_threshold=3, cooldown=30, clock=clock)
+    for _ in range(2):
+        assert cb.acquire() is False
+        cb.record_failure()
+    cb.acquire()
+    cb.record_success()  # resets the streak
+    for _ in range(3):
+        cb.acquire()
+        cb.record_failure()
+    assert cb.state == OPEN
+
+    clock.now += 10
+    with pytest.raises(CircuitOpen) as e:
+        cb.acquire()
+    assert e.value.retry_after == 20
+
+
+def test_half_open_allows_single_probe_and_closes_on_success():
+    clock = _Clock()
+    cb = CircuitBreaker(failure_threshold=1, cooldown=30, clock=clock)
+    cb.acquire()
+    cb.record_failure()
+    clock.now += 30
+    assert cb.state == HALF_OPEN
+
+    assert cb.acquire() is True
+    with pytest.raises(CircuitOpen):
+        cb.acquire()  # probe already in flight
+    cb.record_success()
+    assert cb.state == CLOSED
+    assert cb.acquire() is False
+
+
+def test_failed_probe_reopens_with_doubled_cooldown():
+    clock = _Clock()
+    cb = CircuitBreaker(failure_threshold=1, cooldown=30, max_cooldown=50, clock=clock)
+    cb.acquire()
+    cb.record_failure()
+    clock.now += 30
+    assert cb.acquire() is True
+    cb.record_failure()
+
+    clock.now += 49
+    with pytest.raises(CircuitOpen):
+        cb.acquire()
+    clock.now += 1
+    assert cb.acquire() is True  # capped at max_cooldown
+
+
+def test_released_probe_can_be_retried():
+    clock = _Clock()
+    cb = CircuitBreaker(failure_threshold=1, cooldown=1, clock=clock)
+    cb.acquire()
+    cb.record_failure()
+    clock.now += 1
+    assert cb.acquire() is True
+    cb.release()
+    assert cb.acquire() is True
@@ -0,0 +1,136 @@
+import json
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import morgen_api
+from connection import ConnectionPool
+from morgen_api import MorgenAPIClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path.startswith("/v3/denied"):
+            self._send(401, {"error": "nope"})
+        elif self.path.startswith("/v3/same"):
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+        else:
+            self._send(200, {"data": {"tasks": [{"id": "t1"}]}})
+
+    def _send(self, status, payload):
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.requests = []
+    srv.connections = 0
+    srv.daemon_threads = True
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _base_url(srv):
+    return f"http://127.0.0.1:{srv.server_address[1]}/v3"
+
+
+def _client(pool):
+    return MorgenAPIClient("k", connections=pool, base_url=f"http://{pool.host}:{pool.port}/v3")
+
+
+def test_prewarmed_connection_serves_the_next_requests(server):
+    pool = ConnectionPool(_base_url(server))
+    assert pool.prewarm() is True
+    assert pool.idle_count() == 1
+
+    client = _client(pool)
+    assert client.list_tasks()["data"]["tasks"] == [{"id": "t1"}]
+    assert client.list_tasks(limit=5)["data"]["tasks"] == [{"id": "t1"}]
+
+    assert server.connections == 1
+    assert pool.connections_opened == 1 and pool.reused == 2
+
+
+def test_error_and_not_modified_responses_release_the_connection(server):
+    pool = ConnectionPool(_base_url(server))
+    client = _client(pool)
+
+    with pytest.raises(morgen_api.MorgenAuthError) as e:
+        client._make_request("/denied")
+    assert "nope" in e.value.response_body
+
+    response = client._make_request("/same", validators={"etag": '"v1"'})
+    assert response.not_modified and response.etag == '"v1"'
+    client._make_request("/tasks/list?limit=1")
+    assert server.connections == 1
+
+
+def test_prewarm_fails_quietly_when_offline():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # nothing listens here once closed
+
+    pool = ConnectionPool(f"http://127.0.0.1:{port}/v3", connect_timeout=0.5)
+    assert pool.prewarm() is False
+    assert pool.idle_count() == 0
+
+    client = _client(pool)
+    for policy in client.retry_policies.values():
+        policy.max_attempts = 1
+    with pytest.raises(morgen_api.MorgenNetworkError) as e:
+        client.list_tasks()
+    assert e.value.request_sent is False
+
+
+def test_expired_or_server_closed_connections_are_replaced(server):
+    now = [0.0]
+    pool = ConnectionPool(_base_url(server), idle_timeout=30, clock=lambda: now[0])
+    pool.prewarm()
+    now[0] += 31
+    assert pool.idle_count() == 0  # too old to trust
+
+    pool.prewarm()
+    conn, _ = pool._idle[0]
+    conn.sock.shutdown(socket.SHUT_RDWR)  # as if the server had dropped it
+    assert _client(pool).list_tasks()["data"]["tasks"] == [{"id": "t1"}]
+    assert pool.connections_opened == 3
+
+
+def test_requests_for_another_origin_are_refused(server):
+    pool = ConnectionPool(_base_url(server))
+    port = server.server_address[1]
+
+    for url in (f"http://localhost:{port}/v3/tasks/list", f"http://127.0.0.1:{port + 1}/v3/tasks/list",
+                f"https://127.0.0.1:{port}/v3/tasks/list"):
+        with pytest.raises(ValueError):
+            pool.request("GET", url)
+    assert server.connections == 0
+
+    with pool.request("GET", f"http://127.0.0.1:{port}/v3/tasks/list") as resp:
+        assert resp.status == 200
@@ -51,3 +51,8 @@ def test_format_subtitle_shows_created_when_no_due():
     task = {"title": "Task", "priority": 0, "due": None, "created": "2026-02-05T10:20:30"}
     subtitle = formatter.format_subtitle(task)
     assert subtitle == "Created: 2026-02-05 | Priority: Normal"
+
+
+def test_format_subtitle_marks_unsynced_tasks():
+    f = TaskFormatter()
+    assert f.format_subtitle({"title": "x", "pendingSync": True}).endswith("Priority: Normal | Not synced yet")
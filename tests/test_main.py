@@ -0,0 +1,289 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import main  # noqa: E402
+from benchmarks.replay import ReplayAPIClient, ReplayExtension, ReplayQueryEvent  # noqa: E402
+from tests.stub_server import StubMorgenServer  # noqa: E402
+
+API_KEY = "test-key"
+
+
+class _Item:
+    """Records what main.py renders, independent of the Ulauncher version's item API."""
+
+    def __init__(self, **kwargs):
+        self.name = kwargs.get("name")
+        self.description = kwargs.get("description")
+        self.on_enter = kwargs.get("on_enter")
+
+
+class _Action:
+    def __init__(self, data, keep_app_open=False):
+        self.data = data
+
+
+class FakeClient(ReplayAPIClient):
+    """Serves `tasks`; close/create fail for the titles or ids listed in `errors`."""
+
+    def __init__(self, tasks, errors=None):
+        super().__init__(API_KEY, {"data": {"tasks": tasks}})
+        self.errors = errors or {}
+        self.closed = []
+        self.created = []
+
+    def close_task(self, task_id, priority="interactive"):
+        if task_id in self.errors:
+            raise self.errors[task_id]
+        self.closed.append(task_id)
+        return {}
+
+    def create_task(self, title, description=None, due=None, time_zone=None, priority=0, request_priority="interactive"):
+        if title in self.errors:
+            raise self.errors[title]
+        self.created.append(title)
+        return {"data": {"id": f"server-{len(self.created)}"}}
+
+
+class FakeAsyncClient:
+    """The asyncio client's close_task, answered by a FakeClient."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def close_task(self, task_id, priority="interactive"):
+        return self.client.close_task(task_id, priority)
+
+
+@pytest.fixture(autouse=True)
+def plain_items(monkeypatch):
+    monkeypatch.setattr(main, "ExtensionResultItem", _Item)
+    monkeypatch.setattr(main, "ExtensionSmallResultItem", _Item)
+    monkeypatch.setattr(main, "ExtensionCustomAction", _Action)
+    monkeypatch.setattr(main, "RenderResultListAction", lambda items: items)
+
+
+@pytest.fixture
+def make_extension(tmp_path):
+    extensions = []
+
+    def make(tasks, errors=None, backend="json"):
+        client = FakeClient(tasks, errors)
+        preferences = {
+            "api_key": API_KEY, "mg_keyword": "mg", "mg_new_keyword": "", "cache_ttl": "600", "cache_backend": backend,
+        }
+        extension = ReplayExtension(main, str(tmp_path), client, preferences)
+        extension.async_client = FakeAsyncClient(client)
+        extensions.append(extension)
+        main._select_account(extension, API_KEY)
+        extension.outbox.stop()  # keep queued ops where the test can see them
+        extension.cache.set_tasks({"data": {"tasks": tasks}})
+        return extension
+
+    yield make
+    for extension in extensions:
+        extension.close()
+
+
+def _tasks(*titles):
+    return [{"id": f"t{i}", "title": title, "progress": "needs-action"} for i, title in enumerate(titles, 1)]
+
+
+def _names(items):
+    return [item.name for item in items]
+
+
+def _query(extension, argument):
+    return main.KeywordQueryEventListener().on_event(ReplayQueryEvent("mg", argument), extension)
+
+
+# --- Complete all ---
+
+def test_complete_all_offered_only_for_a_search(make_extension):
+    extension = make_extension(_tasks("Write report", "Send report", "Call mum"))
+
+    assert not any(name.startswith("Complete all") for name in _names(_query(extension, "d")))
+    assert 'Complete all 2 matching "report"' in _names(_query(extension, "d report"))
+
+
+def test_complete_all_closes_every_task(make_extension):
+    extension = make_extension(_tasks("Write report", "Send report"))
+
+    items = main.ItemEnterEventListener()._complete_all(extension, ["t1", "t2"])
+
+    assert sorted(extension.api_client.closed) == ["t1", "t2"]
+    assert items[0].name == "Completed 2 of 2 tasks"
+    assert extension.cache.get_tasks() == []
+
+
+def test_complete_all_queues_offline_failures_and_reports_errors(make_extension):
+    errors = {
+        "t2": main.MorgenNetworkError("offline"),
+        "t3": main.MorgenAPIError("Task not found"),
+    }
+    extension = make_extension(_tasks("Write report", "Send report", "File report"), errors)
+    local_id = extension.outbox.enqueue_create("Created offline")
+
+    items = main.ItemEnterEventListener()._complete_all(extension, ["t1", "t2", "t3", local_id])
+
+    assert extension.api_client.closed == ["t1"]
+    pending = [(op["op"], op.get("task_id")) for op in extension.outbox.pending()]
+    assert ("close", "t2") in pending and ("close", local_id) in pending
+    assert items[0].name == "Completed 1 of 4 tasks"
+    assert items[0].description == "2 will sync when Morgen is reachable; 1 failed"
+    assert _names(items[1:]) == ["Failed: File report"]
+    # Closed and queued tasks leave the list; the failed one stays.
+    assert [t["id"] for t in extension.cache.get_tasks()] == ["t3"]
+
+
+def test_complete_all_closes_through_the_asyncio_client(tmp_path):
+    tasks = _tasks("Write report", "Send report", "File report")
+    preferences = {"api_key": "stub-api-key", "mg_keyword": "mg", "cache_ttl": "600", "cache_backend": "json"}
+    with StubMorgenServer(tasks) as server:
+        client = main.MorgenAPIClient(server.api_key, base_url=server.base_url)
+        extension = ReplayExtension(main, str(tmp_path), client, preferences)
+        try:
+            main._select_account(extension, server.api_key)
+            extension.cache.set_tasks({"data": {"tasks": tasks}})
+            extension.async_client = main._new_async_client(extension, client)
+
+            items = main.ItemEnterEventListener()._complete_all(extension, ["t1", "t2", "t3"])
+
+            assert items[0].name == "Completed 3 of 3 tasks"
+            assert [t["progress"] for t in server.tasks()] == ["completed"] * 3
+            assert extension.cache.get_tasks() == []
+            # Both clients spend the same point budget.
+            assert extension.async_client.rate_budget is client.rate_budget
+        finally:
+            extension.event_loop.run(extension.async_client.aclose())
+            extension.close()
+
+
+# --- Show list ---
+
+class _EnterEvent:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_show_list_includes_tasks_matching_only_by_name(make_extension, backend):
+    tasks = [
+        {"id": "t1", "title": "By id", "taskListId": "list-1"},
+        {"id": "t2", "title": "By name", "taskListName": "Work"},
+        {"id": "t3", "title": "Elsewhere", "taskListId": "list-2", "taskListName": "Home"},
+    ]
+    extension = make_extension(tasks, backend=backend)
+    data = {"action": "show_list", "list_id": "list-1", "list_name": "Work", "container_kind": "list"}
+
+    items = main.ItemEnterEventListener().on_event(_EnterEvent(data), extension)
+
+    assert items[0].name == "Morgen Tasks — Work (2)"
+    assert any("By id" in name for name in _names(items[1:]))
+    assert any("By name" in name for name in _names(items[1:]))
+
+
+# --- Batch create ---
+
+def _create_preview(extension, argument):
+    items = _query(extension, argument)
+    return items[0], items[1:]
+
+
+def test_batch_create_preview_parses_each_entry(make_extension):
+    extension = make_extension([])
+
+    header, rows = _create_preview(extension, "new Book flights @2030-05-01 !1; Pack;  ; Water plants !low")
+
+    assert header.name == "Create 3 tasks"
+    assert [t["title"] for t in header.on_enter.data["tasks"]] == ["Book flights", "Pack", "Water plants"]
+    assert header.on_enter.data["tasks"][0]["due"].startswith("2030-05-01T")
+    assert [t["priority"] for t in header.on_enter.data["tasks"]] == [1, 0, 9]
+    assert _names(rows) == ["1. Book flights", "2. Pack", "3. Water plants"]
+
+
+def test_batch_create_accepts_pasted_lines(make_extension):
+    extension = make_extension([])
+
+    header, rows = _create_preview(extension, "new Pack\nBook flights !1\n\nWater plants")
+
+    assert header.name == "Create 3 tasks"
+    assert _names(rows) == ["1. Pack", "2. Book flights", "3. Water plants"]
+
+
+def test_batch_create_flags_invalid_entries(make_extension):
+    extension = make_extension([])
+
+    header, rows = _create_preview(extension, "new Pack; Pay rent @notadate; @friday")
+
+    assert header.name == "Create 1 task"
+    assert header.description == "Press Enter to create it (2 invalid entries skipped)"
+    assert [t["title"] for t in header.on_enter.data["tasks"]] == ["Pack"]
+    assert _names(rows) == ["1. Pack", "2. Invalid: Pay rent @notadate", "3. Invalid: @friday"]
+    assert all(row.description for row in rows[1:])
+
+    header, _rows = _create_preview(extension, "new Pack; Water plants; @friday")
+    assert header.description == "Press Enter to create all of them (1 invalid entry skipped)"
+
+    header, _rows = _create_preview(extension, "new @friday; !1")
+    assert header.name == "Cannot create tasks"
+
+
+def test_create_all_queues_every_entry_without_calling_the_api(make_extension):
+    extension = make_extension([])
+    entries = [
+        {"title": "Book flights", "due": "2030-05-01T09:00:00", "priority": 1, "token": "a"},
+        {"title": "Pack", "due": None, "priority": 0, "token": "b"},
+        {"title": "Bad", "due": None, "priority": 12, "token": "c"},
+        {"title": "  ", "due": None, "priority": 0, "token": "d"},  # dropped before submitting
+    ]
+
+    items = main.ItemEnterEventListener()._create_all(extension, entries)
+
+    assert extension.api_client.created == []  # the outbox drainer sends them
+    assert [op["body"]["title"] for op in extension.outbox.pending()] == ["Book flights", "Pack"]
+    assert extension.outbox.pending()[0]["body"]["due"] == "2030-05-01T09:00:00"
+    assert items[0].name == "Created 2 tasks"
+    assert items[0].description == "Syncing to Morgen in the background; 1 failed"
+    assert _names(items[1:]) == ["Created: Book flights", "Created: Pack", "Failed: Bad"]
+    titles = sorted(t["title"] for t in extension.cache.get_tasks())
+    assert titles == ["Book flights", "Pack"]
+
+
+def test_create_all_twice_creates_each_task_once(make_extension):
+    extension = make_extension([])
+    header, _rows = _create_preview(extension, "new Pack; Water plants")
+    listener = main.ItemEnterEventListener()
+
+    listener.on_event(_EnterEvent(header.on_enter.data), extension)
+    items = listener.on_event(_EnterEvent(header.on_enter.data), extension)  # Enter delivered twice
+
+    assert items[0].name == "Created 2 tasks"
+    assert [op["body"]["title"] for op in extension.outbox.pending()] == ["Pack", "Water plants"]
+
+    extension.outbox.drain()
+    assert extension.api_client.created == ["Pack", "Water plants"]
+
+
+def test_create_item_is_queued_once_per_render(make_extension):
+    extension = make_extension([])
+    listener = main.ItemEnterEventListener()
+
+    def create_action():
+        rows = _query(extension, "new Call mum")
+        return next(row.on_enter.data for row in rows if isinstance(row.on_enter, _Action))
+
+    data = create_action()
+    listener.on_event(_EnterEvent(data), extension)
+    listener.on_event(_EnterEvent(data), extension)  # Enter delivered twice
+    assert extension.outbox.pending_count() == 1
+
+    listener.on_event(_EnterEvent(create_action()), extension)  # a deliberate second "Call mum"
+    assert [op["body"]["title"] for op in extension.outbox.pending()] == ["Call mum", "Call mum"]
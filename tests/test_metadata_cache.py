@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from metadata_cache import ContainerMetadataCache, merge_name_maps
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_kinds_are_cached_and_expire_independently(tmp_path):
+    clock = _Clock()
+    path = tmp_path / "containers.json"
+    cache = ContainerMetadataCache(str(path), ttl=3600, clock=clock)
+    assert cache.stale_kinds() == ["list", "project", "space"]
+
+    cache.set_containers("list", [{"id": "l1", "name": "Inbox"}, {"id": "l2"}])
+    clock.now += 1800
+    cache.set_containers("space", [])
+    assert cache.stale_kinds() == ["project"]
+
+    clock.now += 1800
+    assert cache.stale_kinds() == ["list", "project"]
+    # Stale names are still served.
+    assert cache.get_name_maps() == {"list": {"l1": "Inbox"}, "project": {}, "space": {}}
+
+    reloaded = ContainerMetadataCache(str(path), ttl=3600, clock=clock)
+    assert reloaded.get_name_maps()["list"] == {"l1": "Inbox"}
+    assert reloaded.stale_kinds() == ["list", "project"]
+
+
+def test_merge_name_maps_prefers_later_maps():
+    embedded = {"list": {"l1": "old", "l2": "Work"}, "project": {}, "space": {}}
+    fetched = {"list": {"l1": "Inbox"}, "project": {"p1": "Launch"}, "space": {}}
+    assert merge_name_maps(embedded, fetched) == {
+        "list": {"l1": "Inbox", "l2": "Work"},
+        "project": {"p1": "Launch"},
+        "space": {},
+    }
@@ -23,10 +23,16 @@ from morgen_api import (
 class _FakeHTTPResponse:
     def __init__(self, payload: dict):
         self._payload = payload
+        self._stream = None
 
-    def read(self):
+    def _body(self):
         return json.dumps(self._payload).encode("utf-8")
 
+    def read(self, size=-1):
+        if self._stream is None:
+            self._stream = io.BytesIO(self._body())
+        return self._stream.read(size)
+
     def __enter__(self):
         return self
 
@@ -35,11 +41,12 @@ class _FakeHTTPResponse:
 
 
 class _FakeHTTPResponseBytes:
-    def __init__(self, raw: bytes):
-        self._raw = raw
+    def __init__(self, raw: bytes, headers=None):
+        self._stream = io.BytesIO(raw)
+        self.headers = headers or {}
 
-    def read(self):
-        return self._raw
+    def read(self, size=-1):
+        return self._stream.read(size)
 
     def __enter__(self):
         return self
@@ -120,7 +127,7 @@ def test_make_request_invalid_json_raises_api_error():
     client = MorgenAPIClient("k")
 
     class _BadJSONResponse(_FakeHTTPResponse):
-        def read(self):
+        def _body(self):
             return b"not json"
 
     with patch("urllib.request.urlopen", return_value=_BadJSONResponse({"x": 1})):
@@ -133,7 +140,7 @@ def test_list_tasks_caps_limit_to_100():
     client = MorgenAPIClient("k")
     captured = {}
 
-    def _capture(endpoint, method="GET", data=None):
+    def _capture(endpoint, method="GET", data=None, **kwargs):
         captured["endpoint"] = endpoint
         return {"data": {"tasks": []}}
 
@@ -142,6 +149,166 @@ def test_list_tasks_caps_limit_to_100():
     assert captured["endpoint"].startswith("/tasks/list?limit=100")
 
 
+def test_concurrent_list_tasks_share_one_request():
+    import threading
+
+    client = MorgenAPIClient("k")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def _slow(endpoint, method="GET", data=None, **kwargs):
+        calls.append(endpoint)
+        started.set()
+        release.wait(5)
+        return {"data": {"tasks": [{"id": "t1"}]}}
+
+    client._make_request = _slow  # type: ignore[method-assign]
+    results = []
+    leader = threading.Thread(target=lambda: results.append(client.list_tasks()))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(client.list_tasks())) for _ in range(3)]
+    for t in followers:
+        t.start()
+    while client.get_stats()["list_coalesced"] < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 4 and all(r is results[0] for r in results)
+    assert client.get_stats() == {"list_calls": 4, "list_coalesced": 3}
+
+    # Sequential calls are not coalesced; different params never share.
+    client._make_request = lambda endpoint, method="GET", data=None, **kwargs: {"data": {"tasks": []}}  # type: ignore[method-assign]
+    client.list_tasks()
+    client.list_tasks(limit=5)
+    assert client.get_stats()["list_coalesced"] == 3
+
+
+def test_interactive_list_tasks_does_not_join_background_flight():
+    import threading
+
+    from rate_budget import BACKGROUND
+
+    client = MorgenAPIClient("k")
+    started = threading.Event()
+    release = threading.Event()
+    priorities = []
+
+    def _slow(endpoint, method="GET", data=None, priority=None, **kwargs):
+        priorities.append(priority)
+        if priority == BACKGROUND:
+            started.set()
+            release.wait(5)
+        return {"data": {"tasks": []}}
+
+    client._make_request = _slow  # type: ignore[method-assign]
+    background = threading.Thread(target=lambda: client.list_tasks(priority=BACKGROUND))
+    background.start()
+    assert started.wait(5)
+    try:
+        client.list_tasks()
+    finally:
+        release.set()
+        background.join(5)
+
+    assert priorities == [BACKGROUND, "interactive"]
+    assert client.get_stats()["list_coalesced"] == 0
+
+
+def test_429_records_retry_after_and_fails_fast_afterwards():
+    client = MorgenAPIClient("k")
+    error = _http_error(429, "slow down")
+    error.headers = {"Retry-After": "30"}
+
+    with patch("urllib.request.urlopen", side_effect=error):
+        with pytest.raises(MorgenRateLimitError) as e:
+            client.list_tasks()
+    assert e.value.retry_after == pytest.approx(30, abs=1)
+
+    with patch("urllib.request.urlopen") as urlopen:
+        with pytest.raises(MorgenRateLimitError) as e:
+            client.close_task("t1")
+    urlopen.assert_not_called()
+    assert 0 < e.value.retry_after <= 30
+
+
+def test_background_list_refused_when_budget_low():
+    import morgen_api
+
+    # The budget class as morgen_api imported it, so its exceptions are the ones it catches.
+    client = MorgenAPIClient("k", rate_budget=morgen_api.RateBudget(limit=30, background_reserve=25))
+    with patch("urllib.request.urlopen", return_value=_FakeHTTPResponse({"data": {"tasks": []}})) as urlopen:
+        with pytest.raises(MorgenRateLimitError):
+            client.list_tasks(priority="background")
+        client.list_tasks()
+    assert urlopen.call_count == 1
+
+
+def test_network_failures_open_circuit_and_fail_fast():
+    client = MorgenAPIClient("k")
+    _no_backoff(client)
+    with patch("urllib.request.urlopen", side_effect=urllib.error.URLError("offline")) as urlopen:
+        for _ in range(client.circuit.failure_threshold):
+            with pytest.raises(MorgenNetworkError):
+                client.list_tasks()
+        assert urlopen.call_count == client.circuit.failure_threshold
+
+        with pytest.raises(MorgenNetworkError) as e:
+            client.list_tasks()
+        assert "offline" in e.value.message
+        assert urlopen.call_count == client.circuit.failure_threshold
+
+
+def test_client_errors_do_not_open_circuit():
+    client = MorgenAPIClient("k")
+    with patch("urllib.request.urlopen", side_effect=_http_error(400, "bad")):
+        for _ in range(5):
+            with pytest.raises(MorgenValidationError):
+                client._make_request("/tasks/create", method="POST", data={})
+    assert client.circuit.state == "closed"
+
+
+def _no_backoff(client):
+    for policy in client.retry_policies.values():
+        policy._sleep = lambda seconds: None
+
+
+def test_list_tasks_retries_transient_server_errors():
+    client = MorgenAPIClient("k")
+    _no_backoff(client)
+    responses = [_http_error(503, "busy"), _FakeHTTPResponse({"data": {"tasks": [{"id": "t1"}]}})]
+
+    def _urlopen(req, timeout=None):
+        item = responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    with patch("urllib.request.urlopen", side_effect=_urlopen):
+        response = client.list_tasks()
+    assert response["data"]["tasks"] == [{"id": "t1"}]
+
+
+def test_create_task_is_retried_only_when_never_sent():
+    client = MorgenAPIClient("k")
+    _no_backoff(client)
+
+    refused = urllib.error.URLError(ConnectionRefusedError("refused"))
+    with patch("urllib.request.urlopen", side_effect=[refused, _FakeHTTPResponse({"data": {"id": "n1"}})]) as urlopen:
+        assert client.create_task("Task")["data"]["id"] == "n1"
+    assert urlopen.call_count == 2
+
+    for error in (_http_error(503, "busy"), urllib.error.URLError(TimeoutError("timed out"))):
+        with patch("urllib.request.urlopen", side_effect=error) as urlopen:
+            with pytest.raises(MorgenAPIError):
+                client.create_task("Task")
+        assert urlopen.call_count == 1
+
+
 def test_create_task_validates_priority_and_due_format():
     client = MorgenAPIClient("k")
 
@@ -160,7 +327,7 @@ def test_close_task_calls_close_endpoint():
     client = MorgenAPIClient("k")
     captured = {}
 
-    def _capture(endpoint, method="GET", data=None):
+    def _capture(endpoint, method="GET", data=None, **kwargs):
         captured["endpoint"] = endpoint
         captured["method"] = method
         captured["data"] = data
@@ -171,3 +338,76 @@ def test_close_task_calls_close_endpoint():
     assert captured["endpoint"] == "/tasks/close"
     assert captured["method"] == "POST"
     assert captured["data"] == {"id": "task-123"}
+
+
+def test_gzip_response_is_decoded_and_transfer_sizes_recorded():
+    import gzip
+
+    payload = {"data": {"tasks": [{"id": f"t{i}", "title": "Same title again"} for i in range(200)]}}
+    raw = json.dumps(payload).encode("utf-8")
+    compressed = gzip.compress(raw)
+    client = MorgenAPIClient("k")
+
+    with patch(
+        "urllib.request.urlopen",
+        return_value=_FakeHTTPResponseBytes(compressed, headers={"Content-Encoding": "gzip"}),
+    ) as urlopen:
+        assert client.list_tasks() == payload
+    assert urlopen.call_args[0][0].get_header("Accept-encoding") == "gzip"
+    assert client.get_transfer_stats() == {
+        "responses": 1,
+        "wire_bytes": len(compressed),
+        "decoded_bytes": len(raw),
+    }
+
+    with patch(
+        "urllib.request.urlopen",
+        return_value=_FakeHTTPResponseBytes(compressed[:-8] + b"garbage!", headers={"Content-Encoding": "gzip"}),
+    ):
+        with pytest.raises(MorgenAPIError):
+            client._make_request("/tasks/list?limit=1")
+
+
+def test_conditional_list_tasks_returns_not_modified():
+    client = MorgenAPIClient("k")
+    payload = {"data": {"tasks": [{"id": "t1"}]}}
+
+    class _Response(_FakeHTTPResponse):
+        headers = {"ETag": '"v1"'}
+
+    with patch("urllib.request.urlopen", return_value=_Response(payload)):
+        first = client.list_tasks()
+    assert first == payload and not first.not_modified
+    validators = first.validators
+    assert validators["etag"] == '"v1"' and validators["content_hash"]
+
+    error = _http_error(304)
+    error.headers = {"ETag": '"v1"'}
+    with patch("urllib.request.urlopen", side_effect=error) as urlopen:
+        second = client.list_tasks(validators=validators)
+    assert urlopen.call_args[0][0].get_header("If-none-match") == '"v1"'
+    assert second.not_modified and second == {}
+
+    # No ETag support: an identical body is recognised by its hash and not parsed.
+    with patch("urllib.request.urlopen", return_value=_FakeHTTPResponse(payload)), \
+            patch("json.loads", side_effect=AssertionError("parsed")):
+        third = client.list_tasks(validators={"content_hash": validators["content_hash"]})
+    assert third.not_modified
+
+
+def test_list_containers_accepts_common_shapes_and_treats_404_as_empty():
+    client = MorgenAPIClient("k")
+    responses = {
+        "/taskLists/list": {"data": {"taskLists": [{"id": "l1", "name": "Inbox"}]}},
+        "/projects/list": {"data": [{"id": "p1", "name": "Launch"}]},
+    }
+
+    def _fake(endpoint, method="GET", data=None, **kwargs):
+        if endpoint not in responses:
+            raise MorgenAPIError("not found", status_code=404)
+        return responses[endpoint]
+
+    client._make_request = _fake  # type: ignore[method-assign]
+    assert client.list_containers("list") == [{"id": "l1", "name": "Inbox"}]
+    assert client.list_containers("project") == [{"id": "p1", "name": "Launch"}]
+    assert client.list_containers("space") == []
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import morgen_async
+from morgen_async import AsyncMorgenAPIClient, EventLoopThread
+
+# The exception classes exactly as morgen_async imported them.
+_api = sys.modules[morgen_async.MorgenAPIError.__module__]
+
+
+class _Server:
+    """Minimal keep-alive HTTP/1.1 server; `handler(method, path, body)` -> (status, payload, extra headers)."""
+
+    def __init__(self, loop_thread, handler):
+        self.handler = handler
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self._server = loop_thread.run(asyncio.start_server(self._serve, "127.0.0.1", 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                try:
+                    status, payload, extra = await self.handler(method, path, body)
+                finally:
+                    self.active -= 1
+                raw = json.dumps(payload).encode() if payload is not None else b""
+                head = f"HTTP/1.1 {status} X\r\nContent-Length: {len(raw)}\r\n"
+                head += "".join(f"{k}: {v}\r\n" for k, v in extra.items())
+                writer.write(head.encode() + b"\r\n" + raw)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+_clients = []
+
+
+@pytest.fixture
+def loop_thread():
+    thread = EventLoopThread()
+    thread.start()
+    yield thread
+    for client in _clients:
+        thread.run(client.aclose())
+    _clients.clear()
+    thread.stop()
+
+
+def _client(server, **kwargs):
+    client = AsyncMorgenAPIClient("k", **kwargs)
+    _clients.append(client)
+    client.BASE_URL = f"http://127.0.0.1:{server.port}/v3"
+    for policy in client.retry_policies.values():
+        policy.deadline = 5.0
+    return client
+
+
+def test_requests_share_a_keep_alive_connection(loop_thread):
+    seen = []
+
+    async def handler(method, path, body):
+        seen.append((method, path, json.loads(body) if body else None))
+        if path.startswith("/v3/tasks/list"):
+            return 200, {"data": {"tasks": [{"id": "t1"}]}}, {}
+        return 204, None, {}
+
+    server = _Server(loop_thread, handler)
+    client = _client(server)
+
+    assert loop_thread.run(client.list_tasks(limit=500))["data"]["tasks"] == [{"id": "t1"}]
+    assert loop_thread.run(client.close_task("t1")) == {}
+
+    assert seen == [("GET", "/v3/tasks/list?limit=100", None), ("POST", "/v3/tasks/close", {"id": "t1"})]
+    assert server.connections == 1
+    assert client.get_stats()["connections_opened"] == 1
+
+
+def test_fan_out_is_bounded_by_max_concurrency(loop_thread):
+    async def handler(method, path, body):
+        await asyncio.sleep(0.02)
+        return 204, None, {}
+
+    server = _Server(loop_thread, handler)
+    client = _client(server, max_concurrency=3)
+
+    async def close_all():
+        return await asyncio.gather(*(client.close_task(f"t{i}") for i in range(12)))
+
+    assert loop_thread.run(close_all()) == [{}] * 12
+    assert server.max_active == 3
+
+
+def test_concurrent_list_calls_are_coalesced(loop_thread):
+    async def handler(method, path, body):
+        await asyncio.sleep(0.05)
+        return 200, {"data": {"tasks": []}}, {}
+
+    server = _Server(loop_thread, handler)
+    client = _client(server)
+
+    async def burst():
+        return await asyncio.gather(*(client.list_tasks() for _ in range(5)))
+
+    loop_thread.run(burst())
+    assert client.get_stats()["list_coalesced"] == 4
+    assert server.connections == 1
+
+
+def test_http_errors_map_to_the_shared_exceptions(loop_thread):
+    responses = {
+        "/v3/tasks/close": (401, {"error": "nope"}, {}),
+        "/v3/tasks/create": (429, None, {"Retry-After": "30"}),
+    }
+
+    async def handler(method, path, body):
+        return responses[path]
+
+    server = _Server(loop_thread, handler)
+    client = _client(server)
+
+    with pytest.raises(_api.MorgenAuthError) as e:
+        loop_thread.run(client.close_task("t1"))
+    assert "nope" in e.value.response_body
+
+    with pytest.raises(_api.MorgenRateLimitError) as e:
+        loop_thread.run(client.create_task("Task"))
+    assert e.value.retry_after == pytest.approx(30, abs=1)
+    assert client.rate_budget.retry_after() > 0
+
+
+def test_unreachable_server_raises_network_error_not_sent(loop_thread):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # closed again: nothing listens here
+
+    client = AsyncMorgenAPIClient("k")
+    client.BASE_URL = f"http://127.0.0.1:{port}/v3"
+    for policy in client.retry_policies.values():
+        policy.max_attempts = 1
+
+    with pytest.raises(_api.MorgenNetworkError) as e:
+        loop_thread.run(client.create_task("Task"))
+    assert e.value.request_sent is False
+
+
+def test_cancelling_a_request_closes_its_connection_and_frees_the_circuit(loop_thread):
+    started = asyncio.Event()
+
+    async def handler(method, path, body):
+        if path == "/v3/tasks/close":
+            started.set()
+            await asyncio.sleep(5)
+        return 200, {"data": {"tasks": []}}, {}
+
+    server = _Server(loop_thread, handler)
+    client = _client(server)
+
+    future = loop_thread.submit(client.close_task("slow"))
+    loop_thread.run(asyncio.wait_for(started.wait(), 5))
+    future.cancel()
+
+    assert loop_thread.run(client.list_tasks()) == {"data": {"tasks": []}}
+    assert client.circuit.state == "closed"
+    assert server.connections == 2  # the cancelled connection was not reused
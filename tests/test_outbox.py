@@ -0,0 +1,220 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import outbox as outbox_module
+from cache import TaskCache
+from outbox import Outbox
+
+# The exception classes exactly as the outbox module imported them.
+_api = sys.modules[outbox_module.MorgenAPIError.__module__]
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = []
+        self.fail_with = None
+        self.remote_tasks = []
+        self.priorities = []
+        self._next = 0
+
+    def _maybe_fail(self):
+        if self.fail_with is not None:
+            raise self.fail_with
+
+    def create_task(self, title, description=None, due=None, time_zone=None, priority=0, request_priority="interactive"):
+        self.calls.append(("create", title))
+        self.priorities.append(request_priority)
+        self._maybe_fail()
+        self._next += 1
+        return {"data": {"id": f"srv{self._next}"}}
+
+    def close_task(self, task_id, priority="interactive"):
+        self.calls.append(("close", task_id))
+        self.priorities.append(priority)
+        self._maybe_fail()
+        return {}
+
+    def list_tasks(self, limit=100, updated_after=None, priority="interactive"):
+        self.calls.append(("list", None))
+        tasks = [t for t in self.remote_tasks if not updated_after or t.get("updated", "") > updated_after]
+        return {"data": {"tasks": tasks[:limit]}}
+
+
+def _stamp(offset=0.0):
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(time.time() + offset))
+
+
+def _remote(task_id, title, created_offset=0.0):
+    return {"id": task_id, "title": title, "created": _stamp(created_offset), "updated": _stamp()}
+
+
+def _setup(tmp_path):
+    cache = TaskCache(ttl=600, cache_path=str(tmp_path / "cache.json"))
+    cache.set_tasks({"data": {"tasks": [{"id": "t1", "title": "Existing"}]}})
+    client = _FakeClient()
+    return Outbox(str(tmp_path / "outbox.jsonl"), client, cache), client, cache
+
+
+def _ids(cache):
+    return [t["id"] for t in cache.get_tasks()]
+
+
+def test_enqueue_applies_optimistically_and_drain_syncs_in_order(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    local_id = box.enqueue_create("Buy milk", priority=1, token="enter-1")
+    assert box.enqueue_close("t1") is True
+    assert box.enqueue_close("t1") is False  # deduplicated
+    assert box.enqueue_create("Buy milk", priority=1, token="enter-1") == local_id
+
+    assert _ids(cache) == [local_id]
+    assert cache.get_tasks()[0]["pendingSync"] is True
+    assert box.pending_count() == 2
+
+    assert box.drain() is None
+    assert client.calls == [("create", "Buy milk"), ("close", "t1")]
+    assert _ids(cache) == ["srv1"]
+    assert box.pending_count() == 0
+    assert Path(box.path).read_text() == ""  # compacted
+
+
+def test_network_failure_keeps_ops_durable_across_restart(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.fail_with = _api.MorgenNetworkError("offline", request_sent=False)
+    box.enqueue_close("t1")
+    box.enqueue_create("Later")
+
+    assert box.drain() == 5.0
+    assert box.drain() == 10.0  # backs off
+
+    client2 = _FakeClient()
+    restarted = Outbox(box.path, client2, cache)
+    assert [op["op"] for op in restarted.pending()] == ["close", "create"]
+    restarted.drain()
+    assert client2.calls == [("close", "t1"), ("create", "Later")]
+
+
+def test_ambiguous_create_is_not_duplicated(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.fail_with = _api.MorgenNetworkError("timed out")  # may have reached the server
+    box.enqueue_create("Maybe sent")
+    box.drain()
+
+    client.fail_with = None
+    client.remote_tasks = [_remote("srv-existing", "Maybe sent")]
+    box.drain()
+
+    assert [c[0] for c in client.calls] == ["create", "list"]
+    assert "srv-existing" in _ids(cache)
+
+
+def test_create_queued_after_direct_attempt_checks_server_first(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.remote_tasks = [_remote("srv-existing", "Sent by batch")]
+    box.enqueue_create("Sent by batch", maybe_sent=True)
+    box.enqueue_create("Never sent")
+    box.drain()
+
+    assert client.calls == [("list", None), ("create", "Never sent")]
+    assert "srv-existing" in _ids(cache)
+
+
+def test_rejected_ops_are_dropped_and_refresh_reapplies_pending(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.fail_with = _api.MorgenValidationError("bad", status_code=400)
+    local_id = box.enqueue_create("Bad")
+    box.drain()
+    assert box.pending_count() == 0
+    assert local_id not in _ids(cache)
+    assert box.failed[0]["error"] == "bad"
+
+    client.fail_with = _api.MorgenRateLimitError("slow", retry_after=42)
+    box.enqueue_close("t1")
+    assert box.drain() == 42
+
+    cache.set_tasks({"data": {"tasks": [{"id": "t1", "title": "Existing"}]}})
+    box.apply_to_cache()
+    assert _ids(cache) == []
+
+    records = [json.loads(line) for line in Path(box.path).read_text().splitlines()]
+    assert [r.get("op") for r in records] == ["close"]  # rejected create compacted away
+
+
+def test_api_calls_go_through_execute(tmp_path):
+    cache = TaskCache(ttl=600, cache_path=str(tmp_path / "cache.json"))
+    client = _FakeClient()
+    executed = []
+    box = Outbox(str(tmp_path / "outbox.jsonl"), client, cache, execute=lambda fn: executed.append(fn) or fn())
+    box.enqueue_create("Via worker")
+    box.enqueue_close("t1")
+    box.drain()
+
+    assert len(executed) == 2
+    assert client.calls == [("create", "Via worker"), ("close", "t1")]
+
+
+def test_identical_creates_are_separate_tasks_unless_same_submit(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    first = box.enqueue_create("Call mum")
+    second = box.enqueue_create("Call mum")
+    assert first != second
+
+    third = box.enqueue_create("Pay rent", token="submit-1")
+    assert box.enqueue_create("Pay rent", token="submit-1") == third  # same Enter delivered twice
+    assert box.pending_count() == 3
+
+    # The token survives a restart while the create is pending.
+    reopened = Outbox(box.path, client, cache)
+    assert reopened.enqueue_create("Pay rent", token="submit-1") == third
+    assert reopened.pending_count() == 3
+
+    reopened.drain()
+    assert client.calls == [("create", "Call mum"), ("create", "Call mum"), ("create", "Pay rent")]
+
+
+def test_replays_use_background_priority(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    box.enqueue_create("Later")
+    box.enqueue_close("t1")
+    box.drain()
+
+    assert client.priorities == ["background", "background"]
+
+
+def test_unsent_attempts_do_not_trigger_a_server_check(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.fail_with = _api.MorgenNetworkError("connection refused", request_sent=False)
+    box.enqueue_create("Offline")
+    box.drain()
+
+    client2 = _FakeClient()
+    restarted = Outbox(box.path, client2, cache)  # the cleared mark survives a restart
+    restarted.drain()
+    assert client2.calls == [("create", "Offline")]
+
+
+def test_remote_check_ignores_older_tasks_with_the_same_title(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.remote_tasks = [
+        _remote("srv-old", "Water plants", created_offset=-7 * 86400),  # edited today, made last week
+        {"id": "srv-stale", "title": "Water plants", "updated": _stamp(-7 * 86400)},
+    ]
+    box.enqueue_create("Water plants", maybe_sent=True)
+    box.drain()
+
+    assert client.calls == [("list", None), ("create", "Water plants")]
+    assert "srv-old" not in _ids(cache) and "srv1" in _ids(cache)
+
+
+def test_two_ambiguous_creates_do_not_adopt_the_same_task(tmp_path):
+    box, client, cache = _setup(tmp_path)
+    client.remote_tasks = [_remote("srv-a", "Call mum")]
+    box.enqueue_create("Call mum", maybe_sent=True)
+    box.enqueue_create("Call mum", maybe_sent=True)
+    box.drain()
+
+    assert client.calls == [("list", None), ("list", None), ("create", "Call mum")]
+    assert sorted(t["id"] for t in cache.get_tasks() if t["title"] == "Call mum") == ["srv-a", "srv1"]
@@ -23,9 +23,9 @@ def generate_mock_tasks(n):
     return {"data": {"tasks": tasks}}
 
 
-def test_search_with_index():
+def test_search_with_index(tmp_path):
     """Test search performance with pre-computed index."""
-    cache = TaskCache(ttl=600, cache_path=None)
+    cache = TaskCache(ttl=600, cache_path=str(tmp_path / "tasks_cache.json"))
 
     # Generate 100 tasks
     mock_response = generate_mock_tasks(100)
@@ -47,9 +47,9 @@ def test_search_with_index():
     print(f"✓ Search index built correctly with {len(search_index)} entries")
 
 
-def test_search_performance():
+def test_search_performance(tmp_path):
     """Compare search performance with and without index."""
-    cache = TaskCache(ttl=600, cache_path=None)
+    cache = TaskCache(ttl=600, cache_path=str(tmp_path / "tasks_cache.json"))
 
     # Generate 500 tasks
     mock_response = generate_mock_tasks(500)
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rate_budget import BACKGROUND, BudgetExhausted, RateBudget, endpoint_cost, parse_retry_after
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_costs():
+    assert endpoint_cost("/tasks/list?limit=100") == 10
+    assert endpoint_cost("/tasks/create") == 1
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412480 - 30) == 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_background_calls_keep_interactive_reserve():
+    clock = _Clock()
+    budget = RateBudget(limit=100, window=900, background_reserve=30, clock=clock)
+    for _ in range(7):
+        budget.acquire("/tasks/list", BACKGROUND)
+    assert budget.remaining() == 30
+
+    with pytest.raises(BudgetExhausted) as e:
+        budget.acquire("/tasks/list", BACKGROUND)
+    assert e.value.retry_after == 900  # oldest spend must age out
+
+    budget.acquire("/tasks/list")  # interactive may use the reserve
+    assert budget.remaining() == 20
+
+    clock.now += 901
+    assert budget.remaining() == 100
+
+
+def test_server_headers_override_local_estimate():
+    clock = _Clock()
+    budget = RateBudget(limit=300, clock=clock)
+    budget.record_response({"RateLimit-Limit": "300", "RateLimit-Remaining": "15", "RateLimit-Reset": "120"})
+    clock.now += 1
+    budget.acquire("/tasks/list")
+    assert budget.remaining() == 5
+
+    with pytest.raises(BudgetExhausted) as e:
+        budget.acquire("/tasks/list")
+    assert e.value.retry_after == 119
+
+    clock.now += 120
+    assert budget.remaining() == 290
+
+
+def test_rate_limited_blocks_until_retry_after_and_persists(tmp_path):
+    clock = _Clock()
+    state = str(tmp_path / "budget.json")
+    budget = RateBudget(state_path=state, clock=clock)
+    budget.acquire("/tasks/list")
+    assert budget.record_rate_limited({"Retry-After": "45"}) == 45
+
+    restarted = RateBudget(state_path=state, clock=clock)
+    with pytest.raises(BudgetExhausted) as e:
+        restarted.acquire("/tasks/close")
+    assert e.value.retry_after == 45
+
+    clock.now += 46
+    restarted.acquire("/tasks/close")
+    assert restarted.remaining() == 300 - 10 - 1
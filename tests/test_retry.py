@@ -0,0 +1,75 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from retry import RetryPolicy
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _policy(clock, **kwargs):
+    return RetryPolicy(clock=clock, sleep=clock.sleep, rng=random.Random(0), **kwargs)
+
+
+def test_retries_until_success_with_growing_jittered_backoff():
+    clock = _Clock()
+    attempts = []
+
+    def fn(time_left):
+        attempts.append((clock.now, time_left))
+        if len(attempts) < 3:
+            raise OSError("blip")
+        return "ok"
+
+    assert _policy(clock, max_attempts=5, base_delay=1.0, deadline=60).call(fn, lambda e: True) == "ok"
+    (t1, left1), (t2, _), (t3, left3) = attempts
+    assert left1 == 60
+    assert 0.5 <= t2 - t1 <= 1.0
+    assert 1.0 <= t3 - t2 <= 2.0
+    assert left3 == pytest.approx(60 - t3)
+
+
+def test_non_retryable_error_is_raised_immediately():
+    clock = _Clock()
+    calls = []
+
+    def fn(time_left):
+        calls.append(1)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        _policy(clock).call(fn, lambda e: not isinstance(e, ValueError))
+    assert calls == [1]
+
+
+def test_stops_at_max_attempts_and_deadline():
+    clock = _Clock()
+    calls = []
+
+    def fn(time_left):
+        calls.append(1)
+        clock.now += 1.0  # each attempt takes a second
+        raise OSError("down")
+
+    with pytest.raises(OSError):
+        _policy(clock, max_attempts=3, base_delay=0.1).call(fn, lambda e: True)
+    assert len(calls) == 3
+
+    clock, calls = _Clock(), []
+    with pytest.raises(OSError):
+        _policy(clock, max_attempts=10, base_delay=2.0, max_delay=2.0, deadline=5.0).call(fn, lambda e: True)
+    assert clock.now < 5.0 + 1.0
+    assert len(calls) == 2
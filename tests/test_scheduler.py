@@ -0,0 +1,141 @@
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import scheduler
+from scheduler import PrefetchScheduler
+
+# Use the exception classes exactly as the scheduler module imported them.
+MorgenAuthError = scheduler.MorgenAuthError
+MorgenRateLimitError = scheduler.MorgenRateLimitError
+MorgenNetworkError = sys.modules[MorgenAuthError.__module__].MorgenNetworkError
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeCache:
+    def __init__(self, ttl=600, age=0.0, data=True):
+        self.ttl = ttl
+        self.age = age
+        self.data = data
+
+    def has_data(self):
+        return self.data
+
+    def get_age(self):
+        return self.age
+
+
+def _scheduler(cache, refresh, clock, **kwargs):
+    kwargs.setdefault("jitter", 0)
+    return PrefetchScheduler(lambda: cache, refresh, clock=clock, rng=random.Random(1), **kwargs)
+
+
+def test_waits_for_activity_and_pauses_when_idle():
+    clock = _Clock()
+    s = _scheduler(_FakeCache(age=590), lambda c: None, clock, idle_timeout=60)
+    assert s.tick() is None  # no activity yet
+
+    s.notify_activity()
+    assert s.tick() is not None
+
+    clock.now += 61
+    assert s.tick() is None
+
+
+def test_refreshes_shortly_before_expiry():
+    clock = _Clock()
+    cache = _FakeCache(ttl=600, age=100)
+    refreshed = []
+
+    def refresh(c):
+        refreshed.append(c)
+        c.age = 0
+
+    s = _scheduler(cache, refresh, clock, lead_time=30, min_interval=60)
+    s.notify_activity()
+    assert s.tick() == 470  # 600 - 100 - 30
+    assert refreshed == []
+
+    cache.age = 575
+    assert s.tick() == 570  # refreshed; next one 600 - 0 - 30 from now
+    assert refreshed == [cache]
+    assert s.refresh_count == 1
+
+
+def test_skips_when_cache_empty():
+    clock = _Clock()
+    s = _scheduler(_FakeCache(data=False), lambda c: None, clock)
+    s.notify_activity()
+    assert s.tick() is None
+
+
+def test_backs_off_exponentially_and_longer_on_rate_limit():
+    clock = _Clock()
+    errors = [MorgenNetworkError("down"), MorgenNetworkError("down"), MorgenRateLimitError("429")]
+
+    def refresh(c):
+        raise errors.pop(0)
+
+    s = _scheduler(_FakeCache(age=599), refresh, clock, min_interval=0)
+    s.notify_activity()
+    first = s.tick()
+    assert 30 <= first <= 37.5
+    assert s.tick() == pytest.approx(first)  # still backing off, no new attempt
+    clock.now += first
+    second = s.tick()
+    assert 60 <= second <= 75
+    clock.now += second
+    assert s.tick() >= 300
+    assert s.error_count == 3
+
+
+def test_auth_error_pauses_until_next_activity():
+    clock = _Clock()
+
+    def refresh(c):
+        raise MorgenAuthError("bad key")
+
+    s = _scheduler(_FakeCache(age=599), refresh, clock)
+    s.notify_activity()
+    assert s.tick() is None
+    assert s.tick() is None
+
+
+def test_activity_before_cache_exists_still_resumes_thread():
+    # The first query notifies activity before its cache partition is created;
+    # the thread parks waiting for activity and later queries must wake it.
+    cache = _FakeCache(age=599)
+    current = {"cache": None}
+    refreshed = threading.Event()
+    first_tick = threading.Event()
+
+    def get_cache():
+        first_tick.set()
+        return current["cache"]
+
+    s = PrefetchScheduler(get_cache, lambda c: refreshed.set(), jitter=0, min_interval=0, rng=random.Random(1))
+    s.start()
+    try:
+        s.notify_activity()
+        assert first_tick.wait(2)
+        current["cache"] = cache
+        deadline = time.monotonic() + 2
+        while not refreshed.is_set() and time.monotonic() < deadline:
+            s.notify_activity()  # later keystrokes
+            refreshed.wait(0.02)
+        assert refreshed.is_set()
+    finally:
+        s.stop()
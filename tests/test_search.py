@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from search import build_search_index, filter_tasks
+
+
+TASKS = [
+    {"id": "a", "title": "Review Q3 Budget", "description": "with Anna"},
+    {"id": "b", "title": "Book flights"},
+    {"id": "c", "title": "Budget review", "description": None},
+]
+
+
+def test_every_word_must_match_title_or_description():
+    assert [t["id"] for t in filter_tasks(TASKS, "budget")] == ["a", "c"]
+    assert [t["id"] for t in filter_tasks(TASKS, "BUDGET anna")] == ["a"]
+    assert filter_tasks(TASKS, "budget flights") == []
+    assert filter_tasks(TASKS, "   ") is TASKS
+    assert filter_tasks(TASKS, "") is TASKS
+
+
+def test_index_is_used_and_missing_entries_fall_back():
+    index = build_search_index(TASKS[:2])
+    assert index["a"] == ("review q3 budget", "with anna")
+    index["b"] = ("indexed text", "")  # proves the index wins over the task fields
+
+    assert [t["id"] for t in filter_tasks(TASKS, "indexed", search_index=index)] == ["b"]
+    assert [t["id"] for t in filter_tasks(TASKS, "review", search_index=index)] == ["a", "c"]
+
+
+def test_backend_matches_replace_the_scan():
+    assert [t["id"] for t in filter_tasks(TASKS, "anything", matched_ids={"c", "b"})] == ["b", "c"]
@@ -0,0 +1,176 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sqlite_cache import SQLiteTaskCache
+
+
+def _response(tasks, **extra):
+    data = {"tasks": tasks}
+    data.update(extra)
+    return {"data": data}
+
+
+def _tasks():
+    return [
+        {"id": "t1", "title": "Buy groceries", "description": "milk and eggs", "due": "2026-02-10T09:00:00",
+         "priority": 1, "taskListId": "inbox", "updated": "2026-02-01T10:00:00Z"},
+        {"id": "t2", "title": "Team meeting", "description": "", "due": "2026-02-12T15:00:00",
+         "priority": 5, "taskListId": "work", "updated": "2026-02-02T10:00:00Z"},
+        {"id": "t3", "title": "Call mom", "description": "about the trip", "priority": 0,
+         "taskListId": "inbox", "updated": "2026-02-03T10:00:00Z"},
+    ]
+
+
+def test_set_tasks_round_trips_through_database(tmp_path):
+    db = tmp_path / "tasks.sqlite3"
+    c = SQLiteTaskCache(ttl=600, db_path=str(db))
+    c.set_tasks(_response(_tasks(), lists=[{"id": "inbox", "name": "Inbox"}]))
+
+    assert [t["id"] for t in c.get_tasks()] == ["t1", "t2", "t3"]
+    assert c.get_last_updated() == "2026-02-03T10:00:00Z"
+
+    reopened = SQLiteTaskCache(ttl=600, db_path=str(db))
+    assert reopened.is_fresh()
+    assert [t["id"] for t in reopened.get_tasks()] == ["t1", "t2", "t3"]
+    assert reopened.get_container_name_maps()["list"]["inbox"] == "Inbox"
+
+
+def test_match_task_ids_uses_substring_semantics(tmp_path):
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"))
+    c.set_tasks(_response(_tasks()))
+
+    assert c.match_task_ids("groc") == {"t1"}
+    assert c.match_task_ids("EGGS buy") == {"t1"}
+    assert c.match_task_ids("mo") == {"t3"}  # short word: checked on the candidates
+    assert c.match_task_ids("nothing") == set()
+    assert c.match_task_ids("") is None
+
+
+def test_short_words_match_like_the_json_backend(tmp_path):
+    from search import filter_tasks
+
+    tasks = [
+        {"id": "u1", "title": "Über die Brücke", "description": ""},
+        {"id": "u2", "title": "Straße fegen", "description": "ÖL wechseln"},
+        {"id": "u3", "title": "Plain ascii", "description": "50% done_ish"},
+    ]
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"))
+    c.set_tasks(_response(tasks))
+
+    for query in ("ü", "ÜB", "öl", "ße", "über öl", "brü ü", "%", "_i", "ascii %"):
+        expected = {t["id"] for t in filter_tasks(tasks, query)}
+        assert c.match_task_ids(query) == expected, query
+    assert c.match_task_ids("ÜB") == {"u1"}
+
+
+def test_set_tasks_deletes_missing_and_updates_search(tmp_path):
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"))
+    c.set_tasks(_response(_tasks()))
+
+    renamed = _tasks()[:2]
+    renamed[0] = dict(renamed[0], title="Buy flowers")
+    c.set_tasks(_response(renamed))
+
+    assert [t["id"] for t in c.get_tasks()] == ["t1", "t2"]
+    assert c.match_task_ids("groceries") == set()
+    assert c.match_task_ids("flowers") == {"t1"}
+
+
+def test_upsert_and_remove_tasks(tmp_path):
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"))
+    c.set_tasks(_response(_tasks()))
+
+    c.upsert_tasks([
+        {"id": "t2", "title": "Team retro", "taskListId": "work"},
+        {"id": "t4", "title": "New thing", "updated": "2026-02-09T00:00:00Z"},
+    ])
+    c.remove_tasks(["t1"])
+
+    assert [t["id"] for t in c.get_tasks()] == ["t2", "t3", "t4"]
+    assert c.match_task_ids("retro") == {"t2"}
+    assert c.get_last_updated() == "2026-02-09T00:00:00Z"
+
+
+def test_container_queries(tmp_path):
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"))
+    c.set_tasks(_response(_tasks()))
+
+    assert [t["id"] for t in c.get_tasks_in_container("list", "INBOX")] == ["t1", "t3"]
+    assert [t["id"] for t in c.get_tasks_in_container(None, "work")] == ["t2"]
+
+
+def test_reads_fall_back_to_memory_when_database_is_unavailable(tmp_path):
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"))
+    c.set_tasks(_response(_tasks()))
+    c._conn.close()
+    c._set_tasks_in_memory(_response(_tasks()))  # what a failed write does
+
+    assert c._conn is None
+    assert [t["id"] for t in c.get_tasks()] == ["t1", "t2", "t3"]
+    assert [t["id"] for t in c.get_tasks_in_container("list", "inbox")] == ["t1", "t3"]
+    assert c.match_task_ids("groceries") is None  # callers scan instead
+
+
+def test_invalidate_clears_database(tmp_path):
+    db = tmp_path / "tasks.sqlite3"
+    c = SQLiteTaskCache(ttl=600, db_path=str(db))
+    c.set_tasks(_response(_tasks()))
+    c.invalidate()
+
+    assert c.get_tasks() is None
+    assert SQLiteTaskCache(ttl=600, db_path=str(db)).get_full_response() is None
+
+
+def test_second_connection_sees_other_process_refresh(tmp_path):
+    db = tmp_path / "tasks.sqlite3"
+    a = SQLiteTaskCache(ttl=600, db_path=str(db))
+    b = SQLiteTaskCache(ttl=600, db_path=str(db))
+    assert b.get_tasks() is None
+
+    a.set_tasks(_response(_tasks()))
+    assert [t["id"] for t in b.get_tasks()] == ["t1", "t2", "t3"]
+
+    a.remove_tasks(["t2"])
+    assert [t["id"] for t in b.get_tasks()] == ["t1", "t3"]
+
+
+def test_adaptive_ttl_tracks_changes_and_persists(tmp_path):
+    db = tmp_path / "tasks.sqlite3"
+    c = SQLiteTaskCache(ttl=600, db_path=str(db), ttl_bounds=(120, 3600))
+    c.set_tasks(_response(_tasks()))
+    c.set_tasks(_response(_tasks()))
+    assert c.ttl == 900
+    assert "no changes" in c.get_ttl_display()
+
+    assert SQLiteTaskCache(ttl=600, db_path=str(db), ttl_bounds=(120, 3600)).ttl == 900
+
+
+def test_adaptive_ttl_counts_changed_rows_without_updated_stamps(tmp_path):
+    tasks = [{k: v for k, v in t.items() if k != "updated"} for t in _tasks()]
+    c = SQLiteTaskCache(ttl=600, db_path=str(tmp_path / "tasks.sqlite3"), ttl_bounds=(120, 3600))
+    c.set_tasks(_response(tasks))
+    c.set_tasks(_response(tasks))
+    assert c.ttl == 900
+
+    c.set_tasks(_response([dict(tasks[0], title="Buy bread")] + tasks[1:2]))
+    assert "2 changed" in c.get_ttl_display()  # one renamed, one removed
+
+
+def test_touch_and_validators_are_stored_in_meta(tmp_path):
+    db = tmp_path / "tasks.sqlite3"
+    c = SQLiteTaskCache(ttl=600, db_path=str(db))
+    c.set_tasks(_response(_tasks()), validators={"etag": '"v1"'})
+    c._timestamp -= 500
+
+    assert c.touch({"content_hash": "abc"}) is True
+    assert c.get_age() < 5
+
+    other = SQLiteTaskCache(ttl=600, db_path=str(db))
+    assert other.get_validators() == {"etag": '"v1"', "content_hash": "abc"}
+    assert len(other.get_tasks()) == 3
+
+    other.upsert_tasks([{"id": "t4", "title": "Local"}])
+    assert other.get_validators() is None
+    assert SQLiteTaskCache(ttl=600, db_path=str(db)).get_validators() is None
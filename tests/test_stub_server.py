@@ -0,0 +1,157 @@
+"""End-to-end MorgenAPIClient tests against the local Morgen API stand-in."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import morgen_api
+from cache import TaskCache
+from morgen_api import MorgenAPIClient
+from retry import RetryPolicy
+from tests.stub_server import StubMorgenServer, make_tasks
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def make(tasks=(), **kwargs):
+        server = StubMorgenServer(tasks, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+def _client(server, **kwargs):
+    client = MorgenAPIClient(server.api_key, base_url=server.base_url, **kwargs)
+    client.retry_policies = {
+        priority: RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02, deadline=5.0)
+        for priority in client.retry_policies
+    }
+    return client
+
+
+def test_make_tasks_is_deterministic_and_scales():
+    assert make_tasks(50, seed=3) == make_tasks(50, seed=3)
+    assert make_tasks(50, seed=3) != make_tasks(50, seed=4)
+
+    start = time.perf_counter()
+    tasks = make_tasks(100_000)
+    assert len({t["id"] for t in tasks}) == 100_000
+    assert time.perf_counter() - start < 5
+
+
+def test_create_list_and_close_round_trip(stub):
+    server = stub(make_tasks(3))
+    client = _client(server)
+
+    created = client.create_task("Write report", priority=2)
+    task_id = created["data"]["id"]
+    assert client.close_task(task_id) == {}
+
+    tasks = {t["id"]: t for t in client.list_tasks()["data"]["tasks"]}
+    assert len(tasks) == 4
+    assert tasks[task_id]["title"] == "Write report"
+    assert tasks[task_id]["progress"] == "completed"
+
+    with pytest.raises(morgen_api.MorgenAPIError) as e:
+        client.close_task("missing")
+    assert e.value.status_code == 404
+    # Responses were gzip-compressed on the wire.
+    transfer = client.get_transfer_stats()
+    assert transfer["wire_bytes"] < transfer["decoded_bytes"]
+
+
+def test_list_honours_limit_and_updated_after(stub):
+    server = stub(make_tasks(250))
+    client = _client(server)
+    assert len(client.list_tasks(limit=500)["data"]["tasks"]) == 100
+
+    newest = max(t["updated"] for t in server.tasks())
+    assert client.list_tasks(updated_after=newest)["data"]["tasks"] == []
+    server.update_task("task-000007", title="Renamed")
+    changed = client.list_tasks(updated_after=newest)["data"]["tasks"]
+    assert [t["title"] for t in changed] == ["Renamed"]
+
+
+def test_conditional_refresh_keeps_the_cache(stub, tmp_path):
+    server = stub(make_tasks(20))
+    client = _client(server)
+    cache = TaskCache(ttl=600, cache_path=str(tmp_path / "tasks_cache.json"))
+
+    first = client.list_tasks()
+    cache.set_tasks(first, validators=first.validators)
+    again = client.list_tasks(validators=cache.get_validators())
+
+    assert again.not_modified
+    assert server.count("/tasks/list", status=304) == 1
+    assert len(cache.get_tasks()) == 20
+
+
+def test_bad_api_key_is_an_auth_error(stub):
+    server = stub()
+    with pytest.raises(morgen_api.MorgenAuthError):
+        MorgenAPIClient("wrong-key", base_url=server.base_url).list_tasks()
+
+
+def test_injected_server_errors_are_retried(stub):
+    server = stub(make_tasks(5))
+    client = _client(server)
+    server.inject("503")
+    server.inject("reset")
+
+    assert len(client.list_tasks()["data"]["tasks"]) == 5
+    assert server.count("/tasks/list") == 3
+
+    # Creates are not idempotent: a 500 surfaces instead of risking a duplicate.
+    server.inject("500")
+    with pytest.raises(morgen_api.MorgenAPIError) as e:
+        client.create_task("Once only")
+    assert e.value.status_code == 500
+    assert len(server.tasks()) == 5
+
+
+def test_timeouts_surface_as_network_errors(stub):
+    server = stub(make_tasks(5), timeout_hold=5)
+    client = _client(server)
+    client.timeout = 0.2
+    for policy in client.retry_policies.values():
+        policy.max_attempts = 1
+    server.inject("timeout")
+
+    with pytest.raises(morgen_api.MorgenNetworkError):
+        client.list_tasks()
+
+
+def test_point_budget_returns_429_with_retry_after(stub):
+    server = stub(make_tasks(5), rate_limit=25, rate_window=60)
+    client = _client(server)
+    client.list_tasks(limit=10)
+    client.list_tasks(limit=20)  # another key: not coalesced
+
+    assert client.rate_budget.remaining() == 5
+    with pytest.raises(morgen_api.MorgenRateLimitError) as e:
+        client.list_tasks(limit=30)
+    assert 0 < e.value.retry_after <= 60
+    assert server.count("/tasks/list", status=429) == 0  # refused locally from the headers
+
+    fresh = _client(server)
+    with pytest.raises(morgen_api.MorgenRateLimitError) as e:
+        fresh.list_tasks()
+    assert server.count("/tasks/list", status=429) == 1
+    assert e.value.retry_after >= 1
+
+
+def test_latency_and_jitter_are_applied(stub):
+    server = stub(make_tasks(1), latency=0.05, jitter=0.05)
+    client = _client(server)
+    start = time.perf_counter()
+    client.list_tasks()
+    assert time.perf_counter() - start >= 0.05
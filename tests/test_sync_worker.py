@@ -0,0 +1,124 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sync_worker import (
+    BACKGROUND_SYNC,
+    HOUSEKEEPING,
+    INTERACTIVE_FETCH,
+    INTERACTIVE_MUTATION,
+    SyncWorker,
+)
+
+
+@pytest.fixture
+def worker_factory():
+    workers = []
+
+    def make(**kwargs):
+        w = SyncWorker(**kwargs)
+        w.start()
+        workers.append(w)
+        return w
+
+    yield make
+    for w in workers:
+        w.stop()
+
+
+def _blocker(worker, lane=INTERACTIVE_FETCH):
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+
+    future = worker.submit(lane, job)
+    assert started.wait(5)
+    return release, future
+
+
+def test_interactive_work_jumps_ahead_of_queued_background_work(worker_factory):
+    worker = worker_factory(workers=1)
+    release, _ = _blocker(worker)
+    order = []
+
+    futures = [
+        worker.submit(HOUSEKEEPING, lambda: order.append("housekeeping")),
+        worker.submit(BACKGROUND_SYNC, lambda: order.append("background")),
+        worker.submit(INTERACTIVE_FETCH, lambda: order.append("fetch")),
+        worker.submit(INTERACTIVE_MUTATION, lambda: order.append("close")),
+    ]
+    assert worker.queue_depths() == {
+        "interactive_mutation": 1,
+        "interactive_fetch": 1,
+        "background_sync": 1,
+        "housekeeping": 1,
+    }
+    release.set()
+    for f in futures:
+        f.result(5)
+
+    assert order == ["close", "fetch", "background", "housekeeping"]
+    assert worker.stats()["completed"]["interactive_fetch"] == 2
+
+
+def test_background_work_never_takes_the_last_thread(worker_factory):
+    worker = worker_factory(workers=2, background_slots=1)
+    release, first = _blocker(worker, lane=BACKGROUND_SYNC)
+    second = worker.submit(BACKGROUND_SYNC, lambda: "second")
+
+    # The free thread serves interactive calls, not the queued background job.
+    assert worker.call(INTERACTIVE_MUTATION, lambda: "closed", timeout=5) == "closed"
+    assert not second.done()
+    assert worker.stats()["running"]["background_sync"] == 1
+
+    release.set()
+    assert second.result(5) == "second"
+
+
+def test_keyed_jobs_are_coalesced_while_queued(worker_factory):
+    worker = worker_factory(workers=1)
+    release, _ = _blocker(worker)
+    calls = []
+
+    a = worker.submit(BACKGROUND_SYNC, lambda: calls.append(1) or "refreshed", key="prefetch")
+    b = worker.submit(BACKGROUND_SYNC, lambda: calls.append(2) or "refreshed", key="prefetch")
+    assert a is b
+    release.set()
+    assert a.result(5) == "refreshed"
+    assert calls == [1]
+
+
+def test_call_propagates_errors_and_runs_nested_calls_inline(worker_factory):
+    worker = worker_factory(workers=1)
+
+    def boom():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        worker.call(INTERACTIVE_MUTATION, boom, timeout=5)
+
+    # A job calling back into the single-threaded worker would deadlock if queued.
+    nested = worker.call(INTERACTIVE_FETCH, lambda: worker.call(INTERACTIVE_MUTATION, lambda: "inner"), timeout=5)
+    assert nested == "inner"
+
+
+def test_stop_cancels_queued_jobs(worker_factory):
+    worker = worker_factory(workers=1)
+    release, running = _blocker(worker)
+    queued = worker.submit(HOUSEKEEPING, lambda: None)
+
+    stopper = threading.Thread(target=worker.stop)
+    stopper.start()
+    release.set()
+    stopper.join(5)
+
+    assert queued.cancelled()
+    assert running.done() and not running.cancelled()
+    with pytest.raises(RuntimeError):
+        worker.submit(INTERACTIVE_FETCH, lambda: None)
@@ -0,0 +1,164 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import tracing
+from bulk import BulkRunner
+from sync_worker import INTERACTIVE_FETCH, SyncWorker
+from tracing import Tracer, annotate, current_span, format_trace, span, traced
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def shared_tracer(monkeypatch):
+    t = Tracer()
+    monkeypatch.setattr(tracing, "tracer", t)
+    return t
+
+
+def test_spans_nest_with_attributes_and_durations():
+    clock = FakeClock()
+    t = Tracer(clock=clock)
+
+    with t.span("on_event", query_len=3) as root:
+        clock.advance(0.001)
+        with t.span("get_tasks") as child:
+            clock.advance(0.002)
+            child.set(tasks=40)
+        with t.span("filter.search"):
+            clock.advance(0.003)
+            annotate(matched=2)
+
+    assert current_span() is None
+    assert t.traces() == [root]
+    assert [c.name for c in root.children] == ["get_tasks", "filter.search"]
+    assert root.duration_ms == pytest.approx(6.0)
+    assert root.children[0].duration_ms == pytest.approx(2.0)
+    assert root.children[1].attrs == {"matched": 2}
+    assert root.to_dict()["children"][0] == {"name": "get_tasks", "ms": 2.0, "attrs": {"tasks": 40}, "children": []}
+    assert format_trace(root) == (
+        "on_event 6.0ms [query_len=3] { get_tasks 2.0ms [tasks=40], filter.search 3.0ms [matched=2] }"
+    )
+    assert format_trace(root, max_depth=1) == "on_event 6.0ms [query_len=3]"
+
+
+def test_ring_buffer_keeps_last_traces_per_root_name():
+    t = Tracer(capacity=3)
+    for i in range(7):
+        with t.span("prefetch" if i % 2 else "on_event", n=i):
+            pass
+
+    assert [s.attrs["n"] for s in t.traces("on_event")] == [2, 4, 6]
+    assert [s.attrs["n"] for s in t.traces("prefetch")] == [1, 3, 5]
+    assert [s.attrs["n"] for s in t.traces()] == [1, 2, 3, 4, 5, 6]
+    assert t.traces("missing") == []
+
+
+def test_background_roots_do_not_push_out_queries():
+    t = Tracer(capacity=2)
+    with t.span("on_event", query="d report"):
+        pass
+    for _ in range(10):
+        with t.span("prefetch"):
+            pass
+
+    assert [s.attrs["query"] for s in t.traces("on_event")] == ["d report"]
+    t.clear()
+    assert t.traces() == []
+
+
+def test_disabled_tracer_records_nothing():
+    t = Tracer(enabled=False)
+
+    with t.span("on_event") as s:
+        s.set(tasks=1)
+        assert current_span() is None
+        annotate(ignored=True)
+
+    assert s is t.span("other")  # one shared no-op object
+    assert t.traces() == []
+
+
+def test_exception_marks_span_and_propagates():
+    t = Tracer()
+
+    with pytest.raises(ValueError):
+        with t.span("api.call") as s:
+            raise ValueError("boom")
+
+    assert s.attrs["error"] == "ValueError"
+    assert t.traces() == [s]
+    assert current_span() is None
+
+
+def test_aggregate_sums_by_name():
+    clock = FakeClock()
+    t = Tracer(clock=clock)
+    for ms in (1, 3):
+        with t.span("on_event"):
+            with t.span("filter.search"):
+                clock.advance(ms / 1000)
+
+    totals = t.aggregate()
+    assert totals["filter.search"] == {"count": 2, "total_ms": 4.0, "max_ms": 3.0}
+    assert totals["on_event"]["count"] == 2
+
+
+def test_traced_decorator_uses_shared_tracer(shared_tracer):
+    @traced("cache.set_tasks")
+    def store(n):
+        annotate(tasks=n)
+        return n * 2
+
+    assert store(5) == 10
+    (trace,) = shared_tracer.traces()
+    assert trace.name == "cache.set_tasks"
+    assert trace.attrs == {"tasks": 5}
+    assert store.__name__ == "store"
+
+    shared_tracer.enabled = False
+    assert store(1) == 2
+    assert len(shared_tracer.traces()) == 1
+
+
+def test_sync_worker_jobs_nest_under_submitting_span(shared_tracer):
+    worker = SyncWorker()
+    worker.start()
+    try:
+        def fetch():
+            with span("api.call"):
+                return current_span().parent.name
+
+        with span("on_event") as root:
+            with span("api_call"):
+                parent_name = worker.call(INTERACTIVE_FETCH, fetch)
+    finally:
+        worker.stop()
+
+    assert parent_name == "api_call"
+    assert [s.name for s in root.children[0].children] == ["api.call"]
+    assert shared_tracer.traces() == [root]
+
+
+def test_bulk_workers_nest_under_caller_span(shared_tracer):
+    def close(task_id):
+        with span("api.call", task=task_id):
+            return task_id
+
+    with span("complete_all") as root:
+        BulkRunner(max_workers=3).run(["a", "b", "c"], close)
+
+    assert sorted(c.attrs["task"] for c in root.children) == ["a", "b", "c"]